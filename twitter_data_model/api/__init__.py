@@ -0,0 +1,111 @@
+"""Twitter data model API.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+the package is cheap and a process only pays for the models it uses:
+'api.TimelineEntry' imports 'api.timeline' (and the models it refers to),
+'api.Archive' only 'api.archive' and its dependencies.
+"""
+
+import importlib
+
+
+# public name -> submodule
+_EXPORTS = {
+    "aiter_directory": "aio",
+    "Archive": "archive",
+    "ArchiveWriter": "archive",
+    "snowflake_from_datetime": "archive",
+    "snowflake_to_datetime": "archive",
+    "AudioSpaceResult": "audio_response",
+    "AudioSpaceSearchResult": "audio_response",
+    "AudioSpace": "audio_space",
+    "ColumnarAudioSpaceParticipants": "audio_space",
+    "ParticipantColumns": "audio_space",
+    "AudioSpaceSearch": "audio_space_search",
+    "ModelCache": "cache",
+    "disable_cache": "cache",
+    "enable_cache": "cache",
+    "get_cache": "cache",
+    "load_cached": "cache",
+    "model_cache": "cache",
+    "schema_fingerprint": "cache",
+    "Card": "card",
+    "CardValues": "card",
+    "iter_card_values": "card",
+    "UnifiedCard": "card",
+    "ConversationIndex": "conversation",
+    "SQLiteExporter": "database",
+    "SQLiteLoader": "database",
+    "FastModel": "fast",
+    "FastValidationError": "fast",
+    "compile_model": "fast",
+    "parse_fast": "fast",
+    "FollowGraph": "graph",
+    "FollowGraphBuilder": "graph",
+    "InteractionGraph": "graph",
+    "UserIdentityMap": "identity",
+    "current_identity_map": "identity",
+    "user_identity_map": "identity",
+    "InternTable": "interning",
+    "get_intern_table": "interning",
+    "intern_value": "interning",
+    "interned": "interning",
+    "set_intern_table": "interning",
+    "LazyModel": "lazy",
+    "columnar_enabled": "lazy",
+    "columnar_participants": "lazy",
+    "lazy_enabled": "lazy",
+    "lazy_tweets": "lazy",
+    "Media": "media",
+    "MetricsRegistry": "metrics",
+    "disable_profiling": "metrics",
+    "enable_profiling": "metrics",
+    "get_registry": "metrics",
+    "observed": "metrics",
+    "profiling": "metrics",
+    "DataResponse": "response",
+    "DataResponseList": "response",
+    "DataResult": "response",
+    "load_any": "sniff",
+    "sniff": "sniff",
+    "sniff_file": "sniff",
+    "SpaceEvent": "space_diff",
+    "SpaceEventLog": "space_diff",
+    "diff_spaces": "space_diff",
+    "SyntheticGenerator": "synthetic",
+    "TimelineEntry": "timeline",
+    "TimelineSyncState": "timeline",
+    "TimelineTimelineCursor": "timeline",
+    "merge_timelines": "timeline",
+    "LazyTweet": "tweet",
+    "Tweet": "tweet",
+    "TweetUnavailable": "tweet",
+    "TweetResult": "tweet_response",
+    "User": "user",
+    "UserList": "user",
+    "UserType": "user",
+    "UserUnavailable": "user",
+    "UserResponse": "user_response",
+    "UserResult": "user_response",
+    "iter_json_array": "utils",
+    "iter_jsonl": "utils",
+    "iter_records": "utils",
+    "load_json": "utils",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
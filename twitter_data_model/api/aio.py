@@ -0,0 +1,157 @@
+"""Asynchronous ingestion of directories of response dumps.
+
+'aiter_directory' scans a directory (or glob) without blocking the event
+loop, reads files on the loop's default thread pool and hands JSON
+decoding and validation to an executor (a process pool by default):
+
+    async for tweet in aiter_directory("dumps/", TimelineEntry):
+        ...
+
+Files are read and validated at most 'max_pending' ahead of the consumer
+(a bounded queue of in-flight tasks); once the queue is full, scanning
+pauses until the consumer catches up. Results are yielded in file order.
+"""
+
+import asyncio
+import glob
+import json
+import os
+
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Optional,
+    Type,
+)
+
+from .response import DataResponse
+from .timeline import (
+    TimelineEntry,
+    TimelineTimelineModule,
+)
+
+
+__all__ = [
+    "aiter_directory",
+]
+
+
+def _scan(source: str, pattern: str) -> List[Path]:
+    path = Path(source)
+
+    if path.is_dir():
+        return sorted(p for p in path.glob(pattern) if p.is_file())
+
+    return sorted(Path(p) for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+
+
+def _resolve(value: Any) -> List[Any]:
+    """The objects a file resolves to (none for a cursor entry)."""
+
+    if isinstance(value, TimelineEntry):
+        if value.is_cursor:
+            return []
+
+        if isinstance(value.content, TimelineTimelineModule):
+            return [item.tweet_results.result for item in value.content]
+
+        return [value.result]
+
+    if isinstance(value, DataResponse):
+        return [value.resolve()]
+
+    return [value]
+
+
+def _parse(model: Type, data: bytes, resolve: bool) -> List[Any]:
+    """Decode and validate one file (executor worker)."""
+
+    value = model.parse_obj(json.loads(data))
+    return _resolve(value) if resolve else [value]
+
+
+async def aiter_directory(  # pylint: disable=too-many-arguments
+    source: str,
+    model: Type = DataResponse,
+    pattern: str = "*.json",
+    executor: Optional[Executor] = None,
+    max_pending: Optional[int] = None,
+    resolve: bool = True,
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+) -> AsyncIterator[Any]:
+    """Yield the (resolved) 'model' object of every file under 'source'.
+
+    'source' is a directory (filtered by 'pattern') or a glob. Validation
+    runs on 'executor', or on a process pool (one worker per CPU) owned by
+    this iterator. With 'resolve', 'DataResponse.resolve()' or
+    'TimelineEntry.result' is yielded instead of the model itself: every
+    tweet of a conversation module entry, and nothing for a cursor entry.
+
+    A file that cannot be read, decoded or validated raises, unless
+    'on_error' is given: it is then called with the path and exception and
+    the file is skipped.
+    """
+
+    loop = asyncio.get_running_loop()
+    paths = await loop.run_in_executor(None, _scan, source, pattern)
+
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor()
+
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def load(path: Path) -> Any:
+        data = await loop.run_in_executor(None, path.read_bytes)
+        return await loop.run_in_executor(executor, _parse, model, data, resolve)
+
+    async def produce() -> None:
+        for path in paths:
+            # Blocks while 'max_pending' files are in flight or waiting.
+            await queue.put((path, asyncio.ensure_future(load(path))))
+        await queue.put(None)
+
+    producer = asyncio.ensure_future(produce())
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+
+            path, task = item
+
+            try:
+                values = await task
+            except (OSError, ValueError) as error:
+                if on_error is None:
+                    raise
+                on_error(path, error)
+                continue
+
+            for value in values:
+                yield value
+    finally:
+        producer.cancel()
+        pending = []
+
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                item[1].cancel()
+                pending.append(item[1])
+
+        await asyncio.gather(producer, *pending, return_exceptions=True)
+
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,292 @@
+"""Append-only, memory-mapped archive of Tweet and User records.
+
+An archive is two files: '<name>' holds the records back to back, each a
+small header (kind, length) followed by the model's compact JSON, and
+'<name>.idx' holds fixed-size (rest_id, kind, offset, length) entries
+sorted by Rest ID. Both are opened with 'mmap', so looking up one Rest ID
+is a binary search over the index and the decoding of a single record.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+
+from datetime import datetime, timezone
+from typing import (
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+
+from .tweet import LazyTweet, Tweet
+from .user import User
+
+
+__all__ = [
+    "Archive",
+    "ArchiveWriter",
+    "snowflake_from_datetime",
+    "snowflake_to_datetime",
+]
+
+
+_DATA_MAGIC = b"TDMARC1\0"
+_INDEX_MAGIC = b"TDMIDX1\0"
+
+# kind, length
+_RECORD = struct.Struct("<BI")
+# rest_id, kind, offset, length
+_ENTRY = struct.Struct("<QBQI")
+
+_KINDS: List[Type[BaseModel]] = [Tweet, User]
+
+_TWITTER_EPOCH_MS = 1288834974657
+
+
+def snowflake_to_datetime(snowflake: int) -> datetime:
+    """Return the creation time encoded in a snowflake ID."""
+
+    milliseconds = (snowflake >> 22) + _TWITTER_EPOCH_MS
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+
+
+def snowflake_from_datetime(moment: datetime) -> int:
+    """Return the smallest snowflake ID created at (or after) 'moment'."""
+
+    milliseconds = int(moment.timestamp() * 1000) - _TWITTER_EPOCH_MS
+    return max(milliseconds, 0) << 22
+
+
+def _kind(model: BaseModel) -> int:
+    for kind, klass in enumerate(_KINDS):
+        if isinstance(model, klass):
+            return kind
+    raise TypeError(f"Cannot archive {type(model).__name__} objects")
+
+
+def _index_path(pathname: str) -> str:
+    return f"{pathname}.idx"
+
+
+class _Index:
+    """Sorted, memory-mapped index entries."""
+
+    def __init__(self, pathname: str):
+        self.map: Optional[mmap.mmap] = None
+        self.count = 0
+
+        if not os.path.exists(pathname) or os.path.getsize(pathname) <= len(_INDEX_MAGIC):
+            return
+
+        with open(pathname, "rb") as fp:  # pylint: disable=invalid-name
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.map[: len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+            raise ValueError(f"{pathname} is not an archive index")
+
+        self.count = (len(self.map) - len(_INDEX_MAGIC)) // _ENTRY.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self.map, len(_INDEX_MAGIC) + position * _ENTRY.size)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int]]:
+        for position in range(self.count):
+            yield self[position]
+
+    def bisect(self, rest_id: int) -> int:
+        """Position of the first entry with a Rest ID >= 'rest_id'."""
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self[middle][0] < rest_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self) -> None:
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class ArchiveWriter:
+    """Append Tweet and User models to an archive.
+
+    Records are appended to the data file as they are added; the index is
+    rewritten (merging the existing one) on 'close'. Adding a Rest ID that
+    is already archived supersedes the earlier record of the same kind.
+    """
+
+    def __init__(self, pathname: str):
+        self.pathname = pathname
+        self._entries: List[Tuple[int, int, int, int]] = []
+
+        self._fp = open(pathname, "ab")  # pylint: disable=consider-using-with
+        if self._fp.tell() == 0:
+            self._fp.write(_DATA_MAGIC)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, model: Union[Tweet, User]) -> None:
+        """Append one Tweet or User."""
+
+        if isinstance(model, LazyTweet):
+            model = model.to_tweet()
+
+        kind = _kind(model)
+        payload = model.json(by_alias=True, indent=None).encode("utf8")
+        offset = self._fp.tell()
+
+        self._fp.write(_RECORD.pack(kind, len(payload)))
+        self._fp.write(payload)
+        self._entries.append((int(model.rest_id), kind, offset, len(payload)))
+
+    def extend(self, models) -> None:
+        """Append several Tweets or Users."""
+
+        for model in models:
+            self.add(model)
+
+    def close(self) -> None:
+        """Flush the data file and write the merged, sorted index."""
+
+        if self._fp.closed:
+            return
+
+        self._fp.close()
+
+        # Later records win: sort new entries by key then reverse offset and
+        # let the first occurrence of each key through.
+        new = sorted(self._entries, key=lambda e: (e[0], e[1], -e[2]))
+        index = _Index(_index_path(self.pathname))
+        temporary = f"{_index_path(self.pathname)}.tmp"
+
+        try:
+            with open(temporary, "wb") as fp:  # pylint: disable=invalid-name
+                fp.write(_INDEX_MAGIC)
+                previous = None
+
+                merged = heapq.merge(
+                    ((e[0], e[1], 0, e) for e in new),
+                    ((e[0], e[1], 1, e) for e in index),
+                )
+
+                for rest_id, kind, _, entry in merged:
+                    if (rest_id, kind) == previous:
+                        continue
+                    previous = (rest_id, kind)
+                    fp.write(_ENTRY.pack(*entry))
+        finally:
+            index.close()
+
+        os.replace(temporary, _index_path(self.pathname))
+        self._entries = []
+
+
+class Archive:
+    """Read-only, memory-mapped view of an archive.
+
+    'archive[rest_id]' decodes just that record (a Tweet in preference to a
+    User with the same Rest ID); 'range' scans a Rest ID (snowflake) range in
+    ascending order.
+    """
+
+    def __init__(self, pathname: str):
+        self.pathname = pathname
+        self._index = _Index(_index_path(pathname))
+        self._data: Optional[mmap.mmap] = None
+
+        if os.path.getsize(pathname) > len(_DATA_MAGIC):
+            with open(pathname, "rb") as fp:  # pylint: disable=invalid-name
+                self._data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if self._data[: len(_DATA_MAGIC)] != _DATA_MAGIC:
+                raise ValueError(f"{pathname} is not an archive")
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, rest_id: int) -> bool:
+        position = self._index.bisect(rest_id)
+        return position < len(self._index) and self._index[position][0] == rest_id
+
+    def __getitem__(self, rest_id: int) -> Union[Tweet, User]:
+        model = self.get(rest_id)
+        if model is None:
+            raise KeyError(rest_id)
+        return model
+
+    def __iter__(self) -> Iterator[Union[Tweet, User]]:
+        for entry in self._index:
+            yield self._decode(entry)
+
+    def _decode(self, entry: Tuple[int, int, int, int]) -> Union[Tweet, User]:
+        _, kind, offset, length = entry
+        start = offset + _RECORD.size
+        return _KINDS[kind].parse_raw(self._data[start : start + length])
+
+    def get(
+        self, rest_id: int, model: Optional[Type[BaseModel]] = None
+    ) -> Optional[Union[Tweet, User]]:
+        """Return the record for 'rest_id' (optionally of one model type)."""
+
+        position = self._index.bisect(rest_id)
+
+        while position < len(self._index):
+            entry = self._index[position]
+            if entry[0] != rest_id:
+                break
+            if model is None or _KINDS[entry[1]] is model:
+                return self._decode(entry)
+            position += 1
+
+        return None
+
+    def range(
+        self,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        model: Optional[Type[BaseModel]] = None,
+    ) -> Iterator[Union[Tweet, User]]:
+        """Yield records with 'start' <= Rest ID < 'stop', in Rest ID order."""
+
+        position = 0 if start is None else self._index.bisect(start)
+
+        while position < len(self._index):
+            entry = self._index[position]
+            if stop is not None and entry[0] >= stop:
+                break
+            if model is None or _KINDS[entry[1]] is model:
+                yield self._decode(entry)
+            position += 1
+
+    def close(self) -> None:
+        """Release the memory maps."""
+
+        self._index.close()
+        if self._data is not None:
+            self._data.close()
+            self._data = None
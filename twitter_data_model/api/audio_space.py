@@ -1,24 +1,36 @@
 from __future__ import annotations
 
+import json
+
+from array import array
 from typing import (
+    Any,
     Dict,
+    Iterator,
     List,
     Literal,
     Optional,
+    Set,
+    Union,
 )
 
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
     Field,
+    ValidationError,
 )
 
 
 from .tweet_response import TweetResult
 from .user_response import User, UserResult
+from .interning import interned
+from .lazy import columnar_enabled
 
 
 __all__ = [
     "AudioSpace",
+    "ColumnarAudioSpaceParticipants",
+    "ParticipantColumns",
 ]
 
 
@@ -59,6 +71,8 @@ class AudioSpaceMetadata(BaseModel):
     started_at: int
     replay_start_time: int
 
+    _intern = interned("state")
+
 
 class CreatorResults(BaseModel):
     """Creator Results class object."""
@@ -98,6 +112,12 @@ class AudioSpaceParticipants(BaseModel):
     speakers: List[PeriscopeParticipant]
     listeners: List[PeriscopeParticipant]
 
+    @classmethod
+    def validate(cls, value):
+        if cls is AudioSpaceParticipants and isinstance(value, Dict) and columnar_enabled():
+            return ColumnarAudioSpaceParticipants.validate(value)
+        return super().validate(value)
+
 
 class PeriscopeParticipant(BaseModel):
     """Periscope Participant class object."""
@@ -146,6 +166,8 @@ class HighlightedLabel(BaseModel):
     user_label_type: str = Field(alias="userLabelType")
     user_label_display_type: str = Field(alias="userLabelDisplayType")
 
+    _intern = interned("user_label_type", "user_label_display_type")
+
 
 class HighlightedLabelURL(BaseModel):
     """Highlighted Label URL class object."""
@@ -153,6 +175,310 @@ class HighlightedLabelURL(BaseModel):
     url: str
     url_type: Optional[str] = Field(alias="urlType")
 
+    _intern = interned("url_type")
+
+
+# Participant flag bits.
+_VERIFIED = 1
+_MUTED_BY_ADMIN = 2
+_NFT_AVATAR = 4
+_BLUE_VERIFIED = 8
+_HAS_START = 16
+
+_FLAGS = {
+    "is_verified": _VERIFIED,
+    "is_muted_by_admin": _MUTED_BY_ADMIN,
+    "has_nft_avatar": _NFT_AVATAR,
+    "is_blue_verified": _BLUE_VERIFIED,
+}
+
+
+_AVATAR_PREFIX = "https://pbs.twimg.com/profile_images/"
+_AVATAR_SUFFIX = "_normal.jpg"
+
+
+def _pack_avatar(url: str) -> str:
+    # Nearly every avatar URL shares this prefix and suffix; store the middle
+    # (marked with a leading '/') and the rare exceptions verbatim.
+    if url.startswith(_AVATAR_PREFIX) and url.endswith(_AVATAR_SUFFIX):
+        return "/" + url[len(_AVATAR_PREFIX) : -len(_AVATAR_SUFFIX)]
+    return url
+
+
+def _unpack_avatar(packed: str) -> str:
+    if packed.startswith("/"):
+        return _AVATAR_PREFIX + packed[1:] + _AVATAR_SUFFIX
+    return packed
+
+
+def _field(model: type, data: Any, name: str) -> Any:
+    """Field 'name' of raw 'data', validated as 'model' would validate it."""
+
+    if not isinstance(data, Dict):
+        raise TypeError(f"{model.__name__} must be a dict")
+
+    field = model.__fields__[name]
+
+    if field.alias not in data:
+        if field.required:
+            raise ValueError(f"{model.__name__}.{field.alias}: field required")
+        return None
+
+    value, errors = field.validate(data[field.alias], {}, loc=field.alias, cls=model)
+
+    if errors:
+        raise ValidationError(errors if isinstance(errors, list) else [errors], model)
+
+    return value
+
+
+class ParticipantColumns:
+    """Periscope participants stored as parallel arrays.
+
+    IDs, names and avatar URLs are kept in one list (or 'array') per field,
+    boolean fields as bits of one byte per participant, and the rarely set
+    highlighted labels (shared between participants with the same label)
+    and 'legacy' dicts sparsely by position. A 'PeriscopeParticipant' is
+    only validated when one is indexed.
+    """
+
+    __slots__ = (
+        "periscope_user_ids",
+        "rest_ids",
+        "screen_names",
+        "display_names",
+        "avatar_urls",
+        "starts",
+        "flags",
+        "labels",
+        "legacy",
+        "_shared_labels",
+        "_rest_id_set",
+        "_screen_name_set",
+    )
+
+    def __init__(self):
+        self.periscope_user_ids: List[str] = []
+        self.rest_ids = array("Q")
+        self.screen_names: List[str] = []
+        self.display_names: List[str] = []
+        self.avatar_urls: List[str] = []
+        self.starts = array("q")
+        self.flags = bytearray()
+        self.labels: Dict[int, Dict] = {}
+        self.legacy: Dict[int, Dict] = {}
+        self._shared_labels: Dict[str, Dict] = {}
+        self._rest_id_set: Optional[Set[int]] = None
+        self._screen_name_set: Optional[Set[str]] = None
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "ParticipantColumns":
+        """Build columns from raw participant dicts (or validated models)."""
+
+        if isinstance(value, cls):
+            return value
+
+        if not isinstance(value, (list, tuple)):
+            raise TypeError("participants must be a list")
+
+        columns = cls()
+        for item in value:
+            columns.append(item)
+        return columns
+
+    def append(self, participant: Union[Dict, PeriscopeParticipant]) -> None:
+        """Add one raw participant dict (or 'PeriscopeParticipant')."""
+
+        if isinstance(participant, PeriscopeParticipant):
+            participant = participant.dict(by_alias=True)
+
+        # Each scalar is coerced (and checked) by its model field, so the
+        # columns hold what the eager models would.
+        def field(name: str) -> Any:
+            return _field(PeriscopeParticipant, participant, name)
+
+        if not isinstance(participant, Dict):
+            raise TypeError("PeriscopeParticipant must be a dict")
+
+        if "user_results" not in participant:
+            raise ValueError("PeriscopeParticipant.user_results: field required")
+
+        user_results = participant["user_results"]
+        rest_id = _field(PeriscopeUserResult, user_results, "rest_id")
+
+        if "result" not in user_results:
+            raise ValueError("PeriscopeUserResult.result: field required")
+
+        user = user_results["result"]
+
+        def user_field(name: str) -> Any:
+            return _field(PeriscopeUser, user, name)
+
+        user_field("typename")
+        label = user_field("identity_profile_labels_highlighted_label")
+        legacy = user_field("legacy")
+        start = field("start")
+        index = len(self.flags)
+
+        flags = (
+            (_HAS_START if start is not None else 0)
+            | (_VERIFIED if field("is_verified") else 0)
+            | (_MUTED_BY_ADMIN if field("is_muted_by_admin") else 0)
+            | (_NFT_AVATAR if user_field("has_nft_avatar") else 0)
+            | (_BLUE_VERIFIED if user_field("is_blue_verified") else 0)
+        )
+
+        periscope_user_id = field("periscope_user_id")
+        screen_name = field("twitter_screen_name")
+        display_name = field("display_name")
+        avatar_url = field("avatar_url")
+
+        # Only append once every field is known to be valid.
+        self.periscope_user_ids.append(periscope_user_id)
+        self.rest_ids.append(rest_id)
+        self.screen_names.append(screen_name)
+        self.display_names.append(display_name)
+        self.avatar_urls.append(_pack_avatar(avatar_url))
+        self.starts.append(start or 0)
+        self.flags.append(flags)
+
+        if label.label is not None:
+            raw = label.dict(by_alias=True, exclude_unset=True)
+            key = json.dumps(raw, sort_keys=True)
+            self.labels[index] = self._shared_labels.setdefault(key, raw)
+        if legacy:
+            self.legacy[index] = legacy
+
+        self._rest_id_set = None
+        self._screen_name_set = None
+
+    def raw(self, index: int) -> Dict:
+        """Return participant 'index' as the raw (API-shaped) dict."""
+
+        index = range(len(self))[index]
+        flags = self.flags[index]
+
+        return {
+            "periscope_user_id": self.periscope_user_ids[index],
+            "start": self.starts[index] if flags & _HAS_START else None,
+            "twitter_screen_name": self.screen_names[index],
+            "display_name": self.display_names[index],
+            "avatar_url": _unpack_avatar(self.avatar_urls[index]),
+            "is_verified": bool(flags & _VERIFIED),
+            "is_muted_by_admin": bool(flags & _MUTED_BY_ADMIN),
+            "user_results": {
+                "rest_id": str(self.rest_ids[index]),
+                "result": {
+                    "__typename": "User",
+                    "identity_profile_labels_highlighted_label": self.labels.get(index, {}),
+                    "has_nft_avatar": bool(flags & _NFT_AVATAR),
+                    "is_blue_verified": bool(flags & _BLUE_VERIFIED),
+                    "legacy": self.legacy.get(index, {}),
+                },
+            },
+        }
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        return PeriscopeParticipant.parse_obj(self.raw(index))
+
+    def __iter__(self) -> Iterator[PeriscopeParticipant]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __contains__(self, item: Union[int, str]) -> bool:
+        """Membership by Rest ID or (case-insensitive) screen name."""
+
+        if isinstance(item, int):
+            if self._rest_id_set is None:
+                self._rest_id_set = set(self.rest_ids)
+            return item in self._rest_id_set
+
+        if isinstance(item, str):
+            if self._screen_name_set is None:
+                self._screen_name_set = {name.casefold() for name in self.screen_names}
+            return item.casefold() in self._screen_name_set
+
+        return False
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ParticipantColumns):
+            return len(self) == len(other) and all(
+                self.raw(index) == other.raw(index) for index in range(len(self))
+            )
+
+        if isinstance(other, list):
+            return self.to_list() == other
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__[:-2])
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__[:-2], state):
+            setattr(self, name, value)
+        self._rest_id_set = None
+        self._screen_name_set = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} participants>)"
+
+    def count(self, **flags: bool) -> int:
+        """Count participants whose flags match, e.g. 'count(is_verified=True)'.
+
+        With no arguments, the number of participants.
+        """
+
+        mask = want = 0
+        for key, value in flags.items():
+            mask |= _FLAGS[key]
+            if value:
+                want |= _FLAGS[key]
+
+        table = bytes(1 if byte & mask == want else 0 for byte in range(256))
+        return self.flags.translate(table).count(1)
+
+    def to_list(self) -> List[PeriscopeParticipant]:
+        """Materialize every participant."""
+        return list(self)
+
+
+class ColumnarAudioSpaceParticipants(AudioSpaceParticipants):
+    """Audio Space Participants class object with column-wise participants."""
+
+    admins: ParticipantColumns
+    speakers: ParticipantColumns
+    listeners: ParticipantColumns
+
+    class Config:  # pylint: disable=missing-class-docstring
+        json_encoders = {
+            ParticipantColumns: lambda columns: [
+                columns.raw(index) for index in range(len(columns))
+            ]
+        }
+
+    def to_participants(self) -> AudioSpaceParticipants:
+        """Return the fully materialized Audio Space Participants object."""
+
+        return AudioSpaceParticipants.construct(
+            self.__fields_set__,
+            total=self.total,
+            admins=self.admins.to_list(),
+            speakers=self.speakers.to_list(),
+            listeners=self.listeners.to_list(),
+        )
+
 
 AudioSpace.update_forward_refs()
 AudioSpaceMetadata.update_forward_refs()
@@ -160,6 +486,7 @@ AudioSpaceSharings.update_forward_refs()
 AudioSpaceShare.update_forward_refs()
 AudioSpaceSharedTweet.update_forward_refs()
 AudioSpaceParticipants.update_forward_refs()
+ColumnarAudioSpaceParticipants.update_forward_refs()
 PeriscopeParticipant.update_forward_refs()
 PeriscopeUserResult.update_forward_refs()
 PeriscopeUser.update_forward_refs()
@@ -0,0 +1,303 @@
+"""On-disk cache of validated models, keyed by file content and schema."""
+
+import hashlib
+import os
+import pickle
+
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Type,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+from pydantic.version import VERSION
+
+from .identity import current_identity_map
+from .lazy import (
+    LazyModel,
+    columnar_enabled,
+    lazy_enabled,
+)
+
+
+__all__ = [
+    "ModelCache",
+    "disable_cache",
+    "enable_cache",
+    "get_cache",
+    "load_cached",
+    "model_cache",
+    "schema_fingerprint",
+]
+
+
+_FINGERPRINTS: Dict[Type, str] = {}
+
+# Methods whose overrides take part in validation.
+_METHODS = ("__init__", "__get_validators__", "validate", "parse_obj")
+
+
+def _describe(model: Type, seen: Dict[Type, None]) -> None:
+    if isinstance(model, type) and issubclass(model, LazyModel):
+        model = model.model
+
+    if model in seen or not (isinstance(model, type) and issubclass(model, BaseModel)):
+        return
+
+    seen[model] = None
+
+    for field in model.__fields__.values():
+        stack = [field]
+        while stack:
+            current = stack.pop()
+            _describe(current.type_, seen)
+            stack.extend(current.sub_fields or ())
+            if current.key_field is not None:
+                stack.append(current.key_field)
+
+
+def _constant(value: Any) -> str:
+    if isinstance(value, CodeType):
+        return _code(value)
+    if isinstance(value, frozenset):
+        # Set order depends on the (per-process) string hash seed.
+        return repr(sorted(map(_constant, value)))
+    return repr(value)
+
+
+def _code(code: CodeType) -> str:
+    """Stable description of a code object: bytecode, names and constants."""
+
+    constants = ",".join(_constant(value) for value in code.co_consts)
+    return f"{code.co_code.hex()}{code.co_names}[{constants}]"
+
+
+def _function(function: Any) -> str:
+    function = getattr(function, "__func__", function)
+    code = getattr(function, "__code__", None)
+    if isinstance(code, CodeType):
+        return _code(code)
+    # Compiled functions have no bytecode; their repr may hold an address.
+    return getattr(function, "__qualname__", type(function).__qualname__)
+
+
+def schema_fingerprint(model: Type[BaseModel]) -> str:
+    """Hash of the field layout of 'model' and every model it refers to.
+
+    Any change to a field's name, alias, type, shape, default, requiredness
+    or validators, or to model configuration, changes the fingerprint.
+    Validators are hashed by their code (bytecode, names and constants), as
+    are root validators and overrides of '__init__', '__get_validators__',
+    'validate' and 'parse_obj'. Helpers those call are not followed: after
+    changing one, clear the cache directory.
+    """
+
+    if model not in _FINGERPRINTS:
+        seen: Dict[Type, None] = {}
+        _describe(model, seen)
+
+        digest = hashlib.sha256(VERSION.encode())
+
+        for klass in seen:
+            config = klass.__config__
+            digest.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+            digest.update(f"{config.extra}{config.smart_union}".encode())
+
+            validators = list(klass.__pre_root_validators__)
+            validators += [func for _, func in klass.__post_root_validators__]
+            validators += [
+                vars(base)[method]
+                for base in klass.__mro__
+                for method in _METHODS
+                if method in vars(base) and base.__module__.startswith(__package__)
+            ]
+
+            for function in validators:
+                digest.update(_function(function).encode())
+
+            for name, field in klass.__fields__.items():
+                digest.update(
+                    repr(
+                        (
+                            name,
+                            field.alias,
+                            field.shape,
+                            repr(field.outer_type_),
+                            field.required,
+                            field.allow_none,
+                            repr(field.default),
+                            sorted(field.class_validators),
+                        )
+                    ).encode()
+                )
+
+                for validator in field.class_validators.values():
+                    flags = (validator.pre, validator.each_item, validator.always)
+                    digest.update(repr(flags).encode())
+                    digest.update(_function(validator.func).encode())
+
+        _FINGERPRINTS[model] = digest.hexdigest()
+
+    return _FINGERPRINTS[model]
+
+
+def _digest(pathname: Path) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+
+    with open(pathname, "rb") as fp:  # pylint: disable=invalid-name
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """Directory of pickled, validated models.
+
+    An entry is keyed by model and source path and records the source's
+    size, mtime and content hash plus the model's schema fingerprint. A
+    matching size and mtime is trusted as is; otherwise the content hash is
+    recomputed, so touched-but-unchanged files still hit. A different
+    fingerprint (the models changed) always misses.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, model: Type, pathname: Path) -> Path:
+        key = f"{model.__module__}.{model.__qualname__}:{pathname}"
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.pickle"
+
+    def _read(self, entry: Path) -> Optional[Dict]:
+        try:
+            with open(entry, "rb") as fp:  # pylint: disable=invalid-name
+                header = pickle.load(fp)
+                return {**header, "file": fp.tell()}
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _write(self, entry: Path, header: Dict, value: Any) -> None:
+        temporary = entry.with_suffix(f".{os.getpid()}.tmp")
+
+        with open(temporary, "wb") as fp:  # pylint: disable=invalid-name
+            pickle.dump(header, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary, entry)
+
+    def _value(self, entry: Path, offset: int) -> Any:
+        with open(entry, "rb") as fp:  # pylint: disable=invalid-name
+            fp.seek(offset)
+            return pickle.load(fp)
+
+    def load(self, model: Type, pathname: str, parse: Callable[[str], Any]) -> Any:
+        """Return the cached result of 'parse(pathname)', refreshing if stale."""
+
+        source = Path(pathname).resolve()
+        stat = source.stat()
+        fingerprint = schema_fingerprint(model)
+        entry = self._entry_path(model, source)
+        header = self._read(entry)
+
+        if header is not None and header["fingerprint"] == fingerprint:
+            if (header["size"], header["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                self.hits += 1
+                return self._value(entry, header["file"])
+
+            digest = _digest(source)
+
+            if header["digest"] == digest:
+                value = self._value(entry, header["file"])
+                header.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                del header["file"]
+                self._write(entry, header, value)
+                self.hits += 1
+                return value
+        else:
+            digest = _digest(source)
+
+        self.misses += 1
+        value = parse(pathname)
+
+        header = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest,
+            "fingerprint": fingerprint,
+        }
+        self._write(entry, header, value)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+
+        for entry in self.directory.glob("*.pickle"):
+            entry.unlink()
+
+
+_CACHE: Optional[ModelCache] = None
+
+
+def get_cache() -> Optional[ModelCache]:
+    """Return the active model cache, if any."""
+    return _CACHE
+
+
+def enable_cache(directory: str) -> ModelCache:
+    """Cache every 'from_json' load in 'directory' from now on."""
+
+    global _CACHE  # pylint: disable=global-statement
+
+    _CACHE = ModelCache(directory)
+    return _CACHE
+
+
+def disable_cache() -> None:
+    """Stop caching 'from_json' loads."""
+
+    global _CACHE  # pylint: disable=global-statement
+
+    _CACHE = None
+
+
+@contextmanager
+def model_cache(directory: str):
+    """Cache every 'from_json' load in 'directory' within this block."""
+
+    global _CACHE  # pylint: disable=global-statement
+
+    previous = _CACHE
+    try:
+        yield enable_cache(directory)
+    finally:
+        _CACHE = previous
+
+
+def load_cached(model: Type, pathname: str, parse: Callable[[str], Any]) -> Any:
+    """Run 'parse(pathname)' through the active cache (if one is enabled).
+
+    Loads inside a lazy-tweet, columnar-participant or identity-map session
+    bypass the cache, as their results depend on the session.
+    """
+
+    if (
+        _CACHE is None
+        or lazy_enabled()
+        or columnar_enabled()
+        or current_identity_map() is not None
+    ):
+        return parse(pathname)
+
+    return _CACHE.load(model, pathname, parse)
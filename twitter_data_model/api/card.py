@@ -1,20 +1,31 @@
 from __future__ import annotations
 
 from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
     List,
+    Mapping,
     Optional,
 )
 
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
+    PrivateAttr,
 )
 
 
 from .user_response import UserResult
+from .interning import interned
+from .lazy import LazyModel
 
 
 __all__ = [
     "Card",
+    "CardValues",
+    "UnifiedCard",
+    "iter_card_values",
 ]
 
 
@@ -27,6 +38,25 @@ class Card(BaseModel):
     rest_id: str
     legacy: CardLegacy
 
+    _bindings: Optional[CardValues] = PrivateAttr(None)
+
+    @property
+    def bindings(self) -> CardValues:
+        """Binding values indexed by key (built once per card)."""
+
+        if self._bindings is None:
+            self._bindings = CardValues(self.legacy.binding_values)
+
+        return self._bindings
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the typed value of binding 'key' (e.g. card["title"])."""
+        return self.bindings[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the typed value of binding 'key', or 'default'."""
+        return self.bindings.get(key, default)
+
 
 class CardLegacy(BaseModel):
     """Card Legacy object."""
@@ -64,9 +94,13 @@ class BindingValue(BaseModel):
     scribe_key: Optional[str]
     user_value: Optional[UserValue]
     image_value: Optional[ImageValue]
+    image_color_value: Optional[ImageColorValue]
     string_value: Optional[str]
+    boolean_value: Optional[bool]
     type: str
 
+    _intern = interned("type")
+
 
 class BindingValues(BaseModel):
     """Binding Values object."""
@@ -106,6 +140,7 @@ class ImagePalette(BaseModel):
     """Image Palette object."""
 
     rgb: RGBSpec
+    percentage: float
 
 
 class RGBSpec(BaseModel):
@@ -114,7 +149,6 @@ class RGBSpec(BaseModel):
     red: int
     green: int
     blue: int
-    percentage: float
 
 
 class UnifiedCard(BaseModel):
@@ -122,7 +156,144 @@ class UnifiedCard(BaseModel):
 
     card_fetch_state: str
 
+    _intern = interned("card_fetch_state")
+
+
+# Binding value type -> field holding the value, and the model it decodes to.
+_VALUE_FIELDS = {
+    "STRING": "string_value",
+    "BOOLEAN": "boolean_value",
+    "IMAGE": "image_value",
+    "IMAGE_COLOR": "image_color_value",
+    "USER": "user_value",
+}
+
+_VALUE_MODELS = {
+    "image_value": ImageValue,
+    "image_color_value": ImageColorValue,
+    "user_value": UserValue,
+}
+
+
+def _decode(value: Any) -> Any:
+    """Typed value of one (raw or validated) binding value."""
+
+    if isinstance(value, BindingValue):
+        field = _VALUE_FIELDS.get(value.type)
+        return value if field is None else getattr(value, field)
+
+    field = _VALUE_FIELDS.get(value.get("type"))
+
+    if field is None:
+        return BindingValue.parse_obj(value)
+
+    model = _VALUE_MODELS.get(field)
+    raw = value.get(field)
+
+    if model is None or raw is None:
+        return raw
+
+    return model.parse_obj(raw)
+
+
+class CardValues(Mapping):
+    """Read-only 'key -> value' view of a card's binding values.
+
+    Built from raw 'binding_values' dicts or from validated BindingValues.
+    Lookups are dict lookups; each value is decoded into its typed form
+    ('str', 'bool', ImageValue, ImageColorValue or UserValue) the first
+    time it is read, then cached. Values of unknown type are returned as
+    BindingValue objects.
+    """
+
+    __slots__ = ("_values", "_decoded")
+
+    def __init__(self, binding_values: Iterable[Any]):
+        self._values: Dict[str, Any] = {}
+        self._decoded: Dict[str, Any] = {}
+
+        for binding in binding_values:
+            if isinstance(binding, BindingValues):
+                self._values[binding.key] = binding.value
+            else:
+                self._values[binding["key"]] = binding["value"]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+
+        value = self._decoded[key] = _decode(self._values[key])
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._values)!r})"
+
+
+def _card_values(item: Any) -> Optional[CardValues]:
+    """Binding values of a card, Tweet or raw dict of either (None if none)."""
+
+    if item is None:
+        return None
+
+    if isinstance(item, Card):
+        return item.bindings
+
+    if isinstance(item, LazyModel):
+        if item.model is Card and not item.resolved:
+            # Read the raw card without validating it.
+            return _card_values(item.raw)
+        return _card_values(item.resolve())
+
+    if isinstance(item, Dict):
+        if "binding_values" in item:
+            return CardValues(item["binding_values"])
+        if "binding_values" in (item.get("legacy") or {}):
+            return CardValues(item["legacy"]["binding_values"])
+        if "card" in item:
+            return _card_values(item["card"])
+        if "tweet" in item:
+            return _card_values(item["tweet"])
+        return None
+
+    return _card_values(getattr(item, "card", None))
+
+
+def iter_card_values(
+    items: Iterable[Any], keys: Iterable[str], default: Any = None
+) -> Iterator[Optional[Dict[str, Any]]]:
+    """Yield '{key: value}' for the chosen binding 'keys' of each item.
+
+    Items are Tweets (lazy or not), Cards, or their raw dicts; raw and not
+    yet validated cards are read without being validated, and only the
+    chosen keys are decoded. Missing keys map to 'default'; an item
+    without a card yields None.
+    """
+
+    keys = list(keys)
+
+    for item in items:
+        values = _card_values(item)
+
+        if values is None:
+            yield None
+        else:
+            yield {key: values.get(key, default) for key in keys}
+
 
 Card.update_forward_refs()
 CardLegacy.update_forward_refs()
 BindingValue.update_forward_refs()
+ImageColorValue.update_forward_refs()
+ImagePalette.update_forward_refs()
+ThumbnailImageColor.update_forward_refs()
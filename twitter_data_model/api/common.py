@@ -9,7 +9,8 @@ from typing import (
     Set,
 )
 
-import yaml
+from .cache import load_cached
+from .metrics import observed
 
 
 def _getattr(kwargs: Dict, config: Dict, attr: str, default: Any = None):
@@ -53,18 +54,22 @@ class BaseMixin:
         return cls(**data)
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str, encoding: str = "utf8"):
         """Read from JSON file."""
 
-        with open(
-            pathname, mode="r", encoding=encoding
-        ) as fp:  # pylint: disable=invalid-name
-            data = json.load(fp)
+        def parse(path: str):
+            with open(
+                path, mode="r", encoding=encoding
+            ) as fp:  # pylint: disable=invalid-name
+                data = json.load(fp)
 
-            if isinstance(data, List):
-                return [cls(**datum["data"]["user"]["result"]) for datum in data]
+                if isinstance(data, List):
+                    return [cls(**datum["data"]["user"]["result"]) for datum in data]
 
-            return cls(**data)
+                return cls(**data)
+
+        return load_cached(cls, pathname, parse)
 
     def dict(self, **kwargs):
         """Convert to dict output."""
@@ -90,10 +95,11 @@ class BaseMixin:
     def yaml(self, **kwargs) -> str:
         """Convert to YAML output."""
 
-        config = self.Config
+        import yaml  # pylint: disable=import-outside-toplevel
 
-        kwargs["exclude"] = _getattr(kwargs, config, "exclude", None)
-        kwargs["include"] = _getattr(kwargs, config, "include", None)
+        # 'exclude' and 'include' select fields ('dict' applies the class
+        # settings); the remaining arguments are for 'yaml.dump'.
+        fields = {key: kwargs.pop(key) for key in ("exclude", "include") if key in kwargs}
         kwargs["sort_keys"] = kwargs.get("sort_keys", False)
 
-        return yaml.dump(self.dict(), **kwargs)
+        return yaml.dump(self.dict(**fields), **kwargs)
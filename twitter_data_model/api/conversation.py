@@ -0,0 +1,202 @@
+"""Incremental reply-tree index of conversations.
+
+'ConversationIndex' links tweets by 'legacy.in_reply_to_status_id_str'
+into reply trees, groups them by 'legacy.conversation_id_str' and by
+'legacy.self_thread', and keeps parent and children lookups in dicts, so
+every lookup is O(1) and every new tweet or page attaches without a
+rebuild:
+
+    index = ConversationIndex()
+    index.update(TimelineEntry.iter_jsonl("TweetDetail.jsonl"))
+    for depth, tweet_id in index.iter_depth_first(conversation_id):
+        ...
+
+Replies may arrive before the tweet they reply to: the tree is keyed by
+IDs, so a missing parent is a node without a tweet until it is added.
+"""
+
+from bisect import insort
+from collections import deque
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .timeline import (
+    TimelineEntry,
+    TimelineTimelineModule,
+)
+from .tweet import Tweet
+
+
+__all__ = [
+    "ConversationIndex",
+]
+
+
+def _snowflake(tweet_id: str) -> int:
+    return int(tweet_id)
+
+
+class ConversationIndex:
+    """Reply trees of any number of conversations, built incrementally.
+
+    Nodes are tweet IDs ('legacy.id_str'); 'get' returns the tweet of a node
+    if it has been added. Children are kept in ID (i.e. posting) order.
+    """
+
+    def __init__(self, tweets: Iterable[Any] = ()):
+        self._tweets: Dict[str, Tweet] = {}
+        self._parents: Dict[str, str] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._conversations: Dict[str, List[str]] = {}
+        self._threads: Dict[str, List[str]] = {}
+        self.update(tweets)
+
+    def __len__(self) -> int:
+        return len(self._tweets)
+
+    def __contains__(self, tweet_id: str) -> bool:
+        return tweet_id in self._tweets
+
+    def __getitem__(self, tweet_id: str) -> Tweet:
+        return self._tweets[tweet_id]
+
+    def get(self, tweet_id: str) -> Optional[Tweet]:
+        """Return the tweet of node 'tweet_id', if it has been added."""
+        return self._tweets.get(tweet_id)
+
+    def add(self, tweet: Tweet) -> None:
+        """Add one tweet (adding it again replaces the stored object)."""
+
+        legacy = tweet.legacy
+        tweet_id = legacy.id_str
+        known = tweet_id in self._tweets
+        self._tweets[tweet_id] = tweet
+
+        if known:
+            return
+
+        insort(
+            self._conversations.setdefault(legacy.conversation_id_str, []),
+            tweet_id,
+            key=_snowflake,
+        )
+
+        if legacy.self_thread is not None:
+            insort(
+                self._threads.setdefault(legacy.self_thread.id_str, []),
+                tweet_id,
+                key=_snowflake,
+            )
+
+        parent = legacy.in_reply_to_status_id_str
+
+        if parent is not None:
+            self._parents[tweet_id] = parent
+            insort(self._children.setdefault(parent, []), tweet_id, key=_snowflake)
+
+    def add_entry(self, entry: TimelineEntry) -> None:
+        """Add the tweets of a timeline entry (item or conversation module)."""
+
+        content = entry.content
+
+        if isinstance(content, TimelineTimelineModule):
+            items = [item.tweet_results.result for item in content]
+        elif hasattr(getattr(content, "item_content", None), "tweet_results"):
+            items = [entry.result]
+        else:
+            # User items and cursors hold no tweet.
+            items = []
+
+        for tweet in items:
+            self.add(tweet)
+
+    def update(self, items: Iterable[Any]) -> None:
+        """Add every Tweet or TimelineEntry of 'items'."""
+
+        for item in items:
+            if isinstance(item, TimelineEntry):
+                self.add_entry(item)
+            else:
+                self.add(item)
+
+    def parent(self, tweet_id: str) -> Optional[str]:
+        """Return the ID of the tweet 'tweet_id' replies to."""
+        return self._parents.get(tweet_id)
+
+    def children(self, tweet_id: str) -> List[str]:
+        """Return the IDs of the known direct replies to 'tweet_id'."""
+        return list(self._children.get(tweet_id, ()))
+
+    def ancestors(self, tweet_id: str) -> Iterator[str]:
+        """Yield the IDs from the parent of 'tweet_id' up to its root."""
+
+        seen = {tweet_id}
+        parent = self._parents.get(tweet_id)
+
+        while parent is not None and parent not in seen:
+            seen.add(parent)
+            yield parent
+            parent = self._parents.get(parent)
+
+    def root(self, tweet_id: str) -> str:
+        """Return the topmost known ancestor of 'tweet_id' (or itself)."""
+
+        root = tweet_id
+
+        for root in self.ancestors(tweet_id):
+            pass
+
+        return root
+
+    def conversation(self, conversation_id: str) -> List[str]:
+        """Return the IDs of the added tweets of a conversation, in ID order."""
+        return list(self._conversations.get(conversation_id, ()))
+
+    def self_thread(self, tweet_id: str) -> List[str]:
+        """Return the IDs of the author's self-thread 'tweet_id' belongs to."""
+
+        tweet = self._tweets.get(tweet_id)
+
+        if tweet is None or tweet.legacy.self_thread is None:
+            return []
+
+        return list(self._threads[tweet.legacy.self_thread.id_str])
+
+    def iter_depth_first(self, tweet_id: str) -> Iterator[Tuple[int, str]]:
+        """Yield '(depth, ID)' of the subtree at 'tweet_id', in pre-order."""
+
+        seen = set()
+        stack = [(0, tweet_id)]
+
+        while stack:
+            depth, node = stack.pop()
+
+            if node in seen:
+                continue
+
+            seen.add(node)
+            yield depth, node
+            children = self._children.get(node, ())
+            stack.extend((depth + 1, child) for child in reversed(children))
+
+    def iter_breadth_first(self, tweet_id: str) -> Iterator[Tuple[int, str]]:
+        """Yield '(depth, ID)' of the subtree at 'tweet_id', level by level."""
+
+        seen = {tweet_id}
+        queue = deque([(0, tweet_id)])
+
+        while queue:
+            depth, node = queue.popleft()
+            yield depth, node
+
+            for child in self._children.get(node, ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((depth + 1, child))
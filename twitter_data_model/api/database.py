@@ -0,0 +1,413 @@
+"""Bulk SQLite export and loading of tweets, users, media and audio spaces."""
+
+import sqlite3
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+
+from .audio_space import AudioSpace
+from .media import Media
+from .tweet import LazyTweet, Tweet
+from .user import User
+
+
+__all__ = [
+    "SQLiteExporter",
+    "SQLiteLoader",
+]
+
+
+_TABLES = {
+    "users": (
+        "rest_id INTEGER PRIMARY KEY",
+        "id TEXT",
+        "screen_name TEXT",
+        "name TEXT",
+        "created_at TEXT",
+        "description TEXT",
+        "location TEXT",
+        "followers_count INTEGER",
+        "friends_count INTEGER",
+        "statuses_count INTEGER",
+        "favourites_count INTEGER",
+        "listed_count INTEGER",
+        "media_count INTEGER",
+        "verified INTEGER",
+        "is_blue_verified INTEGER",
+        "json TEXT",
+    ),
+    "tweets": (
+        "rest_id INTEGER PRIMARY KEY",
+        "user_rest_id INTEGER",
+        "created_at TEXT",
+        "conversation_id INTEGER",
+        "in_reply_to_status_id INTEGER",
+        "in_reply_to_user_id INTEGER",
+        "is_quote_status INTEGER",
+        "lang TEXT",
+        "full_text TEXT",
+        "favorite_count INTEGER",
+        "retweet_count INTEGER",
+        "reply_count INTEGER",
+        "quote_count INTEGER",
+        "bookmark_count INTEGER",
+        "view_count INTEGER",
+        "source TEXT",
+        "json TEXT",
+    ),
+    "media": (
+        "id INTEGER",
+        "tweet_rest_id INTEGER",
+        "media_key TEXT",
+        "type TEXT",
+        "media_url_https TEXT",
+        "expanded_url TEXT",
+        "width INTEGER",
+        "height INTEGER",
+        "duration_millis INTEGER",
+        "view_count INTEGER",
+        "json TEXT",
+        "PRIMARY KEY (id, tweet_rest_id)",
+    ),
+    "mentions": (
+        "tweet_rest_id INTEGER",
+        "user_rest_id INTEGER",
+        "screen_name TEXT",
+        "name TEXT",
+        "start INTEGER",
+        "end INTEGER",
+        "PRIMARY KEY (tweet_rest_id, start)",
+    ),
+    "hashtags": (
+        "tweet_rest_id INTEGER",
+        "text TEXT",
+        "start INTEGER",
+        "end INTEGER",
+        "PRIMARY KEY (tweet_rest_id, start)",
+    ),
+    "urls": (
+        "tweet_rest_id INTEGER",
+        "url TEXT",
+        "expanded_url TEXT",
+        "display_url TEXT",
+        "start INTEGER",
+        "end INTEGER",
+        "PRIMARY KEY (tweet_rest_id, start)",
+    ),
+    "audio_spaces": (
+        "rest_id TEXT PRIMARY KEY",
+        "title TEXT",
+        "state TEXT",
+        "creator_rest_id INTEGER",
+        "created_at INTEGER",
+        "started_at INTEGER",
+        "total_live_listeners INTEGER",
+        "total_replay_watched INTEGER",
+        "json TEXT",
+    ),
+}
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS tweets_user ON tweets (user_rest_id)",
+    "CREATE INDEX IF NOT EXISTS tweets_conversation ON tweets (conversation_id)",
+    "CREATE INDEX IF NOT EXISTS users_screen_name ON users (screen_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS media_tweet ON media (tweet_rest_id)",
+    "CREATE INDEX IF NOT EXISTS mentions_user ON mentions (user_rest_id)",
+    "CREATE INDEX IF NOT EXISTS hashtags_text ON hashtags (text COLLATE NOCASE)",
+)
+
+
+def _columns(table: str) -> List[str]:
+    return [
+        column.split()[0]
+        for column in _TABLES[table]
+        if not column.startswith("PRIMARY KEY")
+    ]
+
+
+def _statement(table: str) -> str:
+    # Every table has a primary key (entities are keyed by their tweet and
+    # position), so exporting a model again replaces its rows.
+    columns = _columns(table)
+    return (
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+class SQLiteExporter:
+    """Write models into normalised SQLite tables.
+
+    Rows are buffered per table and written with 'executemany' every
+    'batch_size' rows, inside a WAL-journaled connection; secondary indexes
+    are only built on 'close', after the bulk load. Each row keeps the
+    model's JSON, from which 'SQLiteLoader' rebuilds it.
+    """
+
+    def __init__(self, pathname: str, batch_size: int = 10000):
+        self.pathname = pathname
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(pathname)
+        self._rows: Dict[str, List[Tuple]] = {table: [] for table in _TABLES}
+        self._pending = 0
+        self._users: Set[int] = set()
+
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+
+        for table, columns in _TABLES.items():
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})"
+            )
+
+    def __enter__(self) -> "SQLiteExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _append(self, table: str, row: Tuple) -> None:
+        self._rows[table].append(row)
+        self._pending += 1
+
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def add(self, model: BaseModel) -> None:
+        """Export a Tweet, User, Media or AudioSpace model."""
+
+        if isinstance(model, Tweet):
+            self.add_tweet(model)
+        elif isinstance(model, User):
+            self.add_user(model)
+        elif isinstance(model, Media):
+            self.add_media(model)
+        elif isinstance(model, AudioSpace):
+            self.add_audio_space(model)
+        else:
+            raise TypeError(f"Cannot export {type(model).__name__} objects")
+
+    def extend(self, models: Iterable[BaseModel]) -> None:
+        """Export several models."""
+
+        for model in models:
+            self.add(model)
+
+    def add_user(self, user: User) -> None:
+        """Export one User (once per exporter, however often it recurs)."""
+
+        if user.rest_id in self._users:
+            return
+
+        self._users.add(user.rest_id)
+        legacy = user.legacy
+        self._append(
+            "users",
+            (
+                user.rest_id,
+                user.id,
+                legacy.screen_name,
+                legacy.name,
+                legacy.created_at,
+                legacy.description,
+                legacy.location,
+                legacy.followers_count,
+                legacy.friends_count,
+                legacy.statuses_count,
+                legacy.favorites_count,
+                legacy.listed_count,
+                legacy.media_count,
+                legacy.verified,
+                user.is_blue_verified,
+                user.json(by_alias=True),
+            ),
+        )
+
+    def add_tweet(self, tweet: Tweet) -> None:
+        """Export one Tweet, its author, media and entities."""
+
+        if isinstance(tweet, LazyTweet):
+            tweet = tweet.to_tweet()
+
+        legacy = tweet.legacy
+        rest_id = tweet.rest_id
+
+        self._append(
+            "tweets",
+            (
+                rest_id,
+                int(legacy.user_id_str),
+                legacy.created_at,
+                int(legacy.conversation_id_str),
+                _int(legacy.in_reply_to_status_id_str),
+                _int(legacy.in_reply_to_user_id_str),
+                legacy.is_quote_status,
+                legacy.lang,
+                legacy.full_text,
+                legacy.favorite_count,
+                legacy.retweet_count,
+                legacy.reply_count,
+                legacy.quote_count,
+                legacy.bookmark_count,
+                tweet.views.count,
+                tweet.source,
+                tweet.json(by_alias=True),
+            ),
+        )
+
+        if isinstance(tweet.user, User):
+            self.add_user(tweet.user)
+
+        entities = legacy.entities
+
+        for mention in entities.user_mentions or []:
+            self._append(
+                "mentions",
+                (rest_id, int(mention.id_str), mention.screen_name, mention.name)
+                + tuple(mention.indices),
+            )
+
+        for hashtag in entities.hashtags or []:
+            self._append("hashtags", (rest_id, hashtag.text) + tuple(hashtag.indices))
+
+        for url in entities.urls or []:
+            self._append(
+                "urls",
+                (rest_id, url.url, url.expanded_url, url.display_url)
+                + tuple(url.indices),
+            )
+
+        media = (legacy.extended_entities or entities).media
+        for item in media or []:
+            self.add_media(item, rest_id)
+
+    def add_media(self, media: Media, tweet_rest_id: Optional[int] = None) -> None:
+        """Export one Media item (optionally attached to a Tweet)."""
+
+        video = media.video_info
+        self._append(
+            "media",
+            (
+                int(media.id_str),
+                tweet_rest_id,
+                media.media_key,
+                media.type,
+                media.media_url_https,
+                media.expanded_url,
+                media.original_info.width,
+                media.original_info.height,
+                video.duration_millis if video else None,
+                media.media_stats.view_count if media.media_stats else None,
+                media.json(by_alias=True),
+            ),
+        )
+
+    def add_audio_space(self, audio_space: AudioSpace) -> None:
+        """Export one Audio Space and its creator."""
+
+        metadata = audio_space.metadata
+        creator = metadata.creator_results.result
+
+        self._append(
+            "audio_spaces",
+            (
+                metadata.rest_id,
+                metadata.title,
+                metadata.state,
+                creator.rest_id,
+                metadata.created_at,
+                metadata.started_at,
+                metadata.total_live_listeners,
+                metadata.total_replay_watched,
+                audio_space.json(by_alias=True),
+            ),
+        )
+
+        self.add_user(creator)
+
+    def flush(self) -> None:
+        """Write all buffered rows in one transaction."""
+
+        with self.connection:
+            for table, rows in self._rows.items():
+                if rows:
+                    self.connection.executemany(_statement(table), rows)
+                    rows.clear()
+
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flush, build the secondary indexes and close the connection."""
+
+        self.flush()
+
+        with self.connection:
+            for statement in _INDEXES:
+                self.connection.execute(statement)
+
+        self.connection.close()
+
+
+class SQLiteLoader:
+    """Rebuild models from an exported SQLite database, one row at a time."""
+
+    def __init__(self, pathname: str):
+        self.connection = sqlite3.connect(pathname)
+
+    def __enter__(self) -> "SQLiteLoader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load(
+        self, model: Type[BaseModel], table: str, where: str, params: Tuple
+    ) -> Iterator[Any]:
+        query = f"SELECT json FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+
+        for (data,) in self.connection.execute(query, params):
+            yield model.parse_raw(data)
+
+    def tweets(
+        self, where: str = "", params: Tuple = (), lazy: bool = False
+    ) -> Iterator[Tweet]:
+        """Yield Tweets (or LazyTweets) matching an optional SQL filter."""
+
+        return self._load(LazyTweet if lazy else Tweet, "tweets", where, params)
+
+    def users(self, where: str = "", params: Tuple = ()) -> Iterator[User]:
+        """Yield Users matching an optional SQL filter."""
+        return self._load(User, "users", where, params)
+
+    def media(self, where: str = "", params: Tuple = ()) -> Iterator[Media]:
+        """Yield Media matching an optional SQL filter."""
+        return self._load(Media, "media", where, params)
+
+    def audio_spaces(
+        self, where: str = "", params: Tuple = ()
+    ) -> Iterator[AudioSpace]:
+        """Yield Audio Spaces matching an optional SQL filter."""
+        return self._load(AudioSpace, "audio_spaces", where, params)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
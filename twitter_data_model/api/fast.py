@@ -0,0 +1,479 @@
+"""Compiled fast-path parser generated from the pydantic models.
+
+'compile_model' walks a model's fields (as prepared by pydantic) and emits
+Python source for one specialised parse function per reachable model. Each
+function reads the declared aliases straight out of the raw dict, applies
+the same coercions pydantic v1 would for the declared types, and stores the
+result on a '__slots__' class. 'FastModel.dict()' matches the pydantic
+'.dict()' output for the same input.
+
+Only type validation, aliases, defaults, 'extra = "forbid"' and interned
+fields are reproduced. Other custom validators (e.g. the Union dispatch in
+'response') only pick between Union members, which the generated code does
+by trial in declaration order, like pydantic.
+"""
+
+from collections import deque
+from copy import deepcopy
+from types import GeneratorType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Type,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+    Extra,
+)
+from pydantic.fields import (  # pylint: disable=no-name-in-module
+    ModelField,
+    SHAPE_DICT,
+    SHAPE_LIST,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE,
+)
+from pydantic.typing import (  # pylint: disable=no-name-in-module
+    all_literal_values,
+    is_literal_type,
+)
+
+from .interning import (
+    _intern,
+    intern_value,
+)
+
+
+__all__ = [
+    "FastModel",
+    "FastValidationError",
+    "compile_model",
+    "parse_fast",
+    "source",
+]
+
+
+class FastValidationError(ValueError):
+    """Raised when a raw value does not match the declared type."""
+
+    def __init__(self, loc: str, message: str):
+        super().__init__(f"{loc}: {message}")
+        self.loc = loc
+
+
+class FastModel:
+    """Base class of the generated '__slots__' model classes."""
+
+    __slots__ = ()
+
+    __fields__: Tuple[str, ...] = ()
+    model: Type[BaseModel] = BaseModel
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__fields__)
+
+    __hash__ = None
+
+    def __iter__(self):
+        for key in self.__fields__:
+            yield key, getattr(self, key)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{key}={value!r}" for key, value in self)
+        return f"{type(self).__name__}({values})"
+
+    def dict(self) -> Dict[str, Any]:
+        """Convert to dict output (same shape as the pydantic '.dict()')."""
+        return {key: _to_python(value) for key, value in self}
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, FastModel):
+        return value.dict()
+    if isinstance(value, dict):
+        return {key: _to_python(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return value.__class__(_to_python(item) for item in value)
+    return value
+
+
+_SEQUENCES = (list, tuple, set, frozenset, GeneratorType, deque)
+
+_BOOL_TRUE = {1, "1", "on", "t", "true", "y", "yes"}
+_BOOL_FALSE = {0, "0", "off", "f", "false", "n", "no"}
+
+
+def _str(value, loc):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (float, int)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    raise FastValidationError(loc, "str type expected")
+
+
+def _int(value, loc):
+    if isinstance(value, int) and not (value is True or value is False):
+        return value
+    if isinstance(value, (str, bytes, bytearray)) and len(value) > 4300:
+        raise FastValidationError(loc, "value is not a valid integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise FastValidationError(loc, "value is not a valid integer") from None
+
+
+def _float(value, loc):
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise FastValidationError(loc, "value is not a valid float") from None
+
+
+def _bool(value, loc):
+    if value is True or value is False:
+        return value
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, str):
+        value = value.lower()
+    try:
+        if value in _BOOL_TRUE:
+            return True
+        if value in _BOOL_FALSE:
+            return False
+    except TypeError:
+        pass
+    raise FastValidationError(loc, "value could not be parsed to a boolean")
+
+
+def _sequence(value, loc):
+    if isinstance(value, _SEQUENCES):
+        return value
+    raise FastValidationError(loc, "value is not a valid sequence")
+
+
+def _mapping(value, loc):
+    if isinstance(value, dict):
+        return value
+    try:
+        return dict(value)
+    except (TypeError, ValueError):
+        raise FastValidationError(loc, "value is not a valid dict") from None
+
+
+def _fail(loc, message):
+    raise FastValidationError(loc, message)
+
+
+_HELPERS = {
+    "_str": _str,
+    "_int": _int,
+    "_float": _float,
+    "_bool": _bool,
+    "_sequence": _sequence,
+    "_mapping": _mapping,
+    "_fail": _fail,
+    "_intern": intern_value,
+    "_new": object.__new__,
+    "_deepcopy": deepcopy,
+    "_FastModel": FastModel,
+    "FastValidationError": FastValidationError,
+}
+
+_SCALARS = {
+    str: "_str",
+    int: "_int",
+    float: "_float",
+    bool: "_bool",
+}
+
+
+class _Generator:
+    """Emit parse functions for a model and every model it refers to."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = dict(_HELPERS)
+        self.functions: Dict[Type[BaseModel], str] = {}
+        self.classes: Dict[Type[BaseModel], str] = {}
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value: Any) -> str:
+        name = self.name("_c")
+        self.namespace[name] = value
+        return name
+
+    def emit(self, *lines: str) -> None:
+        self.lines.extend(lines)
+        self.lines.append("")
+
+    def model(self, model: Type[BaseModel]) -> str:
+        """Return the parse function name for 'model', generating it once."""
+
+        if model in self.functions:
+            return self.functions[model]
+
+        function = self.name(f"parse_{model.__name__}_")
+        klass = self.name(f"{model.__name__}_")
+        self.functions[model] = function
+        self.classes[model] = klass
+
+        fields = tuple(model.__fields__)
+        self.namespace[f"{klass}_model"] = model
+        self.emit(
+            f"class {klass}(_FastModel):",
+            f"    __slots__ = {fields!r}",
+            "    __fields__ = __slots__",
+            f"    model = {klass}_model",
+            "",
+            f"{klass}.__name__ = {klass}.__qualname__ = {model.__name__!r}",
+        )
+
+        body = [
+            f"def {function}(data):",
+            "    if data.__class__ is not dict:",
+        ]
+
+        if model.__custom_root_type__:
+            body += ["        data = {'__root__': data}"]
+            body += ["    elif data.keys() != {'__root__'}:"]
+            body += ["        data = {'__root__': data}"]
+        else:
+            body += [f"        data = _mapping(data, {model.__name__!r})"]
+
+        if model.__config__.extra == Extra.forbid:
+            aliases = self.constant(frozenset(f.alias for f in model.__fields__.values()))
+            body += [
+                f"    if not data.keys() <= {aliases}:",
+                f"        _fail({model.__name__!r}, 'extra fields not permitted')",
+            ]
+
+        body += [f"    obj = _new({klass})", "    get = data.get"]
+
+        for key, field in model.__fields__.items():
+            loc = f"{model.__name__}.{key}"
+            body += [f"    value = get({field.alias!r}, _missing)"]
+            body += ["    if value is _missing:"]
+
+            if field.required:
+                body += [f"        _fail({loc!r}, 'field required')"]
+            else:
+                body += [f"        obj.{key} = {self.default(field)}"]
+
+            body += ["    else:"]
+            body += [f"        obj.{key} = {self.field(field, 'value', loc)}"]
+
+        body += ["    return obj"]
+        self.emit(*body)
+
+        return function
+
+    def default(self, field: ModelField) -> str:
+        value = field.default
+
+        if value is None or isinstance(value, (str, int, float, bool, tuple)):
+            return repr(value)
+
+        return f"_deepcopy({self.constant(value)})"
+
+    def field(self, field: ModelField, var: str, loc: str) -> str:
+        """Return an expression validating 'var' against 'field'."""
+
+        expression = self.shape(field, var, loc)
+
+        if any(v.func is _intern for v in field.class_validators.values()):
+            expression = f"_intern({expression})"
+
+        if field.allow_none:
+            expression = f"(None if {var} is None else {expression})"
+
+        return expression
+
+    def shape(self, field: ModelField, var: str, loc: str) -> str:
+        if field.shape == SHAPE_SINGLETON:
+            return self.singleton(field, var, loc)
+
+        if field.shape == SHAPE_LIST:
+            item = self.field(field.sub_fields[0], "item", loc)
+            return f"[{item} for item in _sequence({var}, {loc!r})]"
+
+        if field.shape == SHAPE_TUPLE:
+            function = self.name("_tuple")
+            items = ", ".join(
+                self.field(sub_field, f"value[{index}]", loc)
+                for index, sub_field in enumerate(field.sub_fields)
+            )
+            self.emit(
+                f"def {function}(value):",
+                f"    value = _sequence(value, {loc!r})",
+                f"    if len(value) != {len(field.sub_fields)}:",
+                f"        _fail({loc!r}, 'wrong tuple length')",
+                "    value = tuple(value)",
+                f"    return ({items},)",
+            )
+            return f"{function}({var})"
+
+        if field.shape == SHAPE_DICT:
+            key = self.field(field.key_field, "key", loc)
+            item = self.field(field.sub_fields[0], "item", loc)
+            return f"{{{key}: {item} for key, item in _mapping({var}, {loc!r}).items()}}"
+
+        raise NotImplementedError(f"{loc}: unsupported field shape {field.shape}")
+
+    def singleton(self, field: ModelField, var: str, loc: str) -> str:
+        type_ = field.type_
+
+        if field.discriminator_key is not None:
+            return self.discriminated(field, var, loc)
+
+        if field.sub_fields:
+            return self.union(field, var, loc)
+
+        if type_ is Any:
+            return var
+
+        if is_literal_type(type_):
+            values = all_literal_values(type_)
+            choices = self.constant({value: value for value in values})
+            message = f"unexpected value; permitted: {', '.join(map(repr, values))}"
+            return (
+                f"({choices}[{var}] if {var} in {choices} "
+                f"else _fail({loc!r}, {message!r}))"
+            )
+
+        if type_ in _SCALARS:
+            helper = _SCALARS[type_]
+            return f"({var} if {var}.__class__ is {type_.__name__} else {helper}({var}, {loc!r}))"
+
+        if isinstance(type_, type) and issubclass(type_, BaseModel):
+            return f"{self.model(type_)}({var})"
+
+        raise NotImplementedError(f"{loc}: unsupported field type {type_!r}")
+
+    def discriminated(self, field: ModelField, var: str, loc: str) -> str:
+        function = self.name("_discriminated")
+        mapping = {
+            value: self.field(sub_field, "value", loc)
+            for value, sub_field in field.sub_fields_mapping.items()
+        }
+
+        body = [
+            f"def {function}(value):",
+            "    try:",
+            f"        key = value[{field.discriminator_alias!r}]",
+            "    except (KeyError, TypeError):",
+            f"        _fail({loc!r}, {f'discriminator {field.discriminator_alias!r} missing'!r})",
+        ]
+
+        for value, expression in mapping.items():
+            body += [f"    if key == {value!r}:", f"        return {expression}"]
+
+        body += [f"    _fail({loc!r}, 'no match for discriminator')"]
+        self.emit(*body)
+
+        return f"{function}({var})"
+
+    def union(self, field: ModelField, var: str, loc: str) -> str:
+        function = self.name("_union")
+        body = [f"def {function}(value):", "    is_dict = value.__class__ is dict"]
+
+        for sub_field in field.sub_fields:
+            guard = self.guard(sub_field)
+            indent = "    "
+
+            if guard:
+                body += [f"    if not is_dict or ({guard}):"]
+                indent = "        "
+
+            body += [
+                f"{indent}try:",
+                f"{indent}    return {self.field(sub_field, 'value', loc)}",
+                f"{indent}except FastValidationError:",
+                f"{indent}    pass",
+            ]
+
+        body += [f"    _fail({loc!r}, 'no Union member matched')"]
+        self.emit(*body)
+
+        return f"{function}({var})"
+
+    def guard(self, field: ModelField) -> str:
+        """Cheap pre-check skipping Union members that are certain to fail."""
+
+        type_ = field.type_
+
+        if field.shape != SHAPE_SINGLETON or not (
+            isinstance(type_, type) and issubclass(type_, BaseModel)
+        ):
+            return ""
+
+        checks = []
+
+        for sub_field in type_.__fields__.values():
+            if not sub_field.required:
+                continue
+
+            checks.append(f"{sub_field.alias!r} in value")
+
+            if is_literal_type(sub_field.type_):
+                choices = self.constant(frozenset(all_literal_values(sub_field.type_)))
+                checks.append(f"value[{sub_field.alias!r}] in {choices}")
+
+        return " and ".join(checks)
+
+
+class _Compiled:
+    __slots__ = ("function", "source", "classes")
+
+    def __init__(self, function: Callable, source: str, classes: Dict):
+        self.function = function
+        self.source = source
+        self.classes = classes
+
+
+_COMPILED: Dict[Type[BaseModel], _Compiled] = {}
+
+
+def _compile(model: Type[BaseModel]) -> _Compiled:
+    if model not in _COMPILED:
+        generator = _Generator()
+        function = generator.model(model)
+        code = "\n".join(generator.lines)
+        namespace = generator.namespace
+        namespace["_missing"] = object()
+        namespace["__name__"] = __name__
+
+        exec(compile(code, f"<fast {model.__name__}>", "exec"), namespace)  # pylint: disable=exec-used
+
+        classes = {m: namespace[name] for m, name in generator.classes.items()}
+        _COMPILED[model] = _Compiled(namespace[function], code, classes)
+
+    return _COMPILED[model]
+
+
+def compile_model(model: Type[BaseModel]) -> Callable[[Any], FastModel]:
+    """Return the generated parse function for 'model' (compiled once)."""
+    return _compile(model).function
+
+
+def source(model: Type[BaseModel]) -> str:
+    """Return the generated source code for 'model'."""
+    return _compile(model).source
+
+
+def parse_fast(model: Type[BaseModel], data: Any) -> FastModel:
+    """Parse raw 'data' into the slotted fast-path equivalent of 'model'."""
+    return compile_model(model)(data)
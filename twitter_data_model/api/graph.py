@@ -0,0 +1,740 @@
+"""Compact follow and interaction graphs.
+
+'FollowGraphBuilder' streams Followers/Following entries (page files or
+entry iterables, raw or validated) and keeps only their edges, as arrays
+of dense integer indices. 'build' turns them into a 'FollowGraph': a
+compressed sparse row (CSR) adjacency in both directions, with Rest IDs
+mapped to dense indices through a sorted ID array:
+
+    builder = FollowGraphBuilder()
+    builder.add_followers(owner_id, "Followers.jsonl")
+    graph = builder.build()
+    graph.save("follows.graph")
+
+    with FollowGraph.load("follows.graph") as graph:
+        graph.mutuals(owner_id)
+
+A graph takes 8 bytes per edge (4 per direction) plus 24 bytes per user,
+and 'load' memory-maps the file instead of reading it.
+
+'InteractionGraph' accumulates weighted mention, reply and quote edges
+from a stream of tweets into the same kind of CSR arrays, and ranks users
+by PageRank or degree centrality.
+"""
+
+import heapq
+import mmap
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from operator import mul
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .timeline import (
+    TimelineEntry,
+    TimelineTimelineModule,
+)
+from .tweet import (
+    Tweet,
+    _quoted_user_id,
+)
+from .utils import iter_records
+
+
+__all__ = [
+    "FollowGraph",
+    "FollowGraphBuilder",
+    "InteractionGraph",
+]
+
+
+_MAGIC = b"TDMGRAPH"
+
+# Magic, byte order, number of users, number of edges.
+_HEADER = struct.Struct("<8s8sQQ")
+
+
+def _user_ids(sources: Iterable[Any]) -> Iterator[int]:
+    """Rest IDs of the users of Followers/Following timeline entries."""
+
+    for source in sources:
+        for entry in iter_records(source):
+            if isinstance(entry, TimelineEntry):
+                item = getattr(entry.content, "item_content", None)
+                result = getattr(getattr(item, "user_results", None), "result", None)
+                rest_id = getattr(result, "rest_id", None)
+            else:
+                item = entry.get("content", {}).get("itemContent") or {}
+                result = (item.get("user_results") or {}).get("result") or {}
+                rest_id = result.get("rest_id")
+
+            # Cursors, tweets and unavailable users have no Rest ID.
+            if rest_id is not None:
+                yield int(rest_id)
+
+
+def _csr(
+    nodes: int,
+    rows: Sequence[int],
+    columns: Sequence[int],
+    weights: Optional[Sequence[float]] = None,
+) -> Tuple[array, array, Optional[array]]:
+    """Offsets, columns and weights of the CSR of an edge list.
+
+    Rows are sorted and deduplicated; with 'weights', the weights of
+    duplicate edges are summed (otherwise the third value is None).
+    """
+
+    counts = array("Q", bytes(8 * (nodes + 1)))
+
+    for row in rows:
+        counts[row + 1] += 1
+
+    for index in range(nodes):
+        counts[index + 1] += counts[index]
+
+    cursor = array("Q", counts)
+    filled = array("I", bytes(4 * len(rows)))
+    values = None if weights is None else array("d", bytes(8 * len(rows)))
+
+    for position, (row, column) in enumerate(zip(rows, columns)):
+        filled[cursor[row]] = column
+        if values is not None:
+            values[cursor[row]] = weights[position]
+        cursor[row] += 1
+
+    # Sort and deduplicate each row, compacting in place.
+    offsets = array("Q", bytes(8 * (nodes + 1)))
+    end = 0
+
+    for index in range(nodes):
+        start, stop = counts[index], counts[index + 1]
+
+        if values is None:
+            row = sorted(set(filled[start:stop]))
+        else:
+            summed: Dict[int, float] = {}
+            for column, weight in zip(filled[start:stop], values[start:stop]):
+                summed[column] = summed.get(column, 0.0) + weight
+            row = sorted(summed)
+            values[end : end + len(row)] = array("d", (summed[c] for c in row))
+
+        filled[end : end + len(row)] = array("I", row)
+        end += len(row)
+        offsets[index + 1] = end
+
+    del filled[end:]
+    if values is not None:
+        del values[end:]
+
+    return offsets, filled, values
+
+
+class FollowGraphBuilder:
+    """Edge accumulator for a 'FollowGraph'.
+
+    An edge points from the follower to the followed user. Rest IDs are
+    mapped to dense indices as they are first seen; self-follows are
+    ignored and duplicate edges are dropped by 'build'.
+    """
+
+    def __init__(self):
+        self._index: Dict[int, int] = {}
+        self._ids = array("Q")
+        self._followers = array("I")
+        self._followed = array("I")
+
+    def __len__(self) -> int:
+        return len(self._followers)
+
+    def _node(self, rest_id: int) -> int:
+        index = self._index.get(rest_id)
+
+        if index is None:
+            index = self._index[rest_id] = len(self._ids)
+            self._ids.append(rest_id)
+
+        return index
+
+    def add_edge(self, follower: int, followed: int) -> None:
+        """Record that 'follower' follows 'followed' (Rest IDs)."""
+
+        follower, followed = int(follower), int(followed)
+
+        if follower == followed:
+            return
+
+        self._followers.append(self._node(follower))
+        self._followed.append(self._node(followed))
+
+    def add_followers(self, user_id: int, *sources: Any) -> None:
+        """Add the edges of the Followers timeline of 'user_id'."""
+
+        for rest_id in _user_ids(sources):
+            self.add_edge(rest_id, user_id)
+
+    def add_following(self, user_id: int, *sources: Any) -> None:
+        """Add the edges of the Following timeline of 'user_id'."""
+
+        for rest_id in _user_ids(sources):
+            self.add_edge(user_id, rest_id)
+
+    def build(self) -> "FollowGraph":
+        """Return the CSR graph of the edges added so far."""
+
+        nodes = len(self._ids)
+        order = sorted(range(nodes), key=self._ids.__getitem__)
+        rank = array("I", bytes(4 * nodes))
+
+        for new, old in enumerate(order):
+            rank[old] = new
+
+        ids = array("Q", (self._ids[old] for old in order))
+        followers = array("I", (rank[index] for index in self._followers))
+        followed = array("I", (rank[index] for index in self._followed))
+
+        out_offsets, out_targets, _ = _csr(nodes, followers, followed)
+        in_offsets, in_targets, _ = _csr(nodes, followed, followers)
+
+        return FollowGraph(ids, out_offsets, out_targets, in_offsets, in_targets)
+
+
+def _split(
+    view: memoryview, nodes: int, edges: int, memory_map: bool
+) -> List[Sequence[int]]:
+    """Sections of a saved graph, as views of 'view' or as arrays."""
+
+    sections: List[Sequence[int]] = []
+    position = _HEADER.size
+
+    for code, count in (
+        ("Q", nodes),
+        ("Q", nodes + 1),
+        ("Q", nodes + 1),
+        ("I", edges),
+        ("I", edges),
+    ):
+        size = count * array(code).itemsize
+        part = view[position : position + size]
+
+        if memory_map:
+            part = part.cast(code)
+        else:
+            part, data = array(code), part
+            part.frombytes(data)
+
+        sections.append(part)
+        position += size
+
+    return sections
+
+
+class FollowGraph:
+    """Follow graph as compressed sparse rows, queried by Rest ID.
+
+    Users are numbered by the order of their Rest IDs ('ids' is sorted), so
+    no ID-to-index dict is kept: 'index' is a binary search. Out-edges
+    (following) and in-edges (followers) each have their own CSR arrays,
+    with sorted rows.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        ids: Sequence[int],
+        out_offsets: Sequence[int],
+        out_targets: Sequence[int],
+        in_offsets: Sequence[int],
+        in_targets: Sequence[int],
+        buffer: Any = None,
+    ):
+        self.ids = ids
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.in_offsets = in_offsets
+        self.in_targets = in_targets
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, rest_id: int) -> bool:
+        rest_id = int(rest_id)
+        position = bisect_left(self.ids, rest_id)
+        return position < len(self.ids) and self.ids[position] == rest_id
+
+    def __enter__(self) -> "FollowGraph":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def edges(self) -> int:
+        """Number of (distinct) follow edges."""
+        return len(self.out_targets)
+
+    def index(self, rest_id: int) -> int:
+        """Return the dense index of 'rest_id' (KeyError if unknown)."""
+
+        rest_id = int(rest_id)
+        position = bisect_left(self.ids, rest_id)
+
+        if position == len(self.ids) or self.ids[position] != rest_id:
+            raise KeyError(rest_id)
+
+        return position
+
+    def _following(self, index: int) -> Sequence[int]:
+        return self.out_targets[self.out_offsets[index] : self.out_offsets[index + 1]]
+
+    def _followers(self, index: int) -> Sequence[int]:
+        return self.in_targets[self.in_offsets[index] : self.in_offsets[index + 1]]
+
+    def following(self, rest_id: int) -> List[int]:
+        """Return the Rest IDs 'rest_id' follows, in ID order."""
+        return [self.ids[index] for index in self._following(self.index(rest_id))]
+
+    def followers(self, rest_id: int) -> List[int]:
+        """Return the Rest IDs following 'rest_id', in ID order."""
+        return [self.ids[index] for index in self._followers(self.index(rest_id))]
+
+    def out_degree(self, rest_id: int) -> int:
+        """Return how many users 'rest_id' follows."""
+
+        index = self.index(rest_id)
+        return self.out_offsets[index + 1] - self.out_offsets[index]
+
+    def in_degree(self, rest_id: int) -> int:
+        """Return how many users follow 'rest_id'."""
+
+        index = self.index(rest_id)
+        return self.in_offsets[index + 1] - self.in_offsets[index]
+
+    def follows(self, follower: int, followed: int) -> bool:
+        """Whether 'follower' follows 'followed' (False for unknown users)."""
+
+        if follower not in self or followed not in self:
+            return False
+
+        row = self._following(self.index(follower))
+        target = self.index(followed)
+        position = bisect_left(row, target)
+        return position < len(row) and row[position] == target
+
+    def mutuals(self, rest_id: int) -> List[int]:
+        """Return the Rest IDs that follow 'rest_id' and are followed back."""
+
+        index = self.index(rest_id)
+        mutual = set(self._following(index)).intersection(self._followers(index))
+        return [self.ids[other] for other in sorted(mutual)]
+
+    def k_hop(self, rest_id: int, k: int, direction: str = "out") -> List[int]:
+        """Return the Rest IDs within 'k' hops of 'rest_id' (itself excluded).
+
+        'direction' is "out" (following), "in" (followers) or "both".
+        """
+
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction: {direction!r}")
+
+        start = self.index(rest_id)
+        visited = bytearray(len(self.ids))
+        visited[start] = 1
+        queue = deque([(start, 0)])
+        found = []
+
+        while queue:
+            index, depth = queue.popleft()
+
+            if depth == k:
+                continue
+
+            neighbors = []
+            if direction != "in":
+                neighbors.append(self._following(index))
+            if direction != "out":
+                neighbors.append(self._followers(index))
+
+            for row in neighbors:
+                for other in row:
+                    if not visited[other]:
+                        visited[other] = 1
+                        found.append(other)
+                        queue.append((other, depth + 1))
+
+        return [self.ids[index] for index in sorted(found)]
+
+    def save(self, pathname: str) -> None:
+        """Write the graph to a file 'load' can memory-map."""
+
+        order = sys.byteorder.encode("ascii")
+
+        with open(pathname, "wb") as fp:  # pylint: disable=invalid-name
+            fp.write(_HEADER.pack(_MAGIC, order, len(self.ids), self.edges))
+
+            for part in self._sections():
+                fp.write(memoryview(part).cast("B"))
+
+    def _sections(self) -> Tuple[Sequence[int], ...]:
+        # 8-byte sections first, so that every section stays aligned.
+        return (
+            self.ids,
+            self.out_offsets,
+            self.in_offsets,
+            self.out_targets,
+            self.in_targets,
+        )
+
+    @classmethod
+    def load(cls, pathname: str, memory_map: bool = True) -> "FollowGraph":
+        """Open a graph written by 'save'.
+
+        With 'memory_map' the file is mapped read-only and its sections are
+        used in place (call 'close', or use the graph as a context manager,
+        to unmap it); otherwise it is read into arrays.
+        """
+
+        with open(pathname, "rb") as fp:  # pylint: disable=invalid-name
+            if memory_map:
+                buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = fp.read()
+
+        view = memoryview(buffer)
+        magic, order, nodes, edges = _HEADER.unpack_from(view)
+
+        if magic != _MAGIC:
+            raise ValueError(f"{pathname}: not a follow graph")
+
+        if order.rstrip(b"\0").decode("ascii") != sys.byteorder:
+            raise ValueError(f"{pathname}: written with another byte order")
+
+        sections = _split(view, nodes, edges, memory_map)
+        ids, out_offsets, in_offsets, out_targets, in_targets = sections
+
+        return cls(
+            ids,
+            out_offsets,
+            out_targets,
+            in_offsets,
+            in_targets,
+            buffer if memory_map else None,
+        )
+
+    def close(self) -> None:
+        """Unmap a memory-mapped graph (it can no longer be queried).
+
+        While a slice of one of its sections is still referenced the file
+        cannot be unmapped: BufferError is raised and the graph stays
+        mapped and usable.
+        """
+
+        if self._buffer is None:
+            return
+
+        for part in self._sections():
+            part.release()
+
+        try:
+            self._buffer.close()
+        except BufferError:
+            view = memoryview(self._buffer)
+            _, _, nodes, edges = _HEADER.unpack_from(view)
+            (
+                self.ids,
+                self.out_offsets,
+                self.in_offsets,
+                self.out_targets,
+                self.in_targets,
+            ) = _split(view, nodes, edges, True)
+            raise
+
+        self.ids = self.out_offsets = self.in_offsets = ()
+        self.out_targets = self.in_targets = ()
+        self._buffer = None
+
+
+def _tweets(item: Any) -> Iterator[Any]:
+    """Tweets (models or raw dicts) of a tweet, timeline entry or raw entry."""
+
+    if isinstance(item, Tweet):
+        yield item
+
+    elif isinstance(item, TimelineEntry):
+        content = item.content
+
+        if isinstance(content, TimelineTimelineModule):
+            for tweet in content:
+                yield tweet.tweet_results.result
+        elif hasattr(getattr(content, "item_content", None), "tweet_results"):
+            yield item.result
+
+    elif isinstance(item, Dict):
+        if "legacy" in item and "core" in item:
+            yield item
+        elif "tweet" in item:
+            # TweetWithVisibilityResults
+            yield from _tweets(item["tweet"])
+        elif "content" in item:
+            content = item["content"]
+            items = [content] + [i["item"] for i in content.get("items") or ()]
+
+            for entry in items:
+                results = (entry.get("itemContent") or {}).get("tweet_results") or {}
+                if results.get("result"):
+                    yield from _tweets(results["result"])
+
+
+def _interactions(tweet: Any) -> Tuple[int, int, List[str], Any, Any, Any]:
+    """Tweet ID, author, mentions, replied-to user, quoted tweet and author."""
+
+    if isinstance(tweet, Dict):
+        legacy = tweet["legacy"]
+        mentions = (legacy.get("entities") or {}).get("user_mentions") or ()
+
+        return (
+            int(legacy["id_str"]),
+            int(legacy["user_id_str"]),
+            [mention["id_str"] for mention in mentions],
+            legacy.get("in_reply_to_user_id_str"),
+            legacy.get("quoted_status_id_str") if legacy["is_quote_status"] else None,
+            _quoted_user_id(tweet.get("quoted_status_result")),
+        )
+
+    legacy = tweet.legacy
+    mentions = legacy.entities.user_mentions or ()
+
+    return (
+        int(legacy.id_str),
+        int(legacy.user_id_str),
+        [mention.id_str for mention in mentions],
+        legacy.in_reply_to_user_id_str,
+        legacy.quoted_status_id_str if legacy.is_quote_status else None,
+        tweet.quoted_user_id_str,
+    )
+
+
+class InteractionGraph:
+    """Weighted, directed user-to-user graph of mentions, replies and quotes.
+
+    An edge points from a tweet's author to the user it mentions, replies
+    to or quotes, weighted by 'mention', 'reply' and 'quote'; repeated
+    interactions add up and self-interactions are ignored. Tweets are added
+    one at a time (each tweet ID only once), and the CSR matrix used by the
+    centrality methods is rebuilt only when edges were added since.
+
+    Quoted authors are read from the quoted tweet embedded in a tweet (raw
+    or validated); without one they are looked up among the tweets added so
+    far (or linked once the quoted tweet arrives).
+    """
+
+    def __init__(self, mention: float = 1.0, reply: float = 1.0, quote: float = 1.0):
+        self.mention = mention
+        self.reply = reply
+        self.quote = quote
+        self.ids = array("Q")
+        self._index: Dict[int, int] = {}
+        self._sources = array("I")
+        self._targets = array("I")
+        self._weights = array("d")
+        # Tweet ID -> author index, and quoted tweet ID -> quoting authors.
+        self._authors: Dict[int, int] = {}
+        self._quotes: Dict[int, List[int]] = {}
+        self._matrix: Optional[Tuple[array, array, array, array]] = None
+        self._built = 0
+        self._ranks: Optional[array] = None
+        self.iterations = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edges(self) -> int:
+        """Number of interactions added (before repeated ones are merged)."""
+        return len(self._sources)
+
+    @property
+    def tweets(self) -> int:
+        """Number of tweets added."""
+        return len(self._authors)
+
+    def _node(self, rest_id: Any) -> int:
+        rest_id = int(rest_id)
+        index = self._index.get(rest_id)
+
+        if index is None:
+            index = self._index[rest_id] = len(self.ids)
+            self.ids.append(rest_id)
+
+        return index
+
+    def _add(self, source: int, target: int, weight: float) -> None:
+        if source != target:
+            self._sources.append(source)
+            self._targets.append(target)
+            self._weights.append(weight)
+
+    def add_edge(self, source: int, target: int, weight: float = 1.0) -> None:
+        """Add an interaction of user 'source' with user 'target' (Rest IDs)."""
+        self._add(self._node(source), self._node(target), weight)
+
+    def add_tweet(self, tweet: Any) -> None:
+        """Add the interactions of a Tweet (model or raw dict)."""
+
+        tweet_id, author, mentions, reply, quoted_id, quoted_author = _interactions(
+            tweet
+        )
+
+        if tweet_id in self._authors:
+            return
+
+        source = self._authors[tweet_id] = self._node(author)
+
+        for mention in mentions:
+            self._add(source, self._node(mention), self.mention)
+
+        if reply is not None:
+            self._add(source, self._node(reply), self.reply)
+
+        if quoted_author is not None:
+            self._add(source, self._node(quoted_author), self.quote)
+        elif quoted_id is not None:
+            target = self._authors.get(int(quoted_id))
+            if target is None:
+                self._quotes.setdefault(int(quoted_id), []).append(source)
+            else:
+                self._add(source, target, self.quote)
+
+        for quoting in self._quotes.pop(tweet_id, ()):
+            self._add(quoting, source, self.quote)
+
+    def update(self, items: Iterable[Any]) -> None:
+        """Add the tweets of Tweets, timeline entries or their raw dicts."""
+
+        for item in items:
+            for tweet in _tweets(item):
+                self.add_tweet(tweet)
+
+    def matrix(self) -> Tuple[array, array, array, array]:
+        """Return '(offsets, sources, weights, strengths)' of the in-edge CSR.
+
+        Row 'v' holds the users interacting with 'v' and the summed weights;
+        'strengths' is each user's total outgoing weight.
+        """
+
+        if self._matrix is None or self._built != self.edges:
+            nodes = len(self.ids)
+            offsets, sources, weights = _csr(
+                nodes, self._targets, self._sources, self._weights
+            )
+            strengths = array("d", bytes(8 * nodes))
+
+            for source, weight in zip(self._sources, self._weights):
+                strengths[source] += weight
+
+            self._matrix = (offsets, sources, weights, strengths)
+            self._built = self.edges
+
+        return self._matrix
+
+    def degree_centrality(self, direction: str = "in", weighted: bool = False) -> array:
+        """Return each user's degree centrality, aligned with 'ids'.
+
+        Unweighted, it is the number of distinct users interacting with
+        ("in") or interacted with by ("out") a user, over 'len(self) - 1';
+        weighted, it is the summed weight of those interactions.
+        """
+
+        if direction not in ("in", "out"):
+            raise ValueError(f"Unknown direction: {direction!r}")
+
+        offsets, sources, weights, strengths = self.matrix()
+        nodes = len(self.ids)
+
+        if weighted and direction == "out":
+            return array("d", strengths)
+
+        if weighted:
+            rows = zip(offsets, offsets[1:])
+            return array("d", (sum(weights[start:stop]) for start, stop in rows))
+
+        if direction == "in":
+            rows = zip(offsets, offsets[1:])
+            degrees = array("d", (stop - start for start, stop in rows))
+        else:
+            degrees = array("d", bytes(8 * nodes))
+            for source in sources:
+                degrees[source] += 1
+
+        scale = 1.0 / (nodes - 1) if nodes > 1 else 0.0
+        return array("d", (degree * scale for degree in degrees))
+
+    def pagerank(
+        self,
+        damping: float = 0.85,
+        tolerance: float = 1.0e-6,
+        max_iterations: int = 100,
+    ) -> array:
+        """Return each user's weighted PageRank, aligned with 'ids'.
+
+        Power iteration over the in-edge CSR, one pass over every row per
+        iteration; users without outgoing interactions spread their rank
+        evenly. Iteration starts from the previous result (new users at
+        '1 / len(self)'), so re-ranking after a few more tweets converges
+        in a few iterations. Stops once the L1 change is below
+        'len(self) * tolerance'.
+        """
+
+        offsets, sources, weights, strengths = self.matrix()
+        nodes = len(self.ids)
+
+        if nodes == 0:
+            return array("d")
+
+        ranks = array("d", self._ranks or ())
+        ranks.extend([1.0 / nodes] * (nodes - len(ranks)))
+        total = sum(ranks)
+        ranks = array("d", (rank / total for rank in ranks))
+
+        self.iterations = 0
+
+        for _ in range(max_iterations):
+            share = array("d", (r / s if s else 0.0 for r, s in zip(ranks, strengths)))
+            dangling = sum(r for r, s in zip(ranks, strengths) if not s)
+            base = (1.0 - damping + damping * dangling) / nodes
+
+            updated = array("d", bytes(8 * nodes))
+
+            for index in range(nodes):
+                start, stop = offsets[index], offsets[index + 1]
+                incoming = map(share.__getitem__, sources[start:stop])
+                received = sum(map(mul, incoming, weights[start:stop]))
+                updated[index] = base + damping * received
+
+            change = sum(abs(new - old) for new, old in zip(updated, ranks))
+            ranks = updated
+            self.iterations += 1
+
+            if change < nodes * tolerance:
+                break
+
+        self._ranks = ranks
+        return array("d", ranks)
+
+    def top(self, scores: Sequence[float], count: int = 10) -> List[Tuple[int, float]]:
+        """Return the 'count' highest '(Rest ID, score)' pairs of 'scores'."""
+
+        best = heapq.nlargest(count, range(len(scores)), key=scores.__getitem__)
+        return [(self.ids[index], scores[index]) for index in best]
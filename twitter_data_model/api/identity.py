@@ -0,0 +1,119 @@
+"""Identity map for User objects repeated within a parse session."""
+
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+)
+
+
+__all__ = [
+    "UserIdentityMap",
+    "current_identity_map",
+    "user_identity_map",
+]
+
+
+_IDENTITY_MAP: ContextVar[Optional["UserIdentityMap"]] = ContextVar(
+    "user_identity_map", default=None
+)
+
+
+class UserIdentityMap:
+    """Bounded LRU map of Rest ID to validated 'User' object.
+
+    'maxsize' caps the number of users held; the least recently used one is
+    evicted first. 'max_age' (seconds) is the freshness policy: a cached user
+    older than that is re-validated from the incoming record and replaced.
+    'None' keeps the first copy seen for the whole session.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_age: Optional[float] = None):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._users: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    def __contains__(self, rest_id) -> bool:
+        return str(rest_id) in self._users
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, rest_id) -> Optional[Any]:
+        """Return the shared user for 'rest_id', if cached and still fresh."""
+
+        key = str(rest_id)
+        entry = self._users.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored, user = entry
+
+        if self.max_age is not None and time.monotonic() - stored >= self.max_age:
+            del self._users[key]
+            self.misses += 1
+            return None
+
+        self._users.move_to_end(key)
+        self.hits += 1
+        return user
+
+    def put(self, user: Any) -> Any:
+        """Cache 'user' under its Rest ID and return it."""
+
+        key = str(user.rest_id)
+        self._users[key] = (time.monotonic(), user)
+        self._users.move_to_end(key)
+
+        while len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+        return user
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+
+        self._users.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the map."""
+
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def current_identity_map() -> Optional[UserIdentityMap]:
+    """Return the identity map of the active parse session, if any."""
+    return _IDENTITY_MAP.get()
+
+
+@contextmanager
+def user_identity_map(
+    maxsize: int = 4096,
+    max_age: Optional[float] = None,
+    identity_map: Optional[UserIdentityMap] = None,
+):
+    """Share one 'User' instance per Rest ID for everything parsed in this block.
+
+    Users are shared objects while the session is active, so mutating one
+    affects every tweet, media item or card that refers to it.
+    """
+
+    if identity_map is None:
+        identity_map = UserIdentityMap(maxsize=maxsize, max_age=max_age)
+
+    token = _IDENTITY_MAP.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _IDENTITY_MAP.reset(token)
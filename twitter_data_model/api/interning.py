@@ -0,0 +1,116 @@
+"""String interning for low-cardinality model fields."""
+
+from typing import (
+    Dict,
+    Optional,
+)
+
+from pydantic import validator  # pylint: disable=no-name-in-module
+
+
+__all__ = [
+    "InternTable",
+    "get_intern_table",
+    "intern_value",
+    "interned",
+    "set_intern_table",
+]
+
+
+class InternTable:
+    """Table of canonical 'str' instances with hit-rate statistics.
+
+    Once 'maxsize' distinct strings are held, unseen values are passed
+    through unchanged, so a field that turns out not to be low-cardinality
+    cannot grow the table without bound.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._strings: Dict[str, str] = {}
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._strings
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: str) -> str:
+        """Return the canonical instance equal to 'value'."""
+
+        canonical = self._strings.get(value)
+
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+
+        self.misses += 1
+
+        if self.maxsize is None or len(self._strings) < self.maxsize:
+            self._strings[value] = value
+
+        return value
+
+    def clear(self) -> None:
+        """Drop every interned string and reset the statistics."""
+
+        self._strings.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the table."""
+
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Return size, hit and miss counts, and the hit rate."""
+
+        return {
+            "size": len(self._strings),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+_TABLE: Optional[InternTable] = InternTable()
+
+
+def get_intern_table() -> Optional[InternTable]:
+    """Return the intern table used during validation."""
+    return _TABLE
+
+
+def set_intern_table(table: Optional[InternTable]) -> Optional[InternTable]:
+    """Swap the intern table used during validation; return the previous one.
+
+    Any object with an 'intern(str) -> str' method can be plugged in;
+    'None' turns interning off.
+    """
+
+    global _TABLE  # pylint: disable=global-statement
+
+    previous, _TABLE = _TABLE, table
+    return previous
+
+
+def intern_value(value):
+    """Intern 'value' through the active table, if it is a string."""
+
+    if _TABLE is None or not isinstance(value, str):
+        return value
+    return _TABLE.intern(value)
+
+
+def _intern(cls, value):  # pylint: disable=unused-argument
+    return intern_value(value)
+
+
+def interned(*fields: str):
+    """Validator interning the (already validated) values of 'fields'."""
+
+    return validator(*fields, allow_reuse=True)(_intern)
@@ -0,0 +1,166 @@
+"""Lazily validated model sub-trees."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Dict,
+    Type,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+
+
+__all__ = [
+    "LazyModel",
+    "columnar_enabled",
+    "columnar_participants",
+    "lazy",
+    "lazy_tweets",
+    "lazy_enabled",
+]
+
+
+_LAZY_TWEETS: ContextVar[bool] = ContextVar("lazy_tweets", default=False)
+
+_COLUMNAR_PARTICIPANTS: ContextVar[bool] = ContextVar(
+    "columnar_participants", default=False
+)
+
+_LAZY_TYPES: Dict[Type[BaseModel], Type["LazyModel"]] = {}
+
+
+class LazyModel:
+    """Raw sub-tree that is validated into 'model' on first access.
+
+    Attribute, item and iteration access are forwarded to the validated
+    model, which is cached; the raw dict is dropped once it has been used.
+    """
+
+    __slots__ = ("_raw", "_value")
+
+    model: Type[BaseModel] = BaseModel
+
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self._value = None
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "LazyModel":
+        """Wrap a raw dict (or an already validated model) without validating."""
+
+        if isinstance(value, cls):
+            return value
+
+        if isinstance(value, cls.model):
+            proxy = cls(None)
+            proxy._value = value  # pylint: disable=protected-access
+            return proxy
+
+        if not isinstance(value, Dict):
+            raise TypeError(f"{cls.model.__name__} must be a dict")
+
+        return cls(value)
+
+    @property
+    def raw(self) -> Any:
+        """The raw sub-tree (None once it has been validated)."""
+        return self._raw
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the sub-tree has been validated yet."""
+        return self._value is not None
+
+    def resolve(self) -> BaseModel:
+        """Validate (once) and return the underlying model."""
+
+        if self._value is None:
+            self._value = self.model.validate(self._raw)
+            self._raw = None
+
+        return self._value
+
+    def __getattr__(self, key: str):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        return getattr(self.resolve(), key)
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __contains__(self, item) -> bool:
+        return item in self.resolve()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyModel):
+            other = other.resolve()
+        return self.resolve() == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return _restore, (self.model, self._raw, self._value)
+
+    def __repr__(self) -> str:
+        if self._value is None:
+            return f"{type(self).__name__}(<unresolved>)"
+        return f"{type(self).__name__}({self._value!r})"
+
+
+def lazy(model: Type[BaseModel]) -> Type[LazyModel]:
+    """Return the (cached) lazy field type for 'model'."""
+
+    if model not in _LAZY_TYPES:
+        _LAZY_TYPES[model] = type(
+            f"Lazy{model.__name__}", (LazyModel,), {"__slots__": (), "model": model}
+        )
+
+    return _LAZY_TYPES[model]
+
+
+def _restore(model: Type[BaseModel], raw: Any, value: Any) -> LazyModel:
+    proxy = lazy(model)(raw)
+    proxy._value = value  # pylint: disable=protected-access
+    return proxy
+
+
+def lazy_enabled() -> bool:
+    """Whether 'Tweet' validation currently produces 'LazyTweet' objects."""
+    return _LAZY_TWEETS.get()
+
+
+@contextmanager
+def lazy_tweets(enabled: bool = True):
+    """Validate every nested 'Tweet' as a 'LazyTweet' within this block."""
+
+    token = _LAZY_TWEETS.set(enabled)
+    try:
+        yield
+    finally:
+        _LAZY_TWEETS.reset(token)
+
+
+def columnar_enabled() -> bool:
+    """Whether Audio Space participants are currently stored column-wise."""
+    return _COLUMNAR_PARTICIPANTS.get()
+
+
+@contextmanager
+def columnar_participants(enabled: bool = True):
+    """Validate Audio Space participants into 'ParticipantColumns' in this block."""
+
+    token = _COLUMNAR_PARTICIPANTS.set(enabled)
+    try:
+        yield
+    finally:
+        _COLUMNAR_PARTICIPANTS.reset(token)
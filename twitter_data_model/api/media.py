@@ -16,6 +16,7 @@ from pydantic import (  # pylint: disable=no-name-in-module
 
 
 from .user_response import UserResult
+from .interning import interned
 
 
 # pylint: disable=too-few-public-methods
@@ -35,6 +36,8 @@ class ExtendedMediaAvailability(BaseModel):
 
     status: str
 
+    _intern = interned("status")
+
 
 class Hashtag(BaseModel):
     """Hashtag"""
@@ -84,6 +87,8 @@ class Media(BaseModel):
     additional_media_info: Optional[AdditionalMediaInfo]
     media_stats: Optional[MediaStats] = Field(alias="mediaStats")
 
+    _intern = interned("type")
+
 
 class MediaStats(BaseModel):
     """Media Stats class object."""
@@ -104,6 +109,8 @@ class ImageSize(BaseModel):
     w: int
     resize: str
 
+    _intern = interned("resize")
+
 
 class ImageSizes(BaseModel):
     """Image Size list container"""
@@ -146,6 +153,8 @@ class VideoVariant(BaseModel):
     content_type: str
     url: str
 
+    _intern = interned("content_type")
+
 
 Media.update_forward_refs()
 MediaFaces.update_forward_refs()
@@ -0,0 +1,312 @@
+"""Opt-in validation profiler and ingest metrics registry.
+
+While profiling is enabled, every model validation (including each nested
+sub-model and each Union member tried) is counted and timed per model
+class, and every decorated entry point ('DataResponse.from_json',
+'TimelineEntry.from_json', ...) records its latency in a histogram:
+
+    with profiling() as registry:
+        TimelineEntry.from_json("UserTweets.json")
+
+    registry.write_prometheus("ingest.prom")
+
+Validation time is reported both cumulatively (including nested models)
+and as self time (excluding them), so the sub-tree or Union branch that is
+eating the time stands out. Validations run in worker processes (e.g.
+'iter_jsonl' with several processes) are not recorded.
+"""
+
+import bisect
+import json
+import threading
+import time
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+    ValidationError,
+)
+
+
+__all__ = [
+    "MetricsRegistry",
+    "disable_profiling",
+    "enable_profiling",
+    "get_registry",
+    "observed",
+    "profiling",
+]
+
+
+_PREFIX = "twitter_data_model"
+
+# Histogram bucket upper bounds, in seconds.
+_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+
+
+class _ModelStats:
+    __slots__ = ("count", "failures", "seconds", "self_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(_BUCKETS + (float("inf"),), self.buckets):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class MetricsRegistry:
+    """Per-model validation statistics and per-entry-point latency histograms."""
+
+    def __init__(self):
+        self.models: Dict[str, _ModelStats] = {}
+        self.entry_points: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def record_validation(
+        self, model: str, seconds: float, nested: float, failed: bool
+    ) -> None:
+        """Record one validation of 'model' ('nested' seconds in sub-models)."""
+
+        with self._lock:
+            stats = self.models.get(model)
+            if stats is None:
+                stats = self.models[model] = _ModelStats()
+            stats.count += 1
+            stats.seconds += seconds
+            stats.self_seconds += seconds - nested
+            stats.failures += failed
+
+    def observe(self, entry_point: str, seconds: float) -> None:
+        """Record one call of 'entry_point' taking 'seconds'."""
+
+        with self._lock:
+            histogram = self.entry_points.get(entry_point)
+            if histogram is None:
+                histogram = self.entry_points[entry_point] = _Histogram()
+            histogram.observe(seconds)
+
+    def clear(self) -> None:
+        """Forget everything recorded so far."""
+
+        with self._lock:
+            self.models.clear()
+            self.entry_points.clear()
+
+    def snapshot(self) -> Dict:
+        """Return the recorded metrics as plain, JSON-serialisable data."""
+
+        with self._lock:
+            return {
+                "models": {
+                    name: {
+                        "count": stats.count,
+                        "failures": stats.failures,
+                        "seconds": stats.seconds,
+                        "self_seconds": stats.self_seconds,
+                    }
+                    for name, stats in sorted(self.models.items())
+                },
+                "entry_points": {
+                    name: {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": dict(histogram.cumulative()),
+                    }
+                    for name, histogram in sorted(self.entry_points.items())
+                },
+            }
+
+    def prometheus(self) -> str:
+        """Return the recorded metrics in the Prometheus text format."""
+
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = (
+            ("validations_total", "count", "Model validations."),
+            ("validation_failures_total", "failures", "Failed model validations."),
+            (
+                "validation_seconds_total",
+                "seconds",
+                "Time spent validating, including nested models.",
+            ),
+            (
+                "validation_self_seconds_total",
+                "self_seconds",
+                "Time spent validating, excluding nested models.",
+            ),
+        )
+
+        for metric, key, description in counters:
+            lines += [
+                f"# HELP {_PREFIX}_{metric} {description}",
+                f"# TYPE {_PREFIX}_{metric} counter",
+            ]
+            lines += [
+                f'{_PREFIX}_{metric}{{model="{name}"}} {stats[key]}'
+                for name, stats in snapshot["models"].items()
+            ]
+
+        metric = f"{_PREFIX}_entry_point_seconds"
+        lines += [
+            f"# HELP {metric} Entry point latency.",
+            f"# TYPE {metric} histogram",
+        ]
+
+        for name, histogram in snapshot["entry_points"].items():
+            lines += [
+                f'{metric}_bucket{{entry_point="{name}",le="{bound}"}} {count}'
+                for bound, count in histogram["buckets"].items()
+            ]
+            lines += [
+                f'{metric}_sum{{entry_point="{name}"}} {histogram["sum"]}',
+                f'{metric}_count{{entry_point="{name}"}} {histogram["count"]}',
+            ]
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, pathname: str) -> None:
+        """Write the Prometheus text format to 'pathname'."""
+
+        with open(pathname, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            fp.write(self.prometheus())
+
+    def write_json(self, pathname: str) -> None:
+        """Write a JSON snapshot to 'pathname'."""
+
+        with open(pathname, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            json.dump(self.snapshot(), fp, indent=2)
+
+
+_REGISTRY: Optional[MetricsRegistry] = None
+
+_INIT = BaseModel.__init__
+
+
+def _profiled_init(__pydantic_self__, **data) -> None:  # pylint: disable=no-self-argument
+    registry = _REGISTRY
+
+    if registry is None:
+        _INIT(__pydantic_self__, **data)
+        return
+
+    stack = registry._stack()  # pylint: disable=protected-access
+    stack.append(0.0)
+    failed = False
+    start = time.perf_counter()
+
+    try:
+        _INIT(__pydantic_self__, **data)
+    except ValidationError:
+        failed = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += seconds
+        registry.record_validation(
+            type(__pydantic_self__).__name__, seconds, nested, failed
+        )
+
+
+def get_registry() -> Optional[MetricsRegistry]:
+    """Return the active metrics registry, if any."""
+    return _REGISTRY
+
+
+def enable_profiling(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Record validation and entry point metrics from now on."""
+
+    global _REGISTRY  # pylint: disable=global-statement
+
+    _REGISTRY = registry or MetricsRegistry()
+    BaseModel.__init__ = _profiled_init
+    return _REGISTRY
+
+
+def disable_profiling() -> None:
+    """Stop recording metrics (and restore the unpatched validation path)."""
+
+    global _REGISTRY  # pylint: disable=global-statement
+
+    _REGISTRY = None
+    BaseModel.__init__ = _INIT
+
+
+@contextmanager
+def profiling(registry: Optional[MetricsRegistry] = None):
+    """Record validation and entry point metrics within this block."""
+
+    global _REGISTRY  # pylint: disable=global-statement
+
+    previous = _REGISTRY
+    try:
+        yield enable_profiling(registry)
+    finally:
+        if previous is None:
+            disable_profiling()
+        else:
+            _REGISTRY = previous
+
+
+def observed(function: Callable) -> Callable:
+    """Time calls of a (class) method as entry point '<Class>.<method>'."""
+
+    @wraps(function)
+    def wrapper(cls, *args, **kwargs):
+        registry = _REGISTRY
+
+        if registry is None:
+            return function(cls, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return function(cls, *args, **kwargs)
+        finally:
+            registry.observe(
+                f"{cls.__name__}.{function.__name__}", time.perf_counter() - start
+            )
+
+    return wrapper
@@ -5,14 +5,21 @@ Global API response class objects.
 from __future__ import annotations
 
 from typing import (
+    Any,
+    Callable,
     Dict,
+    Iterator,
     List,
+    Optional,
+    Type,
     Union,
 )
 
 
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
+    ValidationError,
+    validator,
 )
 
 # pylint: disable=relative-beyond-top-level
@@ -37,7 +44,13 @@ from .user_response import (
     UserUnavailable,
 )
 
-from .utils import load_json
+from .cache import load_cached
+from .metrics import observed
+from .utils import (
+    iter_json_array,
+    iter_jsonl,
+    load_json,
+)
 
 
 __all__ = [
@@ -47,6 +60,78 @@ __all__ = [
 ]
 
 
+def _detect_data(data: Any) -> Optional[Type[BaseModel]]:
+    """Pick the 'DataResponse.data' member from its top-level keys."""
+
+    if not isinstance(data, Dict):
+        return None
+
+    if not data:
+        return UserResponseNull
+
+    if "result" in data:
+        result = data["result"]
+        if isinstance(result, Dict) and result.get("__typename") == "UserUnavailable":
+            return UserResult
+        return DataResult
+
+    if "user" in data:
+        return UserResponse
+
+    if "tweetResult" in data:
+        return TweetResultAlt
+
+    if "users" in data:
+        return UsersResult
+
+    if "audioSpace" in data:
+        return AudioSpaceResult
+
+    if "search_by_raw_query" in data:
+        return AudioSpaceSearchResult
+
+    return None
+
+
+def _detect_result(result: Any) -> Optional[Type[BaseModel]]:
+    """Pick the 'DataResult.result' member from its '__typename' marker."""
+
+    if not isinstance(result, Dict):
+        return None
+
+    typename = result.get("__typename")
+
+    if typename == "User":
+        return User
+
+    if typename == "Tweet":
+        return Tweet
+
+    if "user" in result:
+        user = result["user"]
+        if isinstance(user, Dict) and "tweet_stats" in user:
+            return TweetStatsResponse
+        return UserResponse
+
+    return None
+
+
+def _dispatch(value: Any, model: Optional[Type[BaseModel]]) -> Any:
+    """Validate against a single Union member, if one was detected.
+
+    Falls back to the raw value (and so the regular trial-and-error Union
+    validation) when nothing matched, so error reporting is unchanged.
+    """
+
+    if model is None:
+        return value
+
+    try:
+        return model.validate(value)
+    except ValidationError:
+        return value
+
+
 class DataResponseList(BaseModel):
     """Collect a list of Data Response objects."""
 
@@ -66,10 +151,16 @@ class DataResponseList(BaseModel):
         return len(self.__root__)
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str):
         """Load class object from JSON file."""
-        data = load_json(pathname)
-        return cls.parse_obj(data)
+        return load_cached(cls, pathname, lambda path: cls.parse_obj(load_json(path)))
+
+    @classmethod
+    def iter_json(cls, pathname: str) -> Iterator[DataResponse]:
+        """Stream Data Response objects from a JSON array file."""
+        for datum in iter_json_array(pathname):
+            yield DataResponse(**datum)
 
 
 class DataResponse(BaseModel):
@@ -86,6 +177,24 @@ class DataResponse(BaseModel):
         AudioSpaceSearchResult,
     ]
 
+    class Config:  # pylint: disable=missing-class-docstring
+        smart_union = True
+
+    @validator("data", pre=True)
+    def dispatch_data(cls, value):  # pylint: disable=no-self-argument
+        """Route raw 'data' to a single Union member by its keys."""
+        return _dispatch(value, _detect_data(value))
+
+    @property
+    def branch(self) -> str:
+        """Name of the Union member 'data' was validated as."""
+        return type(self.data).__name__
+
+    @classmethod
+    def detect(cls, data: Dict) -> Optional[Type[BaseModel]]:
+        """Return the 'data' model a raw response would dispatch to."""
+        return _detect_data(data.get("data"))
+
     def resolve(self):
         if isinstance(self.data, (DataResult, TweetResultAlt, UserResponse)):
             return self.data.resolve()
@@ -102,10 +211,27 @@ class DataResponse(BaseModel):
         return self.data
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str):
         """Load class object from JSON file."""
-        data = load_json(pathname)
-        return cls(**data)
+        return load_cached(cls, pathname, lambda path: cls(**load_json(path)))
+
+    @classmethod
+    def iter_jsonl(
+        cls,
+        pathname: str,
+        processes: Optional[int] = None,
+        chunk_size: int = 256,
+        projection: Optional[Callable] = None,
+    ) -> Iterator:
+        """Stream class objects (or projections) from a JSON Lines file."""
+        return iter_jsonl(cls, pathname, processes, chunk_size, projection)
+
+    @classmethod
+    @observed
+    def from_jsonl(cls, pathname: str, **kwargs) -> List:
+        """Load class objects from a JSON Lines file."""
+        return list(cls.iter_jsonl(pathname, **kwargs))
 
 
 class DataResult(BaseModel):
@@ -118,6 +244,19 @@ class DataResult(BaseModel):
         TweetStatsResponse,
     ]
 
+    class Config:  # pylint: disable=missing-class-docstring
+        smart_union = True
+
+    @validator("result", pre=True)
+    def dispatch_result(cls, value):  # pylint: disable=no-self-argument
+        """Route raw 'result' to a single Union member by '__typename'."""
+        return _dispatch(value, _detect_result(value))
+
+    @property
+    def branch(self) -> str:
+        """Name of the Union member 'result' was validated as."""
+        return type(self.result).__name__
+
     def resolve(self):
         if isinstance(self.result, (User, Tweet)):
             return self.result
@@ -131,10 +270,10 @@ class DataResult(BaseModel):
         return self.result
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str) -> Dict:
         """Load class object from JSON file."""
-        data = load_json(pathname)
-        return cls(**data)
+        return load_cached(cls, pathname, lambda path: cls(**load_json(path)))
 
 
 DataResponseList.update_forward_refs()
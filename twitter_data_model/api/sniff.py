@@ -0,0 +1,269 @@
+"""Endpoint detection by key sniffing, and loading of mixed dumps.
+
+'sniff_file' reads only the first few kilobytes of a file and tokenizes
+just enough of it to see its leading keys ('data', 'entryId', 'sortIndex',
+'__typename', ...), which is enough to tell a DataResponse from a
+TimelineEntry, a UserList or a DataResponseList. 'load_any' uses it to
+stream a file or a whole directory of mixed dumps, validating each record
+straight into the right model instead of trying them one after another.
+"""
+
+import codecs
+import json
+import re
+
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+
+from .response import (
+    DataResponse,
+    DataResponseList,
+)
+from .timeline import TimelineEntry
+from .tweet import Tweet
+from .user import User, UserList
+from .utils import iter_json_array
+
+
+__all__ = [
+    "load_any",
+    "sniff",
+    "sniff_file",
+]
+
+
+_KeyPath = Tuple[str, ...]
+
+# Marker for "an element of an array" in key paths.
+_ITEM = "[]"
+
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}\[\]:,])')
+
+_TYPENAMES = {
+    "Tweet": Tweet,
+    "User": User,
+}
+
+
+def _prefix_paths(text: str) -> Tuple[List[_KeyPath], Dict[_KeyPath, str]]:
+    """Key paths (and string values) found in a possibly truncated JSON text."""
+
+    paths: List[_KeyPath] = []
+    values: Dict[_KeyPath, str] = {}
+    # One frame per open container: [bracket, current key, expecting a key]
+    stack: List[List[Any]] = []
+
+    for match in _TOKEN.finditer(text):
+        string, punctuation = match.groups()
+
+        if punctuation is None:
+            if not stack or stack[-1][0] != "{":
+                continue
+
+            frame = stack[-1]
+            path = tuple(_ITEM if f[0] == "[" else f[1] for f in stack[:-1])
+
+            if frame[2]:
+                frame[1] = string
+                paths.append(path + (string,))
+            else:
+                values[path + (frame[1],)] = string
+        elif punctuation in "{[":
+            stack.append([punctuation, None, punctuation == "{"])
+        elif punctuation in "}]":
+            if stack:
+                stack.pop()
+            if len(stack) == 1 and stack[0][0] == "[":
+                # Only the first element of a top-level array is sniffed.
+                break
+        elif stack:
+            # ',' starts the next key of an object, ':' its value.
+            stack[-1][2] = punctuation == "," and stack[-1][0] == "{"
+
+    return paths, values
+
+
+def _value_paths(
+    value: Any, path: _KeyPath = (), depth: int = 4
+) -> Tuple[List[_KeyPath], Dict[_KeyPath, str]]:
+    """Key paths (and string values) of a decoded value, down to 'depth'."""
+
+    paths: List[_KeyPath] = []
+    values: Dict[_KeyPath, str] = {}
+
+    if depth == 0:
+        return paths, values
+
+    if isinstance(value, list):
+        for item in value[:1]:
+            more, found = _value_paths(item, path + (_ITEM,), depth - 1)
+            paths += more
+            values.update(found)
+
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            paths.append(path + (key,))
+            if isinstance(item, str):
+                values[path + (key,)] = item
+            more, found = _value_paths(item, path + (key,), depth - 1)
+            paths += more
+            values.update(found)
+
+    return paths, values
+
+
+def _classify(
+    paths: List[_KeyPath], values: Dict[_KeyPath, str], root: _KeyPath = ()
+) -> Optional[Type[BaseModel]]:
+    """Pick the model for the object at 'root' from its key paths."""
+
+    depth = len(root)
+    keys = {path[depth] for path in paths if len(path) > depth and path[:depth] == root}
+
+    if "data" in keys:
+        return DataResponse
+
+    if "entryId" in keys or "sortIndex" in keys:
+        return TimelineEntry
+
+    return _TYPENAMES.get(values.get(root + ("__typename",)))
+
+
+def _decide(
+    paths: List[_KeyPath], values: Dict[_KeyPath, str], array: bool
+) -> Optional[Type[BaseModel]]:
+    if not array:
+        return _classify(paths, values)
+
+    model = _classify(paths, values, (_ITEM,))
+
+    if model is DataResponse:
+        if (_ITEM, "data", "user", "result") in paths:
+            return UserList
+        return DataResponseList
+
+    return model
+
+
+def sniff(record: Any) -> Optional[Type[BaseModel]]:
+    """Return the model a decoded JSON value validates as (None if unknown).
+
+    Objects map to DataResponse, TimelineEntry, Tweet or User; arrays of
+    'data.user.result' responses to UserList, other arrays of responses to
+    DataResponseList, and arrays of entries, Tweets or Users to their
+    element model.
+    """
+
+    paths, values = _value_paths(record)
+    return _decide(paths, values, isinstance(record, list))
+
+
+def _is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def sniff_file(pathname: str, size: int = 4096) -> Tuple[Optional[Type[BaseModel]], str]:
+    """Return '(model, layout)' for a file, from its first 'size' bytes.
+
+    'layout' is "object", "array" (a JSON array, 'model' as for 'sniff') or
+    "lines" (JSON Lines, 'model' of the first line). A file is JSON Lines if
+    it is named '*.jsonl', or if its first line is a complete JSON value
+    followed by more; when an object's first line runs past the prefix, the
+    rest of that line is read to tell. The whole file is only decoded when
+    the prefix is inconclusive.
+    """
+
+    with open(pathname, "rb") as fp:  # pylint: disable=invalid-name
+        data = fp.read(size)
+        first, newline, rest = data.lstrip().partition(b"\n")
+
+        if not newline and len(data) == size and first.startswith(b"{"):
+            first, newline, _ = (first + fp.readline()).partition(b"\n")
+            rest = b""
+
+            while newline and not rest.strip():
+                chunk = fp.read(size)
+                if not chunk:
+                    break
+                rest += chunk
+
+    # A multibyte character cut at the end of the prefix is left undecoded.
+    text = codecs.getincrementaldecoder("utf8")().decode(data)
+    stripped = text.lstrip()
+    array = stripped.startswith("[")
+
+    if pathname.endswith(".jsonl") or (newline and rest.strip() and _is_json(first)):
+        line = codecs.getincrementaldecoder("utf8")().decode(first)
+        return _decide(*_prefix_paths(line), False), "lines"
+
+    layout = "array" if array else "object"
+    model = _decide(*_prefix_paths(stripped), array)
+
+    if model is None and len(data) == size:
+        with open(pathname, encoding="utf8") as fp:  # pylint: disable=invalid-name
+            model = sniff(json.load(fp))
+
+    return model, layout
+
+
+def _load_file(pathname: str) -> Iterator[Any]:
+    model, layout = sniff_file(pathname)
+
+    if layout == "lines":
+        with open(pathname, encoding="utf8") as fp:  # pylint: disable=invalid-name
+            for line in fp:
+                if line.strip():
+                    record = json.loads(line)
+                    yield _require(sniff(record), pathname).parse_obj(record)
+        return
+
+    model = _require(model, pathname)
+
+    if model in (DataResponseList, UserList):
+        yield from model.iter_json(pathname)
+    elif layout == "array":
+        for record in iter_json_array(pathname):
+            yield model.parse_obj(record)
+    else:
+        yield model.from_json(pathname)
+
+
+def _require(model: Optional[Type[BaseModel]], pathname: str) -> Type[BaseModel]:
+    if model is None:
+        raise ValueError(f"{pathname}: unrecognised response layout")
+    return model
+
+
+def load_any(pathname: str, pattern: str = "*.json*") -> Iterator[Any]:
+    """Stream the models in a file, or in every 'pattern' file of a directory.
+
+    Arrays are streamed one element at a time: arrays of responses yield
+    DataResponse objects (or Users, for 'data.user.result' arrays), JSON
+    Lines files one model per line, and single-object files one model.
+    """
+
+    path = Path(pathname)
+
+    if not path.is_dir():
+        yield from _load_file(pathname)
+        return
+
+    for child in sorted(path.glob(pattern)):
+        if child.is_file():
+            yield from _load_file(str(child))
@@ -0,0 +1,326 @@
+"""Incremental diffs and an event log over repeated Audio Space snapshots.
+
+'diff_spaces' compares two 'AudioSpace' snapshots with set operations on
+'periscope_user_id' and reports joins, leaves, role changes and metadata
+changes as 'SpaceEvent' tuples. 'SpaceEventLog' records a live Space poll
+after poll, storing only those deltas plus a full keyframe every
+'keyframe_interval' snapshots, so the Space as it was at any recorded time
+can be rebuilt with 'at':
+
+    log = SpaceEventLog()
+    while live:
+        log.record(DataResponse.from_json(poll()).resolve(), time.time())
+    log.at(started + 60)
+
+Participant details are captured when a participant first joins (or
+re-joins); later changes to a participant's own fields are not tracked.
+Participants are column-wise ('ParticipantColumns') friendly: only joining
+participants are ever materialized.
+"""
+
+import json
+
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .audio_space import (
+    AudioSpace,
+    ParticipantColumns,
+)
+
+
+__all__ = [
+    "SpaceEvent",
+    "SpaceEventLog",
+    "diff_spaces",
+]
+
+
+_ROLES = ("admins", "speakers", "listeners")
+
+
+class SpaceEvent(NamedTuple):
+    """One change between two Audio Space snapshots.
+
+    'kind' is "join" (value: role and raw participant), "leave", "role"
+    (value: new role), keyed by periscope user ID, or "metadata" (keyed by
+    metadata field), "total" or "sharings" with the new value.
+    """
+
+    timestamp: float
+    kind: str
+    key: Optional[str]
+    value: Any
+
+
+# periscope_user_id -> (role, participant list, position)
+_Roster = Dict[str, Tuple[str, Any, int]]
+
+
+def _roster(space: AudioSpace) -> _Roster:
+    roster: _Roster = {}
+
+    for role in _ROLES:
+        participants = getattr(space.participants, role)
+
+        if isinstance(participants, ParticipantColumns):
+            ids = participants.periscope_user_ids
+        else:
+            ids = [participant.periscope_user_id for participant in participants]
+
+        for position, periscope_user_id in enumerate(ids):
+            roster.setdefault(periscope_user_id, (role, participants, position))
+
+    return roster
+
+
+def _raw(participants: Any, position: int) -> Dict:
+    """Participant 'position' as plain JSON data (lists, not tuples)."""
+
+    if isinstance(participants, ParticipantColumns):
+        return json.loads(json.dumps(participants.raw(position)))
+    return json.loads(participants[position].json(by_alias=True))
+
+
+class _State:
+    """Everything needed to rebuild an Audio Space."""
+
+    __slots__ = ("metadata", "sharings", "total", "participants")
+
+    def __init__(self):
+        self.metadata: Dict[str, Any] = {}
+        self.sharings: Dict[str, Any] = {}
+        self.total = 0
+        # periscope_user_id -> [role, raw participant]
+        self.participants: Dict[str, List] = {}
+
+    def copy(self) -> "_State":
+        state = _State()
+        state.metadata = dict(self.metadata)
+        state.sharings = self.sharings
+        state.total = self.total
+        state.participants = {key: list(value) for key, value in self.participants.items()}
+        return state
+
+    def apply(self, event: SpaceEvent) -> None:
+        kind, key, value = event.kind, event.key, event.value
+
+        if kind == "join":
+            self.participants[key] = list(value)
+        elif kind == "leave":
+            self.participants.pop(key, None)
+        elif kind == "role":
+            # Moving to a new role also moves to the end of its list.
+            self.participants[key] = [value, self.participants.pop(key)[1]]
+        elif kind == "metadata":
+            self.metadata[key] = value
+        elif kind == "total":
+            self.total = value
+        elif kind == "sharings":
+            self.sharings = value
+
+    def to_space(self) -> AudioSpace:
+        participants: Dict[str, Any] = {role: [] for role in _ROLES}
+        participants["total"] = self.total
+
+        for role, raw in self.participants.values():
+            participants[role].append(raw)
+
+        return AudioSpace.parse_obj(
+            {
+                "metadata": self.metadata,
+                "sharings": self.sharings,
+                "participants": participants,
+            }
+        )
+
+    def to_json(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "_State":
+        state = cls()
+        for slot in cls.__slots__:
+            setattr(state, slot, data[slot])
+        return state
+
+
+def _diff(state: _State, space: AudioSpace, timestamp: float) -> List[SpaceEvent]:
+    """Events turning 'state' into 'space' (materializing only joiners)."""
+
+    events = []
+    roster = _roster(space)
+    current = state.participants
+
+    for periscope_user_id in current.keys() - roster.keys():
+        events.append(SpaceEvent(timestamp, "leave", periscope_user_id, None))
+
+    for periscope_user_id, (role, participants, position) in roster.items():
+        known = current.get(periscope_user_id)
+
+        if known is None:
+            value = (role, _raw(participants, position))
+            events.append(SpaceEvent(timestamp, "join", periscope_user_id, value))
+        elif known[0] != role:
+            events.append(SpaceEvent(timestamp, "role", periscope_user_id, role))
+
+    metadata = json.loads(space.metadata.json(by_alias=True))
+
+    for key in metadata.keys() | state.metadata.keys():
+        if metadata.get(key) != state.metadata.get(key):
+            events.append(SpaceEvent(timestamp, "metadata", key, metadata.get(key)))
+
+    if space.participants.total != state.total:
+        events.append(SpaceEvent(timestamp, "total", None, space.participants.total))
+
+    sharings = json.loads(space.sharings.json(by_alias=True))
+
+    if sharings != state.sharings:
+        events.append(SpaceEvent(timestamp, "sharings", None, sharings))
+
+    return events
+
+
+def diff_spaces(
+    before: AudioSpace, after: AudioSpace, timestamp: float = 0.0
+) -> List[SpaceEvent]:
+    """Return the events turning snapshot 'before' into snapshot 'after'."""
+
+    state = _State()
+    for event in _diff(state, before, timestamp):
+        state.apply(event)
+
+    return _diff(state, after, timestamp)
+
+
+class SpaceEventLog:
+    """Delta log of one Audio Space, with periodic keyframes.
+
+    'record' diffs each snapshot against the current state and appends only
+    the resulting events; every 'keyframe_interval' snapshots the full state
+    is kept too, so 'at' replays at most that many snapshots' events.
+    """
+
+    def __init__(self, keyframe_interval: int = 100):
+        self.keyframe_interval = keyframe_interval
+        self.events: List[SpaceEvent] = []
+        # (timestamp, index of the first event after it, state)
+        self.keyframes: List[Tuple[float, int, _State]] = []
+        self.snapshots = 0
+        self._state = _State()
+        self._last: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def record(self, space: AudioSpace, timestamp: float) -> List[SpaceEvent]:
+        """Append the changes since the previous snapshot; return them."""
+
+        if self._last is not None and timestamp < self._last:
+            raise ValueError("Snapshots must be recorded in time order")
+
+        events = _diff(self._state, space, timestamp)
+
+        for event in events:
+            self._state.apply(event)
+
+        self.events.extend(events)
+        self.snapshots += 1
+        self._last = timestamp
+
+        if self.snapshots % self.keyframe_interval == 1 or self.keyframe_interval == 1:
+            self.keyframes.append((timestamp, len(self.events), self._state.copy()))
+
+        return events
+
+    def iter_events(
+        self, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> Iterator[SpaceEvent]:
+        """Yield the events with 'start' <= timestamp < 'stop'."""
+
+        for event in self.events:
+            if start is not None and event.timestamp < start:
+                continue
+            if stop is not None and event.timestamp >= stop:
+                break
+            yield event
+
+    def at(self, timestamp: float) -> AudioSpace:
+        """Rebuild the Audio Space as of the last snapshot at or before 'timestamp'."""
+
+        keyframe = None
+        for candidate in self.keyframes:
+            if candidate[0] > timestamp:
+                break
+            keyframe = candidate
+
+        if keyframe is None:
+            raise ValueError(f"Nothing recorded at or before {timestamp}")
+
+        state = keyframe[2].copy()
+
+        for event in self.events[keyframe[1] :]:
+            if event.timestamp > timestamp:
+                break
+            state.apply(event)
+
+        return state.to_space()
+
+    def latest(self) -> AudioSpace:
+        """Rebuild the Audio Space as of the last recorded snapshot."""
+        return self._state.to_space()
+
+    def dump(self, pathname: str) -> None:
+        """Write the log (events and keyframes) as JSON Lines."""
+
+        with open(pathname, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            fp.write(
+                json.dumps(
+                    {
+                        "keyframe_interval": self.keyframe_interval,
+                        "snapshots": self.snapshots,
+                        "keyframes": [
+                            [timestamp, index, state.to_json()]
+                            for timestamp, index, state in self.keyframes
+                        ],
+                    }
+                )
+                + "\n"
+            )
+
+            for event in self.events:
+                fp.write(json.dumps(list(event)) + "\n")
+
+    @classmethod
+    def load(cls, pathname: str) -> "SpaceEventLog":
+        """Read a log written by 'dump'."""
+
+        with open(pathname, encoding="utf8") as fp:  # pylint: disable=invalid-name
+            header = json.loads(fp.readline())
+            log = cls(header["keyframe_interval"])
+            log.snapshots = header["snapshots"]
+            log.keyframes = [
+                (timestamp, index, _State.from_json(state))
+                for timestamp, index, state in header["keyframes"]
+            ]
+
+            for line in fp:
+                timestamp, kind, key, value = json.loads(line)
+                if kind == "join":
+                    value = tuple(value)
+                log.events.append(SpaceEvent(timestamp, kind, key, value))
+
+        if log.keyframes:
+            log._state = log.keyframes[-1][2].copy()
+            for event in log.events[log.keyframes[-1][1] :]:
+                log._state.apply(event)
+            log._last = log.events[-1].timestamp if log.events else log.keyframes[-1][0]
+
+        return log
@@ -0,0 +1,358 @@
+"""Synthetic, GraphQL-shaped payloads generated from the pydantic models.
+
+'SyntheticGenerator' walks a model's fields (as prepared by pydantic) and
+emits the raw dict the API would have sent: keys are the field aliases
+('__typename', 'entryId', 'itemContent', 'mediaStats', ...), Literal fields
+take their literal value and Union fields pick one of their members. Values
+are drawn from a seeded random generator, so a seed always reproduces the
+same corpus:
+
+    generator = SyntheticGenerator(seed=1, strings=5000, users=200)
+    generator.write("corpus.jsonl", TimelineEntry, size=2 << 30)
+
+Strings are drawn from a vocabulary of 'strings' words and every User is
+one of 'users' pooled profiles, so the cardinality of both can be tuned to
+exercise interning, identity maps and indexes.
+"""
+
+import json
+import random
+import time
+
+from base64 import b64encode
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+)
+from pydantic.fields import (  # pylint: disable=no-name-in-module
+    MAPPING_LIKE_SHAPES,
+    ModelField,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE,
+)
+from pydantic.typing import (  # pylint: disable=no-name-in-module
+    all_literal_values,
+    is_literal_type,
+)
+
+from .archive import _TWITTER_EPOCH_MS
+from .tweet import Tweet
+from .user import User
+
+
+__all__ = [
+    "SyntheticGenerator",
+]
+
+
+# Low-cardinality fields, with values seen in real payloads.
+_CHOICES = {
+    "lang": ("en", "en", "en", "es", "ja", "pt", "fr", "de", "und", "zxx"),
+    "type": ("photo", "photo", "video", "animated_gif"),
+    "content_type": ("video/mp4", "application/x-mpegURL"),
+    "resize": ("fit", "crop"),
+    "state": ("EnabledWithCount", "Running", "Ended"),
+    "status": ("Available",),
+    "profile_interstitial_type": ("",),
+    "translator_type": ("none", "regular"),
+    "card_fetch_state": ("NoCard",),
+    "user_label_type": ("BusinessLabel",),
+    "user_label_display_type": ("Badge",),
+    "url_type": ("DeepLink",),
+    "visibility": ("Self", "Public"),
+    "year_visibility": ("Self", "Public"),
+    "professional_type": ("Creator", "Business"),
+    "reason": ("Suspended", "Protected"),
+}
+
+_TEXT = {"full_text", "description", "title"}
+
+_TIMESTAMPS = {
+    "created_at",
+    "updated_at",
+    "scheduled_start",
+    "started_at",
+    "replay_start_time",
+}
+
+_SYLLABLES = (
+    "ka", "lo", "mi", "ra", "te", "zu", "po", "ne", "shi", "va",
+    "do", "ri", "an", "el", "os", "um", "ba", "qui", "fe", "yo",
+)  # fmt: skip
+
+
+class SyntheticGenerator:
+    """Generate raw payloads for any model from its field declarations.
+
+    'strings' bounds the vocabulary used for free-text fields, 'users' the
+    number of distinct Users, and 'list_length' the (inclusive) range of
+    list sizes. Optional fields are present with probability 'optional_rate',
+    and '*Unavailable' Union members are picked with 'unavailable_rate'.
+    Created-at times and snowflake IDs fall between the 'start' and 'stop'
+    Unix timestamps.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        strings: int = 10000,
+        users: int = 1000,
+        list_length: Tuple[int, int] = (0, 3),
+        optional_rate: float = 0.5,
+        unavailable_rate: float = 0.0,
+        max_depth: int = 16,
+        start: float = 1262304000.0,
+        stop: float = 1704067200.0,
+    ):
+        self.seed = seed
+        self.strings = strings
+        self.users = users
+        self.list_length = list_length
+        self.optional_rate = optional_rate
+        self.unavailable_rate = unavailable_rate
+        self.max_depth = max_depth
+        self.start = start
+        self.stop = stop
+
+        self.random = random.Random(seed)
+        self._users: Dict[int, Dict] = {}
+
+        vocabulary = random.Random(f"{seed}:strings")
+        self.vocabulary = list(
+            {self._word(vocabulary): None for _ in range(strings * 2)}
+        )[:strings]
+
+    @staticmethod
+    def _word(rng: random.Random) -> str:
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4)))
+
+    def _words(self, rng: random.Random, low: int, high: int) -> str:
+        return " ".join(rng.choices(self.vocabulary, k=rng.randint(low, high)))
+
+    def _snowflake(self, rng: random.Random) -> int:
+        milliseconds = int(rng.uniform(self.start, self.stop) * 1000)
+        return (milliseconds - _TWITTER_EPOCH_MS) << 22 | rng.getrandbits(22)
+
+    @staticmethod
+    def _created_at(snowflake: int) -> str:
+        seconds = ((snowflake >> 22) + _TWITTER_EPOCH_MS) / 1000
+        return time.strftime("%a %b %d %H:%M:%S +0000 %Y", time.gmtime(seconds))
+
+    def generate(self, model: Type[BaseModel]) -> Dict:
+        """Return one raw payload that validates as 'model'."""
+        return self._model(model, self.random, 0)
+
+    def iter_payloads(
+        self, model: Type[BaseModel], count: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Yield 'count' payloads (or an endless stream)."""
+
+        produced = 0
+        while count is None or produced < count:
+            yield self.generate(model)
+            produced += 1
+
+    def user(self, index: int) -> Dict:
+        """Return the raw payload of pooled User 'index'."""
+
+        if index not in self._users:
+            rng = random.Random(f"{self.seed}:user:{index}")
+            data = self._fields(User, rng, 1)
+            rest_id = self._snowflake(rng)
+            screen_name = f"{rng.choice(self.vocabulary)}_{index}"[:15]
+
+            data["rest_id"] = str(rest_id)
+            data["id"] = b64encode(f"User:{rest_id}".encode()).decode()
+            data["legacy"].update(
+                created_at=self._created_at(rest_id),
+                screen_name=screen_name,
+                name=screen_name.replace("_", " ").title(),
+            )
+            self._users[index] = data
+
+        return self._users[index]
+
+    def write(
+        self,
+        pathname: str,
+        model: Type[BaseModel],
+        count: Optional[int] = None,
+        size: Optional[int] = None,
+    ) -> int:
+        """Write payloads until 'count' records or 'size' bytes are reached.
+
+        '.jsonl' paths get one payload per line; anything else a JSON array.
+        Returns the number of records written.
+        """
+
+        if count is None and size is None:
+            raise ValueError("Either 'count' or 'size' is required")
+
+        lines = pathname.endswith(".jsonl")
+        written = 0
+        records = 0
+
+        with open(pathname, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            if not lines:
+                written += fp.write("[")
+
+            for payload in self.iter_payloads(model, count):
+                if size is not None and written >= size:
+                    break
+
+                record = json.dumps(payload, separators=(",", ":"))
+
+                if lines:
+                    written += fp.write(record + "\n")
+                else:
+                    written += fp.write(("," if records else "") + record)
+
+                records += 1
+
+            if not lines:
+                fp.write("]")
+
+        return records
+
+    def _model(self, model: Type[BaseModel], rng: random.Random, depth: int) -> Dict:
+        if issubclass(model, User):
+            return self.user(rng.randrange(self.users))
+
+        data = self._fields(model, rng, depth)
+
+        if issubclass(model, Tweet):
+            self._link_tweet(data)
+
+        return data
+
+    def _fields(self, model: Type[BaseModel], rng: random.Random, depth: int) -> Dict:
+        data = {}
+
+        for field in model.__fields__.values():
+            if not field.required:
+                if depth >= self.max_depth or rng.random() >= self.optional_rate:
+                    continue
+
+            data[field.alias] = self._field(field, field.name, rng, depth + 1)
+
+        return data
+
+    def _link_tweet(self, data: Dict) -> None:
+        """Make a Tweet's legacy IDs and timestamp agree with its Rest ID."""
+
+        rest_id = int(data["rest_id"])
+        legacy = data["legacy"]
+        user = data["core"]["user_results"]["result"]
+
+        legacy.update(
+            id_str=str(rest_id),
+            conversation_id_str=str(rest_id),
+            created_at=self._created_at(rest_id),
+        )
+
+        if "rest_id" in user:
+            legacy["user_id_str"] = user["rest_id"]
+
+    def _field(self, field: ModelField, name: str, rng: random.Random, depth: int) -> Any:
+        if field.shape == SHAPE_SINGLETON:
+            return self._singleton(field, name, rng, depth)
+
+        if field.shape == SHAPE_TUPLE:
+            if name == "indices":
+                return sorted(rng.sample(range(280), 2))
+            return [self._field(sub, name, rng, depth) for sub in field.sub_fields]
+
+        if field.shape in MAPPING_LIKE_SHAPES:
+            return {}
+
+        low, high = self.list_length
+        length = 0 if depth >= self.max_depth else rng.randint(low, high)
+
+        return [self._field(field.sub_fields[0], name, rng, depth) for _ in range(length)]
+
+    def _singleton(  # pylint: disable=too-many-return-statements
+        self, field: ModelField, name: str, rng: random.Random, depth: int
+    ) -> Any:
+        type_ = field.type_
+
+        if field.sub_fields:
+            return self._field(self._branch(field, rng), name, rng, depth)
+
+        if is_literal_type(type_):
+            return all_literal_values(type_)[0]
+
+        if isinstance(type_, type) and issubclass(type_, BaseModel):
+            return self._model(type_, rng, depth)
+
+        if type_ is bool:
+            return rng.random() < 0.5
+
+        if type_ is int:
+            return self._int(name, rng)
+
+        if type_ is float:
+            return round(rng.random() * 100, 4)
+
+        if type_ is str:
+            return self._str(name, rng)
+
+        return {}
+
+    def _branch(self, field: ModelField, rng: random.Random) -> ModelField:
+        available = []
+        unavailable = []
+
+        for sub_field in field.sub_fields:
+            named = getattr(sub_field.type_, "__name__", "")
+            (unavailable if named.endswith("Unavailable") else available).append(sub_field)
+
+        if unavailable and (not available or rng.random() < self.unavailable_rate):
+            return rng.choice(unavailable)
+
+        return rng.choice(available)
+
+    def _int(self, name: str, rng: random.Random) -> Union[int, str]:
+        if name == "rest_id" or name.endswith("_id"):
+            # IDs are sent as strings even where the model declares 'int'.
+            return str(self._snowflake(rng))
+
+        if name in _TIMESTAMPS or name.endswith("_ms") or name.endswith("_msecs"):
+            return int(rng.uniform(self.start, self.stop) * 1000)
+
+        if name.endswith("count") or name == "total":
+            return int(rng.paretovariate(1.2)) - 1
+
+        return rng.randint(0, 1024)
+
+    def _str(self, name: str, rng: random.Random) -> str:
+        if name in _CHOICES:
+            return rng.choice(_CHOICES[name])
+
+        if name == "created_at":
+            return self._created_at(self._snowflake(rng))
+
+        if name == "entry_id":
+            return f"tweet-{self._snowflake(rng)}"
+
+        if name in ("rest_id", "id", "sort_index") or name.endswith(("_id", "id_str")):
+            return str(self._snowflake(rng))
+
+        if name in _TEXT:
+            return self._words(rng, 3, 40)
+
+        if "url" in name:
+            host, path = rng.choice(self.vocabulary), rng.choice(self.vocabulary)
+            if name.startswith("display"):
+                return f"{host}.com/{path}"
+            return f"https://{host}.com/{path}"
+
+        return rng.choice(self.vocabulary)
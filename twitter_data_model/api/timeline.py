@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import heapq
+import os
+
 from typing import (
     Annotated,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
     Literal,
     List,
+    Optional,
     Union,
 )
 
@@ -14,17 +22,39 @@ from pydantic import (  # pylint: disable=no-name-in-module
 
 # pylint: disable=relative-beyond-top-level
 
+from .cache import load_cached
+from .interning import interned
+from .metrics import observed
 from .tweet_response import TweetResult
 from .user_response import UserResult
-from .utils import load_json
+from .utils import (
+    iter_jsonl,
+    iter_records,
+    load_json,
+)
+
+
+__all__ = [
+    "TimelineEntry",
+    "TimelineSyncState",
+    "TimelineTimelineCursor",
+    "merge_timelines",
+]
 
 
 class TimelineEntry(BaseModel):
     """Timeline Entry class object."""
 
-    entry_id: str = Field("entryId")
+    entry_id: str = Field(alias="entryId")
     sort_index: str = Field(alias="sortIndex")
-    content: Union[TimelineTimelineItem, TimelineTimelineModule]
+    content: Union[
+        TimelineTimelineItem, TimelineTimelineModule, TimelineTimelineCursor
+    ]
+
+    @property
+    def is_cursor(self) -> bool:
+        """Whether this is a pagination cursor entry (no tweet or user)."""
+        return isinstance(self.content, TimelineTimelineCursor)
 
     @property
     def result(self):
@@ -40,10 +70,27 @@ class TimelineEntry(BaseModel):
         )
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str):
         """Load class object from JSON file."""
-        data = load_json(pathname)
-        return cls(**data)
+        return load_cached(cls, pathname, lambda path: cls(**load_json(path)))
+
+    @classmethod
+    def iter_jsonl(
+        cls,
+        pathname: str,
+        processes: Optional[int] = None,
+        chunk_size: int = 256,
+        projection: Optional[Callable] = None,
+    ) -> Iterator:
+        """Stream class objects (or projections) from a JSON Lines file."""
+        return iter_jsonl(cls, pathname, processes, chunk_size, projection)
+
+    @classmethod
+    @observed
+    def from_jsonl(cls, pathname: str, **kwargs) -> List:
+        """Load class objects from a JSON Lines file."""
+        return list(cls.iter_jsonl(pathname, **kwargs))
 
 
 TimelineItemType = Annotated[
@@ -70,6 +117,18 @@ class TimelineTimelineModule(BaseModel):
             yield item.item.item_content
 
 
+class TimelineTimelineCursor(BaseModel):
+    """Timeline Timeline Cursor class object."""
+
+    typename: Literal["TimelineTimelineCursor"] = Field(alias="__typename")
+    entry_type: Literal["TimelineTimelineCursor"] = Field(alias="entryType")
+    value: str
+    cursor_type: str = Field(alias="cursorType")
+    stop_on_empty_response: Optional[bool] = Field(alias="stopOnEmptyResponse")
+
+    _intern = interned("cursor_type")
+
+
 class HomeConversation(BaseModel):
     """Home Conversation class object."""
 
@@ -100,8 +159,143 @@ class TimelineUser(BaseModel):
     user_results: UserResult
 
 
+def _entry_id(entry: Any) -> str:
+    if isinstance(entry, TimelineEntry):
+        return entry.entry_id
+    return entry["entryId"]
+
+
+def _sort_index(entry: Any) -> int:
+    if isinstance(entry, TimelineEntry):
+        return int(entry.sort_index)
+    return int(entry["sortIndex"])
+
+
+def _is_cursor(entry: Any) -> bool:
+    if isinstance(entry, TimelineEntry):
+        return entry.is_cursor
+    return entry["content"].get("entryType") == "TimelineTimelineCursor"
+
+
+def _validated(entry: Any) -> TimelineEntry:
+    if isinstance(entry, TimelineEntry):
+        return entry
+    return TimelineEntry.parse_obj(entry)
+
+
+def _merge(sources: Iterable) -> Iterator[Any]:
+    """Unique entries of all 'sources', raw or validated as given."""
+
+    seen = set()
+    streams = [iter_records(source) for source in sources]
+
+    for entry in heapq.merge(*streams, key=_sort_index, reverse=True):
+        entry_id = _entry_id(entry)
+
+        if entry_id not in seen:
+            seen.add(entry_id)
+            yield entry
+
+
+def merge_timelines(
+    *sources: Union[str, os.PathLike, Iterable]
+) -> Iterator[TimelineEntry]:
+    """Merge pages of one timeline into a single stream of unique entries.
+
+    Each source is a page file (a single entry, a JSON array of entries or
+    JSON Lines) or an iterable of entries, raw or validated, already in
+    timeline order (descending 'sortIndex', as served). The sources are
+    k-way merged on a heap, so only one entry per source is held at a time,
+    and each 'entryId' is yielded once, the first time it is seen. Raw
+    entries are only validated once they are known not to be duplicates.
+    """
+
+    for entry in _merge(sources):
+        yield _validated(entry)
+
+
+class TimelineSyncState(BaseModel):
+    """Incremental sync state of one timeline.
+
+    Keeps the highest 'sortIndex' synced so far and the latest top and
+    bottom cursors, and is saved as JSON between crawls:
+
+        state = TimelineSyncState.load("likes.state.json")
+        for entry in state.newer(*pages):
+            ...
+        state.save("likes.state.json")
+    """
+
+    sort_index: Optional[int]
+    top_cursor: Optional[str]
+    bottom_cursor: Optional[str]
+    entries: int = 0
+
+    def newer(
+        self, *sources: Union[str, os.PathLike, Iterable]
+    ) -> Iterator[TimelineEntry]:
+        """Yield the entries newer than the last sync, as 'merge_timelines' would.
+
+        Cursor entries are not yielded; they update 'top_cursor' (the first
+        top cursor seen, i.e. the newest page's) and 'bottom_cursor' (the
+        last one seen). Older entries are skipped without being validated.
+        The state only advances once every source has been consumed, so an
+        interrupted sync is repeated in full next time.
+        """
+
+        sort_index = self.sort_index
+        top_cursor = bottom_cursor = None
+        count = 0
+
+        for entry in _merge(sources):
+            if _is_cursor(entry):
+                cursor = _validated(entry).content
+
+                if cursor.cursor_type == "Top":
+                    top_cursor = top_cursor or cursor.value
+                elif cursor.cursor_type == "Bottom":
+                    bottom_cursor = cursor.value
+
+                continue
+
+            index = _sort_index(entry)
+
+            if self.sort_index is not None and index <= self.sort_index:
+                continue
+
+            sort_index = index if sort_index is None else max(sort_index, index)
+            count += 1
+
+            yield _validated(entry)
+
+        self.sort_index = sort_index
+        self.top_cursor = top_cursor or self.top_cursor
+        self.bottom_cursor = bottom_cursor or self.bottom_cursor
+        self.entries += count
+
+    @classmethod
+    def load(cls, pathname: str) -> "TimelineSyncState":
+        """Load a saved state (an empty one if 'pathname' does not exist)."""
+
+        if not os.path.exists(pathname):
+            return cls()
+
+        return cls.parse_obj(load_json(pathname))
+
+    def save(self, pathname: str) -> None:
+        """Save the state as JSON (atomically replacing 'pathname')."""
+
+        temporary = f"{pathname}.tmp"
+
+        with open(temporary, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            fp.write(self.json())
+
+        os.replace(temporary, pathname)
+
+
 TimelineEntry.update_forward_refs()
 TimelineTimelineItem.update_forward_refs()
 TimelineTimelineModule.update_forward_refs()
+TimelineTimelineCursor.update_forward_refs()
 HomeConversation.update_forward_refs()
 TimelineItemContent.update_forward_refs()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import (
+    Any,
     Dict,
     List,
     Literal,
@@ -13,10 +14,17 @@ from typing import (
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
     Field,
+    PrivateAttr,
 )
 
 
 from .common import BaseMixin
+from .interning import interned
+from .lazy import (
+    LazyModel,
+    lazy,
+    lazy_enabled,
+)
 
 from .card import (
     Card,
@@ -61,10 +69,31 @@ class Tweet(BaseModel, BaseMixin):
     legacy: TweetLegacy
     quick_promote_eligibility: Optional[QuickPromoteEligibility]
 
+    _quoted_user_id: Optional[str] = PrivateAttr(None)
+
+    _intern = interned("source")
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        # The quoted tweet is not validated (it may be a tombstone or a
+        # visibility wrapper); only its author is kept.
+        self._quoted_user_id = _quoted_user_id(data.get("quoted_status_result"))
+
     @property
     def user(self):
         return self.core.user_results.result
 
+    @property
+    def quoted_user_id_str(self) -> Optional[str]:
+        """Author of the quoted tweet, if the payload embedded it."""
+        return self._quoted_user_id
+
+    @classmethod
+    def validate(cls, value):
+        if cls is Tweet and isinstance(value, Dict) and lazy_enabled():
+            return LazyTweet.validate(value)
+        return super().validate(value)
+
 
 class TweetEditControl(BaseModel):
     """Tweet Edit Control class object."""
@@ -88,6 +117,8 @@ class TweetViews(BaseModel):
     state: str
     count: Optional[int]
 
+    _intern = interned("state")
+
 
 class TweetLegacy(BaseModel):
     """Tweet Legacy class object."""
@@ -106,6 +137,7 @@ class TweetLegacy(BaseModel):
     in_reply_to_status_id_str: Optional[str]
     in_reply_to_user_id_str: Optional[str]
     is_quote_status: bool
+    quoted_status_id_str: Optional[str]
     lang: str
     possibly_sensitive: Optional[bool]
     possibly_sensitive_editable: Optional[bool]
@@ -118,6 +150,8 @@ class TweetLegacy(BaseModel):
     self_thread: Optional[SelfThread]
     scopes: Optional[TweetScopes]
 
+    _intern = interned("lang")
+
 
 class TweetEntities(BaseModel):
     """Tweet Entities class object."""
@@ -156,6 +190,65 @@ class SelfThread(BaseModel):
     id_str: str
 
 
+class LazyTweetLegacy(TweetLegacy):
+    """Tweet Legacy class object with lazily validated entities."""
+
+    entities: lazy(TweetEntities)
+    extended_entities: Optional[lazy(TweetEntities)]
+
+    def to_legacy(self) -> TweetLegacy:
+        """Return the fully validated Tweet Legacy object."""
+        return TweetLegacy.construct(self.__fields_set__, **_resolve_fields(self))
+
+
+class LazyTweet(Tweet):
+    """Tweet class object with lazily validated sub-trees.
+
+    'core', 'card', 'unified_card' and the legacy 'entities' and
+    'extended_entities' are kept as raw dicts and validated into their models
+    the first time they are accessed.
+    """
+
+    core: lazy(UserResults)
+    card: Optional[lazy(Card)]
+    unified_card: Optional[lazy(UnifiedCard)]
+    legacy: LazyTweetLegacy
+
+    class Config:  # pylint: disable=missing-class-docstring
+        json_encoders = {LazyModel: lambda value: value.resolve().dict()}
+
+    def to_tweet(self) -> Tweet:
+        """Return the fully validated Tweet object."""
+        values = _resolve_fields(self)
+        values["legacy"] = self.legacy.to_legacy()
+        tweet = Tweet.construct(self.__fields_set__, **values)
+        tweet._quoted_user_id = self._quoted_user_id  # pylint: disable=protected-access
+        return tweet
+
+
+def _quoted_user_id(quoted: Any) -> Optional[str]:
+    """Author of a raw 'quoted_status_result' (None if it names none)."""
+
+    result = quoted.get("result") if isinstance(quoted, Dict) else None
+
+    if isinstance(result, Dict):
+        # TweetWithVisibilityResults wraps the tweet.
+        result = result.get("tweet", result)
+
+    if not isinstance(result, Dict):
+        return None
+
+    legacy = result.get("legacy")
+    return legacy.get("user_id_str") if isinstance(legacy, Dict) else None
+
+
+def _resolve_fields(model: BaseModel) -> Dict:
+    return {
+        key: value.resolve() if isinstance(value, LazyModel) else value
+        for key, value in model
+    }
+
+
 Tweet.update_forward_refs()
 TweetLegacy.update_forward_refs()
 TweetEntities.update_forward_refs()
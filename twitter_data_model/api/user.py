@@ -7,10 +7,14 @@ import json
 from pathlib import Path
 from typing import (
     Annotated,
+    Any,
     Dict,
+    Iterable,
+    Iterator,
     Literal,
     List,
     Optional,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -20,11 +24,18 @@ from typing import (
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
     Field,
+    PrivateAttr,
+    parse_obj_as,
 )
 
 
+from .cache import load_cached
 from .common import BaseMixin
+from .identity import current_identity_map
+from .interning import interned
+from .metrics import observed
 from .user_verify import VerificationInfo
+from .utils import iter_json_array
 
 
 __all__ = [
@@ -96,6 +107,20 @@ class User(BaseModel, BaseMixin):
                 return getattr(self.legacy, key)
             raise KeyError from error
 
+    @classmethod
+    def validate(cls, value):
+        identity_map = current_identity_map()
+
+        if identity_map is None or cls is not User or not isinstance(value, Dict):
+            return super().validate(value)
+
+        user = identity_map.get(value.get("rest_id"))
+
+        if user is None:
+            user = identity_map.put(super().validate(value))
+
+        return user
+
 
 class UserLegacy(BaseModel):
     """User Legacy object."""
@@ -134,6 +159,8 @@ class UserLegacy(BaseModel):
     withheld_in_countries: List[str]
     withheld_scope: Optional[str]
 
+    _intern = interned("profile_interstitial_type", "translator_type")
+
 
 class UserEntities(BaseModel):
     """User Entities object."""
@@ -189,64 +216,236 @@ class ProfessionalCategory(BaseModel):
 UserType = Annotated[Union[User, UserUnavailable], Field(discriminator="typename")]
 
 
-class UserList(BaseModel):
-    """User List class object."""
+class _UserIndex:
+    """Hash indexes over the 'User' entries of a User List.
 
-    __root__: List[UserType]
+    Every key maps to the list of entries sharing it, so duplicate entries
+    (the same user listed twice) are all found, and all deleted. 'counts'
+    holds how many times each object (by 'id()') is listed.
+    """
 
-    def __contains__(self, item: Union[int, str]) -> bool:
-        if isinstance(item, str):
-            names = []
-
-            for entry in self:
-                if isinstance(entry, Dict):
-                    if entry["typename"] == "User":
-                        entry = User(**entry)
-                    elif entry["typename"] == "UserUnavailable":
-                        entry = UserUnavailable(**entry)
-                    else:
-                        continue
-
-                names += [
-                    entry.legacy.name.casefold(),
-                    entry.legacy.screen_name.casefold(),
-                    entry.id,
-                ]
-
-            return item in names
+    __slots__ = ("rest_ids", "ids", "screen_names", "names", "counts")
+
+    def __init__(self):
+        self.rest_ids: Dict[int, List[User]] = {}
+        self.ids: Dict[str, List[User]] = {}
+        self.screen_names: Dict[str, List[User]] = {}
+        self.names: Dict[str, List[User]] = {}
+        self.counts: Dict[int, int] = {}
+
+    def _keys(self, user: User):
+        return (
+            (self.rest_ids, user.rest_id),
+            (self.ids, user.id),
+            (self.screen_names, user.legacy.screen_name.casefold()),
+            (self.names, user.legacy.name.casefold()),
+        )
+
+    def add(self, user: UserType) -> None:
+        if not isinstance(user, User):
+            return
+
+        count = self.counts.get(id(user), 0)
+        self.counts[id(user)] = count + 1
+
+        if count:
+            # Already indexed: the object is listed once more.
+            return
+
+        for index, key in self._keys(user):
+            index.setdefault(key, []).append(user)
+
+    def remove(self, user: User) -> int:
+        """Unindex 'user'; return how many times it was listed."""
+
+        for index, key in self._keys(user):
+            entries = [entry for entry in index.get(key, []) if entry is not user]
+            if entries:
+                index[key] = entries
+            else:
+                index.pop(key, None)
+
+        return self.counts.pop(id(user), 0)
+
+    def find(self, item: Union[int, str]) -> List[User]:
+        """Return every user matching a Rest ID, ID, screen name or name."""
 
         if isinstance(item, int):
-            rest_ids = [entry.rest_id for entry in self if isinstance(entry, User)]
+            users = self.rest_ids.get(item, [])
+        elif isinstance(item, str):
+            key = item.casefold()
+            users = self.ids.get(item, []) + self.screen_names.get(key, [])
+            users += self.names.get(key, [])
+        else:
+            return []
+
+        found = {}
+        for user in users:
+            found[id(user)] = user
+        return list(found.values())
+
+
+class UserList(BaseModel):
+    """User List class object.
+
+    Lookups, membership tests and deletions go through hash indexes keyed
+    by Rest ID, ID, and casefolded screen name and name. The indexes are
+    built on first use and kept up to date by 'append', 'extend' and the
+    delete methods, which remove every matching entry (duplicates too).
+
+    Deleted entries are only unindexed and counted out of 'len'; they are
+    dropped from the list in one pass the next time it is read by position
+    (indexing, iteration or serialization), so a run of deletes is linear.
+    """
 
-            return item in rest_ids
+    __root__: List[UserType]
+
+    _index: Optional[_UserIndex] = PrivateAttr(None)
+    # 'id()' of the deleted users still in '__root__', and their entry count.
+    _deleted: Set[int] = PrivateAttr(default_factory=set)
+    _garbage: int = PrivateAttr(0)
 
-        return False
+    def __contains__(self, item: Union[int, str]) -> bool:
+        return bool(self._get_index().find(item))
 
     def __delattr__(self, attr: Union[int, str]) -> None:
-        for index, entry in enumerate(self.__root__):
-            if attr in entry:
-                del self.__root__[index]
+        self.delete(attr)
+
+    def __getitem__(self, item: int) -> UserType:
+        self._compact()
+        return self.__root__[item]
 
     def __iter__(self):
+        self._compact()
         for entry in self.__root__:
-            yield entry
+            # Entries deleted while iterating are skipped.
+            if id(entry) not in self._deleted:
+                yield entry
 
     def __len__(self):
-        return len(self.__root__)
+        return len(self.__root__) - self._garbage
 
     __delitem__ = __delattr__
 
+    def _get_index(self) -> _UserIndex:
+        if self._index is None:
+            index = _UserIndex()
+            for entry in self.__root__:
+                index.add(entry)
+            self._index = index
+        return self._index
+
+    def _iter(self, *args, **kwargs):
+        # dict(), json(), copy() and == read '__root__' directly.
+        self._compact()
+        return super()._iter(*args, **kwargs)
+
+    def _remove(self, users: List[User]) -> int:
+        """Unindex 'users' and mark their entries as deleted."""
+
+        index = self._get_index()
+        for user in users:
+            self._garbage += index.remove(user)
+            self._deleted.add(id(user))
+
+        return len(users)
+
+    def _compact(self) -> None:
+        """Drop the entries of deleted users from the list, in one pass."""
+
+        if not self._deleted:
+            return
+
+        deleted = self._deleted
+        self.__root__[:] = [e for e in self.__root__ if id(e) not in deleted]
+        self._deleted = set()
+        self._garbage = 0
+
+    def append(self, user: UserType) -> None:
+        """Add a user to the list (and its indexes)."""
+
+        if id(user) in self._deleted:
+            # Re-adding a deleted object: its old entries must go first.
+            self._compact()
+
+        self.__root__.append(user)
+        if self._index is not None:
+            self._index.add(user)
+
+    def extend(self, users: Iterable[UserType]) -> None:
+        """Add several users to the list (and its indexes)."""
+
+        for user in users:
+            self.append(user)
+
+    def get_by_rest_id(self, rest_id: int) -> Optional[User]:
+        """Return the user with this Rest ID, if any."""
+
+        users = self._get_index().rest_ids.get(int(rest_id))
+        return users[0] if users else None
+
+    def get_by_id(self, id_: str) -> Optional[User]:
+        """Return the user with this (GraphQL) ID, if any."""
+
+        users = self._get_index().ids.get(id_)
+        return users[0] if users else None
+
+    def get_by_screen_name(self, screen_name: str) -> Optional[User]:
+        """Return the user with this screen name (case-insensitive), if any."""
+
+        users = self._get_index().screen_names.get(screen_name.casefold())
+        return users[0] if users else None
+
+    def get_by_name(self, name: str) -> List[User]:
+        """Return the users with this display name (case-insensitive)."""
+
+        return list(self._get_index().names.get(name.casefold(), []))
+
+    def delete(self, item: Union[int, str]) -> int:
+        """Delete users matching a Rest ID, ID, screen name or name.
+
+        Every entry of a matching user is removed. Returns the number of
+        distinct users deleted.
+        """
+
+        return self._remove(self._get_index().find(item))
+
+    def delete_by_rest_id(self, rest_id: int) -> bool:
+        """Delete the user with this Rest ID; return whether one was found."""
+
+        return bool(self.delete(int(rest_id)))
+
+    def delete_by_screen_name(self, screen_name: str) -> bool:
+        """Delete the user with this screen name; return whether one was found."""
+
+        users = self._get_index().screen_names.get(screen_name.casefold(), [])
+        return bool(self._remove(list(users)))
+
     def get_rest_ids(self) -> List[int]:
         """Return a list of Rest IDs."""
 
         return [user.rest_id for user in self]
 
     @classmethod
+    @observed
     def from_json(cls, pathname: str) -> Dict:
         """Convert file data to class object."""
 
-        data = Path(pathname).read_text(encoding="utf8")
-        return cls.parse_obj(json.loads(data))
+        def parse(path: str):
+            data = Path(path).read_text(encoding="utf8")
+            return cls.parse_obj(json.loads(data))
+
+        return load_cached(cls, pathname, parse)
+
+    @classmethod
+    def iter_json(cls, pathname: str) -> Iterator[Union[User, UserUnavailable]]:
+        """Stream users from a JSON array file, one element at a time."""
+
+        for datum in iter_json_array(pathname):
+            if isinstance(datum, str):
+                continue
+
+            yield parse_obj_as(UserType, _flatten(datum))
 
     @classmethod
     def parse_obj(cls, data):
@@ -261,17 +460,22 @@ class UserList(BaseModel):
             if isinstance(datum, str):
                 continue
 
-            if "data" in datum and "user" in datum["data"].keys():
-                result = datum["data"]["user"]["result"]
-                results.append(result)
-            else:
-                # TODO: What form should this data take?
-                # TODO: What error(s) should this raise?
-                results.append(datum)
+            results.append(_flatten(datum))
 
         return super().parse_obj(results)
 
 
+def _flatten(datum: Dict[str, Any]) -> Dict[str, Any]:
+    """Unwrap a 'data.user.result' response down to the user object."""
+
+    if "data" in datum and "user" in datum["data"].keys():
+        return datum["data"]["user"]["result"]
+
+    # TODO: What form should this data take?
+    # TODO: What error(s) should this raise?
+    return datum
+
+
 User.update_forward_refs()
 UserLegacy.update_forward_refs()
 UserEntities.update_forward_refs()
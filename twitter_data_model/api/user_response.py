@@ -10,11 +10,11 @@ from typing import (
 from pydantic import (  # pylint: disable=no-name-in-module
     BaseModel,
     Field,
+    validator,
 )
 
 
-from .user import User
-from .user_unavailable import UserUnavailable
+from .user import User, UserUnavailable
 
 
 # pylint: disable=too-few-public-methods
@@ -37,6 +37,16 @@ class UserResponse(BaseModel):
         UserResult,
     ]
 
+    class Config:  # pylint: disable=missing-class-docstring
+        smart_union = True
+
+    @validator("user", pre=True)
+    def dispatch_user(cls, value):  # pylint: disable=no-self-argument
+        """Skip the 'User' attempt for wrapped '{"result": ...}' users."""
+        if isinstance(value, dict) and "result" in value:
+            return UserResult.validate(value)
+        return value
+
     def resolve(self):
         if isinstance(self.user, UserResult):
             return self.user.result
@@ -1,9 +1,205 @@
 import json
+import os
 
-from typing import Dict
+from collections import deque
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Type,
+)
 from pathlib import Path
 
 
+_WHITESPACE = " \t\n\r"
+
+
 def load_json(pathname: str) -> Dict:
     data = Path(pathname).read_text(encoding="utf8")
     return json.loads(data)
+
+
+def iter_json_array(
+    pathname: str, chunk_size: int = 1 << 16, encoding: str = "utf8"
+) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the element being decoded (plus one read chunk) is held in memory,
+    so arbitrarily large arrays can be walked with a flat footprint. A file
+    holding a single (non-array) JSON value yields that value once. Missing,
+    doubled or trailing commas raise 'json.JSONDecodeError'.
+    """
+
+    decoder = json.JSONDecoder()
+
+    with open(pathname, mode="r", encoding=encoding) as fp:  # pylint: disable=invalid-name
+        buffer = ""
+        position = 0
+        size = chunk_size
+        eof = False
+
+        def fill():
+            nonlocal buffer, position, eof
+            chunk = fp.read(size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def skip(chars: str) -> str:
+            """Advance past 'chars', returning the next significant character."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in chars:
+                    position += 1
+                if position < len(buffer) or eof:
+                    return buffer[position : position + 1]
+                fill()
+
+        if skip(_WHITESPACE) != "[":
+            while not eof:
+                fill()
+            yield json.loads(buffer[position:])
+            return
+
+        position += 1
+
+        if skip(_WHITESPACE) == "]":
+            return
+
+        while True:
+            char = skip(_WHITESPACE)
+
+            if not char:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+
+            if char in ",]":
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Element straddles the chunk boundary; grow the read size so
+                # very large elements are not re-scanned once per chunk.
+                size *= 2
+                fill()
+                continue
+
+            if end == len(buffer) and not eof:
+                # A scalar (e.g. a number) may continue into the next chunk.
+                fill()
+                continue
+
+            position = end
+            size = chunk_size
+
+            yield value
+
+            char = skip(_WHITESPACE)
+
+            if char == "]":
+                return
+
+            if char != ",":
+                message = "Expecting ',' delimiter" if char else "Unterminated array"
+                raise json.JSONDecodeError(message, buffer, position)
+
+            position += 1
+
+
+def _validate_chunk(
+    model: Type, lines: List[str], projection: Optional[Callable] = None
+) -> List[Any]:
+    """Parse and validate a chunk of JSON lines (process pool worker)."""
+
+    results = []
+
+    for line in lines:
+        result = model(**json.loads(line))
+        results.append(result if projection is None else projection(result))
+
+    return results
+
+
+def _iter_chunks(pathname: str, chunk_size: int, encoding: str) -> Iterator[List[str]]:
+    with open(pathname, mode="r", encoding=encoding) as fp:  # pylint: disable=invalid-name
+        lines = (line for line in fp if line.strip())
+
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_records(source: Any) -> Iterator[Any]:
+    """Yield the raw records of a file, or the items of an iterable.
+
+    A file (path) holds a single JSON value, a JSON array (streamed one
+    element at a time) or, when its name ends with '.jsonl', JSON Lines.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        if os.fspath(source).endswith(".jsonl"):
+            with open(source, encoding="utf8") as fp:  # pylint: disable=invalid-name
+                for line in fp:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            yield from iter_json_array(os.fspath(source))
+        return
+
+    yield from source
+
+
+def iter_jsonl(
+    model: Type,
+    pathname: str,
+    processes: Optional[int] = None,
+    chunk_size: int = 256,
+    projection: Optional[Callable] = None,
+    encoding: str = "utf8",
+) -> Iterator[Any]:
+    """Validate a JSON Lines file into 'model' objects, in file order.
+
+    Lines are dispatched in chunks of 'chunk_size' to a pool of 'processes'
+    workers (default: one per CPU; 0 or 1 validates in-process). At most two
+    chunks per worker are in flight at once, so memory stays bounded.
+
+    'projection', when given, is applied to every model inside the worker
+    and only its (pickled) return value travels back, which is much cheaper
+    than shipping full model trees. It must be a picklable, module-level
+    callable.
+    """
+
+    chunks = _iter_chunks(pathname, chunk_size, encoding)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1:
+        for chunk in chunks:
+            yield from _validate_chunk(model, chunk, projection)
+        return
+
+    # Deferred: the process pool machinery is costly to import.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(_validate_chunk, model, chunk, projection))
+
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,101 @@
+"""Cold import-time benchmark.
+
+Times 'import <target>' in fresh interpreters (so nothing is cached in
+'sys.modules') and reports the median wall time per target, together with
+the heavy optional modules each import dragged in:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --targets api api.timeline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TARGETS = [
+    "api",
+    "api.user",
+    "api.timeline",
+    "api.response",
+    "api.archive",
+    "api.database",
+]
+
+# Modules that no model import should need.
+HEAVY = [
+    "yaml",
+    "concurrent.futures.process",
+    "multiprocessing",
+    "sqlite3",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def measure(target: str, runs: int) -> Dict:
+    """Median cold import time of 'target' over 'runs' fresh interpreters."""
+
+    timings = []
+    loaded: List[str] = []
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(target=target, heavy=HEAVY)],
+            capture_output=True,
+            check=True,
+            cwd=ROOT,
+            text=True,
+        ).stdout
+        seconds, loaded = json.loads(output)
+        timings.append(seconds)
+
+    return {
+        "target": target,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "heavy_modules": loaded,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+
+    for target in args.targets:
+        result = measure(target, args.runs)
+        results.append(result)
+        print(
+            f"{target:<16} {result['median_ms']:>8.1f} ms median "
+            f"{result['min_ms']:>8.1f} ms min  {' '.join(result['heavy_modules'])}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Throughput benchmark over every endpoint fixture.
+
+Measures records/sec, microseconds/record and peak RSS for each model entry
+point at several payload scales, and writes the results as JSON so runs can
+be compared across commits:
+
+    python benchmarks/throughput.py --scales 1 100 10000
+    python benchmarks/throughput.py --compare benchmarks/results/<old>.json
+
+Each case runs in a fresh process so its peak RSS is its own. Single-record
+entry points (DataResponse, TimelineEntry) are scaled by streaming N copies
+of the fixture from a JSON Lines file; list entry points (DataResponseList,
+UserList) by loading an N-element JSON array.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from queue import Empty
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import context  # pylint: disable=unused-import
+
+from pydantic.version import VERSION
+
+from api.response import (
+    DataResponse,
+    DataResponseList,
+)
+from api.timeline import TimelineEntry
+from api.user import UserList
+from api.utils import load_json
+
+
+DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+RESULTS = os.path.join(os.path.dirname(__file__), "results")
+
+# Seconds a single case may run before it is reported as failed.
+TIMEOUT = 600
+
+RESPONSES = [
+    "AudioSpaceById",
+    "AudioSpaceSearch",
+    "TweetResultsByRestId",
+    "TweetStats",
+    "UserByScreenName",
+    "UsersByRestIds",
+]
+
+ENTRIES = [
+    "Favoriters",
+    "Followers",
+    "Following",
+    "Likes",
+    "Retweeters",
+    "TweetDetail",
+    "UserMedia",
+    "UserTweets",
+    "UserTweetsAndReplies",
+]
+
+# entry point -> (fixtures, payload layout)
+CASES = {
+    "DataResponse": (RESPONSES, "jsonl"),
+    "TimelineEntry": (ENTRIES, "jsonl"),
+    "DataResponseList": (RESPONSES, "array"),
+    "UserList": (["UserByScreenName", "UsersByRestIds"], "array"),
+}
+
+MODELS = {
+    "DataResponse": DataResponse,
+    "TimelineEntry": TimelineEntry,
+    "DataResponseList": DataResponseList,
+    "UserList": UserList,
+}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _payload(fixture: str, scale: int, layout: str, directory: str) -> str:
+    data = load_json(os.path.join(DATA, f"{fixture}.json"))
+
+    if fixture == "UsersByRestIds" and layout == "array":
+        # UserList flattens 'data.user.result' responses.
+        data = {"data": {"user": data["data"]["users"][0]}}
+
+    pathname = os.path.join(directory, f"{fixture}-{scale}.{layout}")
+    record = json.dumps(data)
+
+    with open(pathname, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+        if layout == "jsonl":
+            for _ in range(scale):
+                fp.write(record + "\n")
+        else:
+            fp.write("[")
+            fp.write(",".join(record for _ in range(scale)))
+            fp.write("]")
+
+    return pathname
+
+
+def _run(entry_point: str, pathname: str, layout: str, queue) -> None:
+    model = MODELS[entry_point]
+    start = time.perf_counter()
+
+    if layout == "jsonl":
+        records = sum(1 for _ in model.iter_jsonl(pathname, processes=1))
+    else:
+        records = len(model.from_json(pathname))
+
+    queue.put((records, time.perf_counter() - start, _peak_rss_mb()))
+
+
+def _result(process, queue, timeout: float) -> Tuple[int, float, float]:
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            pass
+
+        if process.exitcode is not None:
+            # The result may have been flushed just before the child exited.
+            try:
+                return queue.get(timeout=1)
+            except Empty:
+                raise RuntimeError(
+                    f"benchmark process exited with code {process.exitcode}"
+                ) from None
+
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"benchmark process timed out after {timeout}s")
+
+
+def run_case(
+    entry_point: str,
+    fixture: str,
+    scale: int,
+    directory: str,
+    timeout: float = TIMEOUT,
+) -> Dict:
+    """Run one entry point over one fixture at one scale, in a child process.
+
+    Raises RuntimeError if the child dies without a result (e.g. an
+    exception or the OOM killer) or runs longer than 'timeout' seconds.
+    """
+
+    layout = CASES[entry_point][1]
+    pathname = _payload(fixture, scale, layout, directory)
+
+    ctx = multiprocessing.get_context()
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(entry_point, pathname, layout, queue))
+    process.start()
+
+    try:
+        records, seconds, peak_rss_mb = _result(process, queue, timeout)
+    finally:
+        if process.is_alive():
+            process.terminate()
+
+        process.join()
+        os.remove(pathname)
+
+    return {
+        "entry_point": entry_point,
+        "fixture": fixture,
+        "scale": scale,
+        "records": records,
+        "seconds": seconds,
+        "records_per_sec": records / seconds if seconds else None,
+        "us_per_record": seconds / records * 1e6 if records else None,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: List[Dict], current: List[Dict]) -> None:
+    """Print the per-case change in microseconds per record."""
+
+    before = {(r["entry_point"], r["fixture"], r["scale"]): r for r in previous}
+
+    for result in current:
+        key = (result["entry_point"], result["fixture"], result["scale"])
+        if key in before and before[key]["us_per_record"]:
+            change = result["us_per_record"] / before[key]["us_per_record"] - 1
+            print(f"{' '.join(map(str, key)):<45} {change:+8.1%}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 100, 10000])
+    parser.add_argument("--entry-points", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--fixtures", nargs="+", help="limit to these fixtures")
+    parser.add_argument("--output", help="results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    parser.add_argument(
+        "--timeout", type=float, default=TIMEOUT, help="seconds allowed per case"
+    )
+    args = parser.parse_args(argv)
+
+    commit = _commit()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for entry_point in args.entry_points:
+            for fixture in CASES[entry_point][0]:
+                if args.fixtures and fixture not in args.fixtures:
+                    continue
+
+                for scale in args.scales:
+                    try:
+                        result = run_case(
+                            entry_point, fixture, scale, directory, args.timeout
+                        )
+                    except RuntimeError as error:
+                        print(f"{entry_point:<17} {fixture:<21} x{scale:<6} {error}")
+                        continue
+
+                    results.append(result)
+                    print(
+                        f"{entry_point:<17} {fixture:<21} x{scale:<6} "
+                        f"{result['records_per_sec']:>10.1f} rec/s "
+                        f"{result['us_per_record']:>10.1f} us/rec "
+                        f"{result['peak_rss_mb']:>8.1f} MB"
+                    )
+
+    output = args.output or os.path.join(RESULTS, f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, "w", encoding="utf8") as fp:  # pylint: disable=invalid-name
+        json.dump(
+            {
+                "commit": commit,
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "pydantic": VERSION,
+                "results": results,
+            },
+            fp,
+            indent=2,
+        )
+
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf8") as fp:  # pylint: disable=invalid-name
+            compare(json.load(fp)["results"], results)
+
+
+if __name__ == "__main__":
+    main()
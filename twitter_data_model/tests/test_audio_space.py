@@ -1,14 +1,74 @@
+import copy
+import os
+import pickle
+import tempfile
+
 from unittest import (
     TestCase,
     main,
 )
 
+from pydantic import (  # pylint: disable=no-name-in-module
+    ValidationError,
+)
+
 import context
 
+from api.audio_space import (
+    AudioSpace,
+    AudioSpaceParticipants,
+    ColumnarAudioSpaceParticipants,
+    ParticipantColumns,
+    PeriscopeParticipant,
+)
+
+from api.lazy import (
+    columnar_participants,
+)
+
 from api.response import (
     DataResponse,
 )
 
+from api.space_diff import (
+    SpaceEventLog,
+    diff_spaces,
+)
+from api.utils import (
+    load_json,
+)
+
+
+def roster(space):
+    return {
+        (role, participant.periscope_user_id)
+        for role in ("admins", "speakers", "listeners")
+        for participant in getattr(space.participants, role)
+    }
+
+
+def snapshots():
+    """Three polls of a live Space: a listener is promoted, one leaves, one joins."""
+
+    first = load_json("data/AudioSpaceById.json")["data"]["audioSpace"]
+
+    second = copy.deepcopy(first)
+    participants = second["participants"]
+    participants["speakers"].append(participants["listeners"].pop(0))
+    participants["total"] += 1
+    second["metadata"]["total_live_listeners"] += 5
+    second["metadata"]["is_locked"] = True
+
+    third = copy.deepcopy(second)
+    participants = third["participants"]
+    participants["listeners"].pop(0)
+    joined = copy.deepcopy(participants["admins"][0])
+    joined["periscope_user_id"] = "1newcomer"
+    participants["listeners"].append(joined)
+    third["metadata"]["state"] = "Ended"
+
+    return first, second, third
+
 
 class TestAudioSpace(TestCase):
     def test_audio_space(self):
@@ -17,6 +77,140 @@ class TestAudioSpace(TestCase):
     def test_audio_space_search(self):
         data = DataResponse.from_json("data/AudioSpaceSearch.json")
 
+    def test_columnar_participants(self):
+        expected = DataResponse.from_json("data/AudioSpaceById.json").resolve().participants
+
+        with columnar_participants():
+            data = DataResponse.from_json("data/AudioSpaceById.json")
+
+        participants = data.resolve().participants
+
+        self.assertIsInstance(participants, ColumnarAudioSpaceParticipants)
+        self.assertIsInstance(participants.listeners, ParticipantColumns)
+
+        for name in ("admins", "speakers", "listeners"):
+            columns = getattr(participants, name)
+            self.assertEqual(len(columns), len(getattr(expected, name)))
+            self.assertEqual(columns, getattr(expected, name))
+
+        admin = expected.admins[0]
+        self.assertIsInstance(participants.admins[0], PeriscopeParticipant)
+        self.assertEqual(participants.admins[0], admin)
+        self.assertEqual(participants.admins[-1], expected.admins[-1])
+        self.assertIn(admin.user_results.rest_id, participants.admins)
+        self.assertIn(admin.twitter_screen_name.upper(), participants.admins)
+        self.assertNotIn(1, participants.admins)
+
+        self.assertEqual(
+            participants.listeners.count(is_blue_verified=True),
+            sum(p.user_results.result.is_blue_verified for p in expected.listeners),
+        )
+        self.assertEqual(participants.speakers.count(), len(expected.speakers))
+
+        self.assertEqual(participants.to_participants(), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(participants)), participants)
+        self.assertEqual(
+            AudioSpaceParticipants.parse_raw(participants.json()), expected
+        )
+
+    def test_columnar_coercion(self):
+        raw = load_json("data/AudioSpaceById.json")["data"]["audioSpace"]
+        raw = raw["participants"]
+        participant = raw["admins"][0]
+        participant["is_verified"] = "false"
+        participant["is_muted_by_admin"] = 1
+        participant["user_results"]["rest_id"] = str(
+            participant["user_results"]["rest_id"]
+        )
+
+        eager = AudioSpaceParticipants.parse_obj(raw)
+
+        with columnar_participants():
+            columnar = AudioSpaceParticipants.validate(raw)
+
+        self.assertFalse(eager.admins[0].is_verified)
+        self.assertEqual(columnar.admins[0], eager.admins[0])
+        self.assertEqual(columnar.to_participants(), eager)
+
+        for key, value in (("is_verified", "maybe"), ("display_name", None)):
+            broken = copy.deepcopy(raw)
+            broken["admins"][0][key] = value
+
+            with columnar_participants(), self.assertRaises(ValidationError):
+                AudioSpaceParticipants.validate(broken)
+
+        for path in (("twitter_screen_name",), ("user_results", "result")):
+            broken = copy.deepcopy(raw)
+            parent = broken["admins"][0]
+            for key in path[:-1]:
+                parent = parent[key]
+            del parent[path[-1]]
+
+            with columnar_participants(), self.assertRaises(ValidationError):
+                AudioSpaceParticipants.validate(broken)
+
+    def test_diff_spaces(self):
+        first, second, third = (AudioSpace.parse_obj(s) for s in snapshots())
+        promoted = first.participants.listeners[0].periscope_user_id
+
+        events = {(e.kind, e.key) for e in diff_spaces(first, second)}
+        self.assertEqual(
+            events,
+            {
+                ("role", promoted),
+                ("metadata", "total_live_listeners"),
+                ("metadata", "is_locked"),
+                ("total", None),
+            },
+        )
+
+        events = diff_spaces(second, third, timestamp=2.0)
+        self.assertEqual(
+            {(e.kind, e.key) for e in events},
+            {
+                ("leave", second.participants.listeners[0].periscope_user_id),
+                ("join", "1newcomer"),
+                ("metadata", "state"),
+            },
+        )
+        self.assertTrue(all(e.timestamp == 2.0 for e in events))
+
+    def test_space_event_log(self):
+        raw = snapshots()
+
+        for columnar in (False, True):
+            with self.subTest(columnar=columnar), columnar_participants(columnar):
+                spaces = [AudioSpace.parse_obj(s) for s in raw]
+                log = SpaceEventLog(keyframe_interval=2)
+
+                for timestamp, space in enumerate(spaces * 2):
+                    log.record(space, float(timestamp))
+
+                self.assertEqual(len(log.keyframes), 3)
+
+                for timestamp, space in enumerate(spaces * 2):
+                    rebuilt = log.at(timestamp + 0.5)
+                    self.assertEqual(roster(rebuilt), roster(space))
+                    self.assertEqual(rebuilt.metadata, space.metadata)
+                    self.assertEqual(rebuilt.sharings, space.sharings)
+
+                self.assertEqual(roster(log.latest()), roster(spaces[-1]))
+
+                with self.assertRaises(ValueError):
+                    log.at(-1)
+
+                with self.assertRaises(ValueError):
+                    log.record(spaces[0], 0.0)
+
+                with tempfile.TemporaryDirectory() as tmp:
+                    pathname = os.path.join(tmp, "space.jsonl")
+                    log.dump(pathname)
+                    loaded = SpaceEventLog.load(pathname)
+
+                self.assertEqual(loaded.events, log.events)
+                self.assertEqual(roster(loaded.at(2.5)), roster(spaces[2]))
+                self.assertEqual(roster(loaded.latest()), roster(spaces[-1]))
+
 
 if __name__ == "__main__":
     main()
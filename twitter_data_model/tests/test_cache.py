@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+from pydantic import (  # pylint: disable=no-name-in-module
+    BaseModel,
+    root_validator,
+    validator,
+)
+
+import context
+
+from api.cache import (
+    model_cache,
+    schema_fingerprint,
+)
+
+from api.response import (
+    DataResponse,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+
+class TestCache(TestCase):
+    def test_model_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = shutil.copy("data/UserTweets.json", tmp)
+
+            with model_cache(os.path.join(tmp, "cache")) as cache:
+                first = TimelineEntry.from_json(pathname)
+                second = TimelineEntry.from_json(pathname)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                self.assertEqual(first, second)
+
+                # Touched but unchanged: still a hit (by content hash).
+                os.utime(pathname, ns=(0, 0))
+                TimelineEntry.from_json(pathname)
+                self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+                # Same file read as another model is a separate entry.
+                shutil.copy("data/UsersByRestIds.json", pathname)
+                data = DataResponse.from_json(pathname)
+                self.assertEqual(data.branch, "UsersResult")
+                self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_schema_fingerprint(self):
+        def model(check, root=lambda cls, values: values):
+            class Model(BaseModel):
+                value: int
+
+                _check = validator("value", allow_reuse=True)(check)
+                _root = root_validator(allow_reuse=True)(root)
+
+            return Model
+
+        def same(cls, value):
+            return value
+
+        def changed(cls, value):
+            return value + 1
+
+        fingerprint = schema_fingerprint(model(same))
+
+        self.assertEqual(schema_fingerprint(model(same)), fingerprint)
+        # Same validator names, different bodies.
+        self.assertNotEqual(schema_fingerprint(model(changed)), fingerprint)
+        self.assertNotEqual(
+            schema_fingerprint(model(same, lambda cls, values: dict(values))),
+            fingerprint,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.fast import (
+    FastValidationError,
+    parse_fast,
+)
+
+from api.response import (
+    DataResponse,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.utils import (
+    load_json,
+)
+
+
+RESPONSES = [
+    "data/AudioSpaceById.json",
+    "data/AudioSpaceSearch.json",
+    "data/TweetResultsByRestId.json",
+    "data/TweetStats.json",
+    "data/UserByScreenName.json",
+    "data/UsersByRestIds.json",
+]
+
+ENTRIES = [
+    "data/Favoriters.json",
+    "data/Followers.json",
+    "data/Following.json",
+    "data/Likes.json",
+    "data/Retweeters.json",
+    "data/TweetDetail.json",
+    "data/UserMedia.json",
+    "data/UserTweets.json",
+    "data/UserTweetsAndReplies.json",
+]
+
+
+class TestFast(TestCase):
+    def assert_same(self, model, pathname):
+        data = load_json(pathname)
+        self.assertEqual(parse_fast(model, data).dict(), model(**data).dict())
+
+    def test_data_responses(self):
+        for pathname in RESPONSES:
+            with self.subTest(pathname=pathname):
+                self.assert_same(DataResponse, pathname)
+
+    def test_timeline_entries(self):
+        for pathname in ENTRIES:
+            with self.subTest(pathname=pathname):
+                self.assert_same(TimelineEntry, pathname)
+
+    def test_invalid(self):
+        data = load_json("data/UserTweets.json")
+        del data["sortIndex"]
+
+        with self.assertRaises(FastValidationError):
+            parse_fast(TimelineEntry, data)
+
+
+if __name__ == "__main__":
+    main()
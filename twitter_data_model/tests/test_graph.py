@@ -0,0 +1,258 @@
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.graph import (
+    FollowGraph,
+    FollowGraphBuilder,
+    InteractionGraph,
+)
+
+from api.lazy import (
+    lazy_tweets,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.tweet import (
+    Tweet,
+)
+
+from api.utils import (
+    load_json,
+)
+
+
+def follower(rest_id):
+    raw = load_json("data/Followers.json")
+    raw["entryId"] = f"user-{rest_id}"
+    raw["content"]["itemContent"]["user_results"]["result"]["rest_id"] = str(rest_id)
+    return raw
+
+
+def tweet(tweet_id, author, mentions=(), reply=None, quoted=None):
+    raw = load_json("data/UserTweets.json")["content"]["itemContent"]
+    raw = raw["tweet_results"]["result"]
+    del raw["quoted_status_result"]
+
+    legacy = raw["legacy"]
+    legacy["id_str"] = str(tweet_id)
+    legacy["user_id_str"] = str(author)
+    legacy["in_reply_to_user_id_str"] = reply and str(reply)
+    legacy["is_quote_status"] = quoted is not None
+    legacy["quoted_status_id_str"] = quoted and str(quoted)
+    legacy["entities"]["user_mentions"] = [
+        {"id_str": str(m), "name": "n", "screen_name": "s", "indices": [0, 2]}
+        for m in mentions
+    ]
+    return raw
+
+
+def pagerank(nodes, edges, damping=0.85, iterations=200):
+    """Dense reference PageRank over '{(source, target): weight}'."""
+
+    strengths = {v: 0.0 for v in nodes}
+    for (source, _), weight in edges.items():
+        strengths[source] += weight
+
+    ranks = {v: 1.0 / len(nodes) for v in nodes}
+
+    for _ in range(iterations):
+        dangling = sum(ranks[v] for v in nodes if not strengths[v])
+        updated = {v: (1 - damping + damping * dangling) / len(nodes) for v in nodes}
+        for (source, target), weight in edges.items():
+            updated[target] += damping * ranks[source] * weight / strengths[source]
+        ranks = updated
+
+    return ranks
+
+
+class TestGraph(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def build(self):
+        pathname = os.path.join(self.tmp, "followers.jsonl")
+
+        with open(pathname, "w", encoding="utf8") as fp:
+            for rest_id in (20, 30, 30):
+                fp.write(json.dumps(follower(rest_id)) + "\n")
+
+        builder = FollowGraphBuilder()
+        # 20 and 30 follow 10, 10 follows 20 and 48008938, 30 follows 40.
+        builder.add_followers(10, pathname)
+        builder.add_following(10, [follower(20)], "data/Following.json")
+        builder.add_following(30, [TimelineEntry.parse_obj(follower(40))])
+        builder.add_edge(40, 50)
+        # Self-follows are ignored.
+        builder.add_edge(40, "40")
+
+        self.assertEqual(len(builder), 7)
+        return builder.build()
+
+    def check(self, graph):
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(graph.edges, 6)
+        self.assertEqual(list(graph.ids), sorted(graph.ids))
+
+        self.assertEqual(graph.followers(10), [20, 30])
+        self.assertEqual(graph.following(10), [20, 48008938])
+        self.assertEqual((graph.in_degree(10), graph.out_degree(10)), (2, 2))
+        self.assertEqual((graph.in_degree(50), graph.out_degree(50)), (1, 0))
+        self.assertEqual(graph.mutuals(10), [20])
+        self.assertEqual(graph.mutuals(30), [])
+        self.assertEqual(graph.mutuals(40), [])
+
+        self.assertTrue(graph.follows(30, 10))
+        self.assertFalse(graph.follows(10, 30))
+        self.assertFalse(graph.follows(10, 99))
+        self.assertIn("48008938", graph)
+        self.assertNotIn(99, graph)
+
+        with self.assertRaises(KeyError):
+            graph.followers(99)
+
+        self.assertEqual(graph.k_hop(10, 1), [20, 48008938])
+        self.assertEqual(graph.k_hop(30, 2), [10, 20, 40, 50, 48008938])
+        self.assertEqual(graph.k_hop(50, 3, "in"), [30, 40])
+        self.assertEqual(graph.k_hop(40, 2, "both"), [10, 30, 50])
+
+        with self.assertRaises(ValueError):
+            graph.k_hop(10, 1, "sideways")
+
+    def test_follow_graph(self):
+        graph = self.build()
+        self.check(graph)
+
+        pathname = os.path.join(self.tmp, "follows.graph")
+        graph.save(pathname)
+
+        with FollowGraph.load(pathname) as mapped:
+            self.check(mapped)
+            mapped.save(os.path.join(self.tmp, "copy.graph"))
+
+        self.assertEqual(len(mapped), 0)
+
+        # A live slice keeps the file mapped, and the graph usable.
+        mapped = FollowGraph.load(pathname)
+        row = mapped.out_targets[0:2]
+
+        with self.assertRaises(BufferError):
+            mapped.close()
+
+        self.check(mapped)
+        self.assertEqual(list(row), list(graph.out_targets[0:2]))
+
+        del row
+        mapped.close()
+        self.assertEqual(len(mapped), 0)
+
+        copy = os.path.join(self.tmp, "copy.graph")
+        self.check(FollowGraph.load(copy, memory_map=False))
+
+        with open(pathname, "r+b") as fp:
+            fp.write(b"NOTAGRAPH")
+
+        with self.assertRaises(ValueError):
+            FollowGraph.load(pathname)
+
+
+class TestInteractionGraph(TestCase):
+    def test_interactions(self):
+        graph = InteractionGraph(mention=1.0, reply=2.0, quote=3.0)
+
+        graph.update(
+            [
+                tweet(1, 10, mentions=[20, 30, 10]),
+                tweet(2, 20, reply=10, mentions=[10]),
+                # Quotes of a tweet not seen yet are linked once it arrives.
+                Tweet.parse_obj(tweet(3, 30, quoted=4)),
+                tweet(4, 40),
+                tweet(1, 10, mentions=[20]),
+            ]
+        )
+        # A raw timeline entry quoting (and naming) another author.
+        graph.update([load_json("data/UserTweets.json")])
+
+        self.assertEqual(graph.tweets, 5)
+        self.assertEqual(graph.edges, 6)
+        self.assertEqual(list(graph.ids), [10, 20, 30, 40, 33836629, 3108351])
+
+        edges = {(10, 20): 1.0, (10, 30): 1.0, (20, 10): 3.0, (30, 40): 3.0}
+        edges[(33836629, 3108351)] = 3.0
+
+        self.assertEqual(
+            list(graph.degree_centrality()), [0.2, 0.2, 0.2, 0.2, 0.0, 0.2]
+        )
+        self.assertEqual(
+            list(graph.degree_centrality("out")), [0.4, 0.2, 0.2, 0.0, 0.2, 0.0]
+        )
+        self.assertEqual(
+            list(graph.degree_centrality("in", weighted=True)),
+            [3.0, 1.0, 1.0, 3.0, 0.0, 3.0],
+        )
+
+        with self.assertRaises(ValueError):
+            graph.degree_centrality("both")
+
+        ranks = graph.pagerank(tolerance=1e-12)
+        expected = pagerank(list(graph.ids), edges)
+
+        self.assertAlmostEqual(sum(ranks), 1.0)
+        for rest_id, rank in zip(graph.ids, ranks):
+            self.assertAlmostEqual(rank, expected[rest_id])
+
+        self.assertEqual(graph.top(ranks, 1)[0][0], max(expected, key=expected.get))
+        cold = graph.iterations
+
+        # New tweets extend the matrix; ranking warm-starts from the last run.
+        graph.add_tweet(tweet(5, 50, mentions=[40]))
+        ranks = graph.pagerank(tolerance=1e-12)
+        edges[(50, 40)] = 1.0
+
+        expected = pagerank(list(graph.ids), edges)
+        for rest_id, rank in zip(graph.ids, ranks):
+            self.assertAlmostEqual(rank, expected[rest_id])
+
+        self.assertLess(graph.iterations, cold)
+
+    def test_raw_and_validated_parity(self):
+        for name in ("UserTweets", "TweetDetail", "UserTweetsAndReplies"):
+            with self.subTest(name=name):
+                pathname = f"data/{name}.json"
+                raw = InteractionGraph(quote=3.0)
+                raw.update([load_json(pathname)])
+
+                validated = InteractionGraph(quote=3.0)
+                validated.update([TimelineEntry.from_json(pathname)])
+
+                with lazy_tweets():
+                    entry = TimelineEntry.from_json(pathname)
+
+                lazy = InteractionGraph(quote=3.0)
+                lazy.update([entry])
+
+                self.assertGreater(raw.edges, 0)
+
+                for graph in (validated, lazy):
+                    self.assertEqual(graph.edges, raw.edges)
+                    self.assertEqual(list(graph.ids), list(raw.ids))
+                    self.assertEqual(
+                        list(graph.degree_centrality("in", weighted=True)),
+                        list(raw.degree_centrality("in", weighted=True)),
+                    )
+
+
+if __name__ == "__main__":
+    main()
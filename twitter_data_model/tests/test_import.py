@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+import api
+
+from api.user import (
+    User,
+)
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def loaded_modules(statement: str):
+    """Modules loaded by running 'statement' in a fresh interpreter."""
+
+    script = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    ).stdout
+    return set(json.loads(output))
+
+
+class TestImport(TestCase):
+    def test_package_is_lazy(self):
+        modules = loaded_modules("import api")
+        self.assertEqual({m for m in modules if m.startswith("api.")}, set())
+        self.assertNotIn("pydantic", modules)
+
+    def test_heavy_dependencies_deferred(self):
+        modules = loaded_modules("import api.response, api.timeline")
+        self.assertNotIn("yaml", modules)
+        self.assertNotIn("concurrent.futures.process", modules)
+
+    def test_exports(self):
+        self.assertIs(api.User, User)
+        self.assertIn("TimelineEntry", dir(api))
+        self.assertEqual(api.TimelineEntry.__module__, "api.timeline")
+
+        with self.assertRaises(AttributeError):
+            api.NoSuchModel  # pylint: disable=pointless-statement
+
+    def test_yaml(self):
+        user = api.DataResponse.from_json("data/UserByScreenName.json").resolve()
+        self.assertIn("screen_name:", user.yaml())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.aio import (
+    aiter_directory,
+)
+
+from api.audio_space import (
+    AudioSpace,
+)
+
+from api.response import (
+    DataResponse,
+    DataResponseList,
+)
+
+from api.sniff import (
+    load_any,
+    sniff,
+    sniff_file,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.tweet import (
+    Tweet,
+)
+
+from api.user import (
+    User,
+    UserList,
+)
+
+
+async def collect(*args, **kwargs):
+    return [value async for value in aiter_directory(*args, **kwargs)]
+
+
+class TestIngest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_data_responses(self):
+        for name in ("AudioSpaceById", "TweetResultsByRestId", "UserByScreenName"):
+            shutil.copy(f"data/{name}.json", self.tmp)
+
+        with ThreadPoolExecutor(2) as executor:
+            results = asyncio.run(collect(self.tmp, executor=executor, max_pending=1))
+
+        self.assertEqual([type(r) for r in results], [AudioSpace, Tweet, User])
+
+        with ThreadPoolExecutor(2) as executor:
+            responses = asyncio.run(collect(self.tmp, executor=executor, resolve=False))
+
+        self.assertTrue(all(isinstance(r, DataResponse) for r in responses))
+
+    def test_timeline_entries_in_processes(self):
+        for index, name in enumerate(["UserTweets", "Likes", "UserMedia"] * 4):
+            shutil.copy(f"data/{name}.json", os.path.join(self.tmp, f"{index:02}.json"))
+
+        pattern = os.path.join(self.tmp, "*.json")
+        results = asyncio.run(collect(pattern, TimelineEntry, max_pending=2))
+
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[0], TimelineEntry.from_json("data/UserTweets.json").result)
+
+    def test_modules_and_cursors(self):
+        shutil.copy("data/UserTweetsAndReplies.json", self.tmp)
+        shutil.copy("data/TweetDetail.json", self.tmp)
+
+        cursor = {
+            "entryId": "cursor-bottom-1",
+            "sortIndex": "1",
+            "content": {
+                "entryType": "TimelineTimelineCursor",
+                "__typename": "TimelineTimelineCursor",
+                "value": "x",
+                "cursorType": "Bottom",
+            },
+        }
+
+        with open(os.path.join(self.tmp, "cursor.json"), "w", encoding="utf8") as fp:
+            json.dump(cursor, fp)
+
+        with ThreadPoolExecutor(2) as executor:
+            results = asyncio.run(collect(self.tmp, TimelineEntry, executor=executor))
+
+        module = TimelineEntry.from_json("data/UserTweetsAndReplies.json").content
+        expected = [TimelineEntry.from_json("data/TweetDetail.json").result]
+        expected += [item.tweet_results.result for item in module]
+
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(results, expected)
+
+    def test_errors(self):
+        shutil.copy("data/UserByScreenName.json", self.tmp)
+
+        with open(os.path.join(self.tmp, "z.json"), "w", encoding="utf8") as fp:
+            fp.write("{")
+
+        errors = []
+
+        with ThreadPoolExecutor(1) as executor:
+            results = asyncio.run(
+                collect(
+                    self.tmp,
+                    executor=executor,
+                    on_error=lambda path, error: errors.append(path.name),
+                )
+            )
+
+            self.assertEqual(len(results), 1)
+            self.assertEqual(errors, ["z.json"])
+
+            with self.assertRaises(ValueError):
+                asyncio.run(collect(self.tmp, executor=executor))
+
+
+class TestSniff(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def dump(self, name, value):
+        pathname = os.path.join(self.tmp, name)
+        with open(pathname, "w", encoding="utf8") as fp:
+            json.dump(value, fp)
+        return pathname
+
+    def test_sniff_file(self):
+        for name in ("AudioSpaceById", "TweetStats", "UserByScreenName", "UsersByRestIds"):
+            self.assertEqual(sniff_file(f"data/{name}.json"), (DataResponse, "object"))
+
+        for name in ("Followers", "TweetDetail", "UserTweets"):
+            self.assertEqual(sniff_file(f"data/{name}.json"), (TimelineEntry, "object"))
+
+        user = json.load(open("data/UserByScreenName.json", encoding="utf8"))
+        stats = json.load(open("data/TweetStats.json", encoding="utf8"))
+
+        self.assertEqual(sniff_file(self.dump("u.json", [user])), (UserList, "array"))
+        self.assertEqual(
+            sniff_file(self.dump("r.json", [stats, user])), (DataResponseList, "array")
+        )
+
+        # A prefix too short to show any key falls back to decoding the file.
+        self.assertEqual(sniff_file("data/UserTweets.json", size=2), (TimelineEntry, "object"))
+
+        # A multibyte character cut at the end of the prefix still counts.
+        pathname = os.path.join(self.tmp, "cut.json")
+        with open(pathname, "w", encoding="utf8") as fp:
+            json.dump({"x": "\u00e9" * 8, "data": {}}, fp, ensure_ascii=False)
+        self.assertEqual(sniff_file(pathname, size=8), (DataResponse, "object"))
+
+        # JSON Lines are recognised by their content, whatever the extension.
+        pathname = os.path.join(self.tmp, "lines.json")
+        with open(pathname, "w", encoding="utf8") as fp:
+            fp.write(f"{json.dumps(stats)}\n{json.dumps(user)}\n")
+        self.assertEqual(sniff_file(pathname), (DataResponse, "lines"))
+        self.assertEqual(len(list(load_any(pathname))), 2)
+
+        self.assertEqual(sniff_file(self.dump("one.json", user)), (DataResponse, "object"))
+
+        # Records longer than the prefix are read to the end of their line.
+        entry = json.load(open("data/UserTweets.json", encoding="utf8"))
+        record = json.dumps(entry)
+        self.assertGreater(len(record), 4096)
+
+        pathname = os.path.join(self.tmp, "entries.json")
+        with open(pathname, "w", encoding="utf8") as fp:
+            fp.write(f"{record}\n\n{record}\n")
+        self.assertEqual(sniff_file(pathname), (TimelineEntry, "lines"))
+        self.assertEqual(len(list(load_any(pathname))), 2)
+
+        with open(pathname, "w", encoding="utf8") as fp:
+            fp.write(f"{record}\n")
+        self.assertEqual(sniff_file(pathname), (TimelineEntry, "object"))
+
+    def test_sniff(self):
+        tweet = TimelineEntry.from_json("data/UserTweets.json").result
+        self.assertIs(sniff(json.loads(tweet.json(by_alias=True))), Tweet)
+        self.assertIs(sniff({"entryId": "x"}), TimelineEntry)
+        self.assertIsNone(sniff({"unknown": 1}))
+
+    def test_load_any(self):
+        user = json.load(open("data/UserByScreenName.json", encoding="utf8"))
+        entry = json.load(open("data/Likes.json", encoding="utf8"))
+
+        shutil.copy("data/AudioSpaceById.json", self.tmp)
+        self.dump("users.json", [user, user])
+
+        with open(os.path.join(self.tmp, "mixed.jsonl"), "w", encoding="utf8") as fp:
+            fp.write(f"{json.dumps(entry)}\n{json.dumps(user)}\n")
+
+        loaded = list(load_any(self.tmp))
+
+        self.assertEqual(
+            [type(item) for item in loaded],
+            [DataResponse, TimelineEntry, DataResponse, User, User],
+        )
+        self.assertIsInstance(loaded[0].resolve(), AudioSpace)
+
+        with self.assertRaises(ValueError):
+            list(load_any(self.dump("odd.json", {"unknown": 1})))
+
+
+if __name__ == "__main__":
+    main()
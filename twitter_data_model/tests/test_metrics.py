@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from pydantic import (
+    BaseModel,
+    ValidationError,
+)
+
+from api.metrics import (
+    get_registry,
+    profiling,
+)
+
+from api.response import (
+    DataResponse,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.user import (
+    User,
+)
+
+
+class TestMetrics(TestCase):
+    def test_profiling(self):
+        init = BaseModel.__init__
+
+        with profiling() as registry:
+            TimelineEntry.from_json("data/UserTweets.json")
+            DataResponse.from_json("data/UserByScreenName.json")
+
+            with self.assertRaises(ValidationError):
+                User.parse_obj({"__typename": "User"})
+
+        self.assertIsNone(get_registry())
+        self.assertIs(BaseModel.__init__, init)
+
+        snapshot = registry.snapshot()
+        models = snapshot["models"]
+
+        self.assertEqual(models["TimelineEntry"]["count"], 1)
+        self.assertEqual(models["TweetLegacy"]["count"], 1)
+        self.assertEqual(models["User"]["failures"], 1)
+
+        for stats in models.values():
+            self.assertLessEqual(stats["self_seconds"], stats["seconds"])
+
+        self.assertGreaterEqual(
+            models["TimelineEntry"]["seconds"], models["TweetLegacy"]["seconds"]
+        )
+
+        entry_points = snapshot["entry_points"]
+        self.assertEqual(
+            sorted(entry_points), ["DataResponse.from_json", "TimelineEntry.from_json"]
+        )
+        self.assertEqual(entry_points["TimelineEntry.from_json"]["buckets"]["+Inf"], 1)
+
+    def test_export(self):
+        with profiling() as registry:
+            TimelineEntry.from_json("data/Followers.json")
+
+        text = registry.prometheus()
+        self.assertIn("# TYPE twitter_data_model_validations_total counter", text)
+        self.assertIn('twitter_data_model_validations_total{model="UserLegacy"} 1', text)
+        self.assertIn(
+            'twitter_data_model_entry_point_seconds_count{entry_point="TimelineEntry.from_json"} 1',
+            text,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "metrics.json")
+            registry.write_json(pathname)
+
+            with open(pathname, encoding="utf8") as fp:
+                self.assertEqual(json.load(fp), registry.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.archive import (
+    Archive,
+    ArchiveWriter,
+)
+
+from api.database import (
+    SQLiteExporter,
+    SQLiteLoader,
+)
+
+from api.response import (
+    DataResponse,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.user import (
+    User,
+)
+
+
+def load_tweets():
+    tweets = [
+        TimelineEntry.from_json(pathname).result
+        for pathname in [
+            "data/Likes.json",
+            "data/UserMedia.json",
+            "data/UserTweets.json",
+        ]
+    ]
+
+    entry = TimelineEntry.from_json("data/UserTweetsAndReplies.json")
+    tweets += [item.tweet_results.result for item in entry.content]
+
+    return tweets
+
+
+class TestArchive(TestCase):
+    def test_archive(self):
+        tweets = load_tweets()
+        user = tweets[0].user
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "tweets.archive")
+
+            with ArchiveWriter(pathname) as writer:
+                writer.extend(tweets[:2])
+
+            # Append-only: reopening adds to the same archive.
+            with ArchiveWriter(pathname) as writer:
+                writer.extend(tweets[2:])
+                writer.add(user)
+
+            with Archive(pathname) as archive:
+                self.assertEqual(len(archive), len({t.rest_id for t in tweets}) + 1)
+
+                for tweet in tweets:
+                    self.assertEqual(archive[tweet.rest_id], tweet)
+
+                self.assertEqual(archive.get(user.rest_id, User), user)
+                self.assertNotIn(1, archive)
+
+                rest_ids = sorted({tweet.rest_id for tweet in tweets})
+                scanned = archive.range(rest_ids[1], rest_ids[-1] + 1)
+                self.assertEqual([t.rest_id for t in scanned], rest_ids[1:])
+
+
+class TestSQLite(TestCase):
+    def test_export_and_load(self):
+        tweets = load_tweets()
+        audio_space = DataResponse.from_json("data/AudioSpaceById.json").resolve()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "tweets.db")
+
+            with SQLiteExporter(pathname, batch_size=4) as exporter:
+                exporter.extend(tweets)
+                exporter.add(audio_space)
+
+            with SQLiteLoader(pathname) as loader:
+                count = loader.connection.execute("SELECT COUNT(*) FROM tweets")
+                self.assertEqual(count.fetchone()[0], len({t.rest_id for t in tweets}))
+
+                tweet = tweets[0]
+                loaded = list(loader.tweets("rest_id = ?", (tweet.rest_id,)))
+                self.assertEqual(loaded, [tweet])
+
+                user = next(loader.users("screen_name = ?", (tweet.user.legacy.screen_name,)))
+                self.assertEqual(user, tweet.user)
+
+                self.assertEqual(list(loader.audio_spaces()), [audio_space])
+
+    def test_export_twice(self):
+        tweets = load_tweets()
+
+        def count(pathname):
+            with SQLiteLoader(pathname) as loader:
+                return {
+                    table: loader.connection.execute(
+                        f"SELECT COUNT(*) FROM {table}"
+                    ).fetchone()[0]
+                    for table in ("tweets", "media", "mentions", "hashtags", "urls")
+                }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            once = os.path.join(tmp, "once.db")
+            twice = os.path.join(tmp, "twice.db")
+
+            with SQLiteExporter(once) as exporter:
+                exporter.extend(tweets)
+
+            # Twice in one batch, then again from a reopened database.
+            with SQLiteExporter(twice) as exporter:
+                exporter.extend(tweets + tweets)
+
+            with SQLiteExporter(twice, batch_size=1) as exporter:
+                exporter.extend(tweets)
+
+            expected = count(once)
+            self.assertTrue(expected["mentions"] and expected["urls"])
+            self.assertEqual(count(twice), expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.audio_space import (
+    AudioSpace,
+)
+
+from api.card import (
+    Card,
+)
+
+from api.media import (
+    Media,
+)
+
+from api.synthetic import (
+    SyntheticGenerator,
+)
+
+from api.timeline import (
+    TimelineEntry,
+)
+
+from api.tweet import (
+    Tweet,
+)
+
+from api.user import (
+    User,
+)
+
+
+class TestSynthetic(TestCase):
+    def test_payloads_validate(self):
+        generator = SyntheticGenerator(seed=7, users=20, unavailable_rate=0.1)
+
+        for model in (Tweet, User, Media, Card, AudioSpace, TimelineEntry):
+            with self.subTest(model=model.__name__):
+                for payload in generator.iter_payloads(model, 50):
+                    self.assertIsInstance(model.parse_obj(payload), model)
+
+    def test_aliases(self):
+        generator = SyntheticGenerator(seed=1, optional_rate=1.0, list_length=(1, 1))
+
+        entry = generator.generate(TimelineEntry)
+        self.assertIn("entryId", entry)
+        self.assertIn("__typename", entry["content"])
+
+        media = generator.generate(Media)
+        self.assertIn("mediaStats", media)
+        self.assertIn("viewCount", media["mediaStats"])
+
+    def test_deterministic(self):
+        first = SyntheticGenerator(seed=3).iter_payloads(Tweet, 5)
+        second = SyntheticGenerator(seed=3).iter_payloads(Tweet, 5)
+        self.assertEqual(list(first), list(second))
+        self.assertNotEqual(
+            SyntheticGenerator(seed=3).generate(Tweet),
+            SyntheticGenerator(seed=4).generate(Tweet),
+        )
+
+    def test_cardinality(self):
+        generator = SyntheticGenerator(seed=2, strings=50, users=5)
+        tweets = [Tweet.parse_obj(p) for p in generator.iter_payloads(Tweet, 100)]
+
+        self.assertLessEqual(len({tweet.user.rest_id for tweet in tweets}), 5)
+        self.assertTrue(all(t.legacy.user_id_str == str(t.user.rest_id) for t in tweets))
+        self.assertLessEqual(len(set(generator.vocabulary)), 50)
+
+    def test_write(self):
+        generator = SyntheticGenerator(seed=5)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            lines = os.path.join(tmp, "corpus.jsonl")
+            count = generator.write(lines, TimelineEntry, size=1 << 18)
+            self.assertGreaterEqual(os.path.getsize(lines), 1 << 18)
+            self.assertEqual(len(TimelineEntry.from_jsonl(lines, processes=1)), count)
+
+            array = os.path.join(tmp, "corpus.json")
+            self.assertEqual(generator.write(array, User, count=10), 10)
+
+
+if __name__ == "__main__":
+    main()
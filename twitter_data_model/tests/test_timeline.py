@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import (
+    TestCase,
+    main,
+)
+
+import context
+
+from api.timeline import (
+    TimelineEntry,
+    TimelineSyncState,
+    TimelineTimelineCursor,
+    merge_timelines,
+)
+
+from api.utils import (
+    load_json,
+)
+
+
+def entry(sort_index, name="UserTweets"):
+    raw = load_json(f"data/{name}.json")
+    raw["entryId"] = f"tweet-{sort_index}"
+    raw["sortIndex"] = str(sort_index)
+    return raw
+
+
+def cursor(sort_index, cursor_type):
+    return {
+        "entryId": f"cursor-{cursor_type.lower()}-{sort_index}",
+        "sortIndex": str(sort_index),
+        "content": {
+            "entryType": "TimelineTimelineCursor",
+            "__typename": "TimelineTimelineCursor",
+            "value": f"{cursor_type}{sort_index}",
+            "cursorType": cursor_type,
+            "stopOnEmptyResponse": True,
+        },
+    }
+
+
+def page(*indices):
+    top, *tweets, bottom = indices
+    tweets = [entry(i) for i in tweets]
+    return [cursor(top, "Top")] + tweets + [cursor(bottom, "Bottom")]
+
+
+class TestTimeline(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def dump(self, name, entries):
+        pathname = os.path.join(self.tmp, name)
+
+        with open(pathname, "w", encoding="utf8") as fp:
+            if name.endswith(".jsonl"):
+                fp.writelines(json.dumps(e) + "\n" for e in entries)
+            else:
+                json.dump(entries, fp)
+
+        return pathname
+
+    def test_merge_timelines(self):
+        # Overlapping pages, each in timeline (descending) order.
+        first = self.dump("1.json", [entry(i) for i in (90, 80, 70, 60)])
+        second = self.dump("2.jsonl", [entry(i) for i in (75, 70, 60, 50)])
+        third = [TimelineEntry.parse_obj(entry(i, "Likes")) for i in (85, 50, 40)]
+
+        merged = list(merge_timelines(first, second, iter(third)))
+
+        self.assertTrue(all(isinstance(e, TimelineEntry) for e in merged))
+        self.assertEqual(
+            [int(e.sort_index) for e in merged], [90, 85, 80, 75, 70, 60, 50, 40]
+        )
+        self.assertEqual(len({e.entry_id for e in merged}), len(merged))
+
+        # The first source wins ties.
+        expected = TimelineEntry.from_json("data/UserTweets.json")
+        self.assertEqual(merged[-2].result, expected.result)
+
+        single = list(merge_timelines("data/UserTweets.json", "data/UserTweets.json"))
+        self.assertEqual(single, [expected])
+
+        self.assertEqual(list(merge_timelines()), [])
+
+    def test_cursor(self):
+        parsed = TimelineEntry.parse_obj(cursor(99, "Bottom"))
+
+        self.assertTrue(parsed.is_cursor)
+        self.assertIsInstance(parsed.content, TimelineTimelineCursor)
+        self.assertEqual(parsed.content.value, "Bottom99")
+        self.assertFalse(TimelineEntry.from_json("data/UserTweets.json").is_cursor)
+
+    def test_sync_state(self):
+        pathname = os.path.join(self.tmp, "state.json")
+        state = TimelineSyncState.load(pathname)
+
+        first = [page(100, 90, 80, 79), page(80, 80, 70, 69)]
+        synced = [int(e.sort_index) for e in state.newer(*first)]
+
+        self.assertEqual(synced, [90, 80, 70])
+        self.assertEqual(state.sort_index, 90)
+        self.assertEqual(state.top_cursor, "Top100")
+        self.assertEqual(state.bottom_cursor, "Bottom69")
+        state.save(pathname)
+
+        # An interrupted sync does not advance the state.
+        state = TimelineSyncState.load(pathname)
+        second = [page(120, 110, 95, 90, 80, 75)]
+        next(state.newer(*second))
+        self.assertEqual(state.sort_index, 90)
+
+        self.assertEqual([int(e.sort_index) for e in state.newer(*second)], [110, 95])
+        self.assertEqual(state.sort_index, 110)
+        self.assertEqual(state.entries, 5)
+        self.assertEqual(state.top_cursor, "Top120")
+        self.assertEqual(state.bottom_cursor, "Bottom75")
+
+        self.assertEqual(list(state.newer(*second)), [])
+        self.assertEqual(state.sort_index, 110)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+import json
+import os
+import tempfile
+
+from operator import attrgetter
 from unittest import (
     TestCase,
     main,
@@ -5,15 +10,48 @@ from unittest import (
 
 import context
 
+from api.card import (
+    Card,
+    ImageValue,
+    UserValue,
+    iter_card_values,
+)
+
+from api.conversation import (
+    ConversationIndex,
+)
+
 from api.response import (
     DataResponse,
     DataResult,
 )
 
+from api.identity import (
+    user_identity_map,
+)
+
+from api.interning import (
+    InternTable,
+    set_intern_table,
+)
+
+from api.lazy import (
+    lazy_tweets,
+)
+
 from api.timeline import (
     TimelineEntry,
 )
 
+from api.tweet import (
+    LazyTweet,
+    Tweet,
+)
+
+from api.utils import (
+    load_json,
+)
+
 
 class TestTweets(TestCase):
     def test_tweet_stats(self):
@@ -22,6 +60,14 @@ class TestTweets(TestCase):
     def test_tweets_by_rest_id(self):
         data = DataResponse.from_json("data/TweetResultsByRestId.json")
 
+    def test_data_dispatch(self):
+        data = DataResponse.from_json("data/TweetResultsByRestId.json")
+        self.assertEqual(data.branch, "TweetResultAlt")
+
+        data = DataResponse.from_json("data/TweetStats.json")
+        self.assertEqual(data.branch, "DataResult")
+        self.assertEqual(data.data.branch, "TweetStatsResponse")
+
     def test_user_tweets(self):
         # Singular (non-list) response
         data = TimelineEntry.from_json("data/UserTweets.json")
@@ -30,6 +76,65 @@ class TestTweets(TestCase):
         # Singular (non-list) response
         data = TimelineEntry.from_json("data/UserTweetsAndReplies.json")
 
+    def test_user_tweets_lazy(self):
+        tweet = TimelineEntry.from_json("data/UserTweets.json").result
+
+        with lazy_tweets():
+            data = TimelineEntry.from_json("data/UserTweets.json")
+
+        lazy_tweet = data.result
+        self.assertIsInstance(lazy_tweet, LazyTweet)
+        self.assertEqual(lazy_tweet.legacy.full_text, tweet.legacy.full_text)
+        self.assertFalse(lazy_tweet.legacy.entities.resolved)
+        self.assertEqual(lazy_tweet.user.rest_id, tweet.user.rest_id)
+        self.assertEqual(lazy_tweet.to_tweet().dict(), tweet.dict())
+
+    def test_user_identity_map(self):
+        with user_identity_map(maxsize=16) as identity_map:
+            first = TimelineEntry.from_json("data/UserTweets.json").result
+            second = TimelineEntry.from_json("data/UserTweets.json").result
+
+        self.assertIs(first.user, second.user)
+        self.assertEqual(identity_map.hits, 1)
+
+        third = TimelineEntry.from_json("data/UserTweets.json").result
+        self.assertIsNot(third.user, first.user)
+        self.assertEqual(third.user, first.user)
+
+    def test_interned_fields(self):
+        table = InternTable()
+        previous = set_intern_table(table)
+
+        try:
+            first = TimelineEntry.from_json("data/UserTweets.json").result
+            second = TimelineEntry.from_json("data/UserTweets.json").result
+        finally:
+            set_intern_table(previous)
+
+        self.assertIs(first.source, second.source)
+        self.assertIs(first.legacy.lang, second.legacy.lang)
+        self.assertIn(first.source, table)
+        self.assertGreater(table.hit_rate, 0)
+
+    def test_user_tweets_jsonl(self):
+        with open("data/UserTweets.json", encoding="utf8") as fp:
+            entry = json.load(fp)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "UserTweets.jsonl")
+            with open(pathname, "w", encoding="utf8") as fp:
+                for index in range(10):
+                    entry["sortIndex"] = str(index)
+                    fp.write(json.dumps(entry) + "\n")
+
+            entries = TimelineEntry.from_jsonl(pathname, processes=1)
+            self.assertEqual(len(entries), 10)
+
+            sort_indexes = TimelineEntry.from_jsonl(
+                pathname, processes=2, chunk_size=3, projection=attrgetter("sort_index")
+            )
+            self.assertEqual(sort_indexes, [str(index) for index in range(10)])
+
     def test_tweet_detail(self):
         data = TimelineEntry.from_json("data/TweetDetail.json")
 
@@ -39,6 +144,126 @@ class TestTweets(TestCase):
     def test_favoriters(self):
         data = TimelineEntry.from_json("data/Favoriters.json")
 
+    def test_unavailable_quoted_tweets(self):
+        raw = load_json("data/UserTweets.json")
+        result = raw["content"]["itemContent"]["tweet_results"]["result"]
+        quoted = result["quoted_status_result"]
+        limited = {"__typename": "TweetWithVisibilityResults", "tweet": quoted["result"]}
+        tombstone = {"__typename": "TweetTombstone", "tombstone": {}}
+
+        cases = [
+            (quoted, "3108351"),
+            ({"result": limited}, "3108351"),
+            ({"result": tombstone}, None),
+            ({}, None),
+        ]
+
+        for value, author in cases:
+            with self.subTest(value=list(value)):
+                result["quoted_status_result"] = value
+                entry = TimelineEntry.parse_obj(raw)
+                self.assertEqual(entry.result.quoted_user_id_str, author)
+
+                with lazy_tweets():
+                    tweet = TimelineEntry.parse_obj(raw).result
+
+                self.assertEqual(tweet.quoted_user_id_str, author)
+                self.assertEqual(tweet.to_tweet().quoted_user_id_str, author)
+
+    def test_card_values(self):
+        raw = load_json("data/UserTweets.json")["content"]["itemContent"]
+        raw = raw["tweet_results"]["result"]["quoted_status_result"]["result"]
+
+        card = Tweet.parse_obj(raw).card
+
+        self.assertEqual(card["domain"], "www.wsj.com")
+        self.assertIsInstance(card["thumbnail_image"], ImageValue)
+        self.assertIsInstance(card["site"], UserValue)
+        self.assertEqual(card["thumbnail_image_color"].palette[0].rgb.red, 2)
+        self.assertIs(card.bindings, card.bindings)
+        self.assertIs(card["thumbnail_image"], card["thumbnail_image"])
+        self.assertIn("card_url", card.bindings)
+        self.assertIsNone(card.get("unknown"))
+
+        with self.assertRaises(KeyError):
+            card["unknown"]
+
+        with lazy_tweets():
+            tweet = Tweet.validate(raw)
+
+        keys = ["title", "thumbnail_image", "unknown"]
+        expected = {key: card.get(key, "") for key in keys}
+
+        self.assertEqual(
+            list(iter_card_values([card, tweet, raw, raw["card"], {}], keys, "")),
+            [expected] * 4 + [None],
+        )
+        # Not yet validated cards are read raw.
+        self.assertFalse(tweet.card.resolved)
+
+    def test_card_round_trip(self):
+        raw = load_json("data/UserTweets.json")["content"]["itemContent"]
+        raw = raw["tweet_results"]["result"]["quoted_status_result"]["result"]
+        raw["card"]["legacy"]["binding_values"].append(
+            {"key": "is_live", "value": {"boolean_value": True, "type": "BOOLEAN"}}
+        )
+        tweet = Tweet.parse_obj(raw)
+        card = tweet.card
+
+        self.assertIs(card["is_live"], True)
+
+        for loaded in (
+            Card.parse_raw(card.json(by_alias=True)),
+            Tweet.parse_raw(tweet.json(by_alias=True)).card,
+        ):
+            values = {key: loaded.get(key) for key in card.bindings}
+            self.assertEqual(values, dict(card.bindings))
+            self.assertEqual(loaded["thumbnail_image_color"].palette[0].rgb.red, 2)
+
+    def test_conversation_index(self):
+        entry = TimelineEntry.from_json("data/UserTweetsAndReplies.json")
+        root, reply, nested = (item.tweet_results.result for item in entry.content)
+        ids = [t.legacy.id_str for t in (root, reply, nested)]
+
+        # Replies attach before their parents arrive.
+        index = ConversationIndex([nested])
+        self.assertEqual(index.root(ids[2]), ids[1])
+        self.assertIsNone(index.get(ids[1]))
+
+        index.add_entry(entry)
+        index.add(nested)
+        index.add_entry(TimelineEntry.from_json("data/UserTweets.json"))
+
+        self.assertEqual(len(index), 3)
+        self.assertIs(index[ids[1]], reply)
+        self.assertEqual(index.parent(ids[2]), ids[1])
+        self.assertEqual(index.children(ids[0]), [ids[1]])
+        self.assertEqual(list(index.ancestors(ids[2])), [ids[1], ids[0]])
+        self.assertEqual(index.root(ids[2]), ids[0])
+        self.assertEqual(index.conversation(root.legacy.conversation_id_str), ids)
+
+        # A second, later reply to the root.
+        legacy = {"id_str": str(int(ids[1]) + 1), "in_reply_to_status_id_str": ids[0]}
+        sibling = reply.copy(update={"legacy": reply.legacy.copy(update=legacy)})
+        index.add(sibling)
+
+        self.assertEqual(
+            list(index.iter_depth_first(ids[0])),
+            [(0, ids[0]), (1, ids[1]), (2, ids[2]), (1, sibling.legacy.id_str)],
+        )
+        self.assertEqual(
+            list(index.iter_breadth_first(ids[0])),
+            [(0, ids[0]), (1, ids[1]), (1, sibling.legacy.id_str), (2, ids[2])],
+        )
+        self.assertEqual(
+            list(index.iter_breadth_first(ids[1])), [(0, ids[1]), (1, ids[2])]
+        )
+
+        liked = TimelineEntry.from_json("data/Likes.json").result
+        index.add(liked)
+        self.assertEqual(index.self_thread(liked.legacy.id_str), [liked.legacy.id_str])
+        self.assertEqual(index.self_thread(ids[0]), [])
+
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,7 @@
+import json
+import os
+import tempfile
+
 from unittest import (
     TestCase,
     main,
@@ -7,6 +11,7 @@ import context
 
 from api.response import (
     DataResponse,
+    DataResponseList,
     DataResult,
 )
 
@@ -14,6 +19,16 @@ from api.timeline import (
     TimelineEntry,
 )
 
+from api.user import (
+    User,
+    UserList,
+)
+
+from api.utils import (
+    iter_json_array,
+    load_json,
+)
+
 
 class TestUsers(TestCase):
     def test_users_by_screen_name(self):
@@ -22,6 +37,147 @@ class TestUsers(TestCase):
     def test_users_by_rest_ids(self):
         data = DataResponse.from_json("data/UsersByRestIds.json")
 
+    def test_data_dispatch(self):
+        data = DataResponse.from_json("data/UsersByRestIds.json")
+        self.assertEqual(data.branch, "UsersResult")
+
+        data = DataResponse.from_json("data/UserByScreenName.json")
+        self.assertEqual(data.branch, "UserResponse")
+        self.assertEqual(DataResponse(data={}).branch, "UserResponseNull")
+
+    def test_user_list_stream(self):
+        users = load_json("data/UsersByRestIds.json")["data"]["users"]
+        responses = [{"data": {"user": user}} for user in users] * 50
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "users.json")
+            with open(pathname, "w", encoding="utf8") as fp:
+                json.dump(responses, fp, indent=2)
+
+            self.assertEqual(list(iter_json_array(pathname, chunk_size=7)), responses)
+
+            streamed = list(UserList.iter_json(pathname))
+            self.assertEqual(len(streamed), len(responses))
+            self.assertTrue(all(isinstance(user, User) for user in streamed))
+            self.assertEqual(streamed, list(UserList.parse_file(pathname)))
+
+    def test_data_response_list_stream(self):
+        responses = [
+            load_json(f"data/{name}.json")
+            for name in ("UserByScreenName", "TweetResultsByRestId", "TweetStats")
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "responses.json")
+            with open(pathname, "w", encoding="utf8") as fp:
+                json.dump(responses, fp)
+
+            self.assertEqual(
+                list(DataResponseList.iter_json(pathname)),
+                list(DataResponseList.parse_file(pathname)),
+            )
+
+    def test_json_array_separators(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pathname = os.path.join(tmp, "array.json")
+
+            for text, values in [("[]", []), (" [ 1 , {\"a\": 2} ] ", [1, {"a": 2}])]:
+                with open(pathname, "w", encoding="utf8") as fp:
+                    fp.write(text)
+                self.assertEqual(list(iter_json_array(pathname, chunk_size=2)), values)
+
+            for text in ["[1 2]", "[1,,2]", "[,1]", "[1,]", "[1", "[1,"]:
+                with self.subTest(text=text):
+                    with open(pathname, "w", encoding="utf8") as fp:
+                        fp.write(text)
+                    with self.assertRaises(json.JSONDecodeError):
+                        list(iter_json_array(pathname, chunk_size=2))
+
+    def test_user_list_index(self):
+        user = load_json("data/UsersByRestIds.json")["data"]["users"][0]
+        responses = []
+
+        for index in range(5):
+            result = json.loads(json.dumps(user["result"]))
+            result["rest_id"] = str(index)
+            result["id"] = f"User:{index}"
+            result["legacy"]["screen_name"] = f"User{index}"
+            responses.append({"data": {"user": {"result": result}}})
+
+        users = UserList.parse_obj(responses)
+
+        self.assertIn(3, users)
+        self.assertIn("user3", users)
+        self.assertIn("User:3", users)
+        self.assertNotIn(7, users)
+        self.assertEqual(users.get_by_screen_name("USER2").rest_id, 2)
+        self.assertEqual(len(users.get_by_name(user["result"]["legacy"]["name"])), 5)
+
+        del users[1]
+        del users["user2"]
+        self.assertEqual(len(users), 3)
+        self.assertEqual([entry.rest_id for entry in users], [0, 3, 4])
+        self.assertIsNone(users.get_by_rest_id(1))
+        self.assertFalse(users.delete_by_screen_name("user2"))
+
+        # Duplicate entries (equal copies, or one object twice) all go.
+        users.append(users[0].copy())
+        users.append(users[1])
+        self.assertEqual(len(users), 5)
+
+        del users[0]
+        self.assertEqual(len(users), 3)
+        self.assertNotIn(0, users)
+
+        self.assertTrue(users.delete_by_screen_name("user3"))
+        self.assertEqual([entry.rest_id for entry in users], [4])
+        self.assertIn(4, users)
+
+    def test_user_list_bulk_delete(self):
+        result = load_json("data/UsersByRestIds.json")["data"]["users"][0]["result"]
+        user = User.parse_obj(result)
+        users = UserList.parse_obj([])
+
+        for index in range(1000):
+            legacy = user.legacy.copy(update={"screen_name": f"User{index}"})
+            entry = user.copy(update={"rest_id": index, "legacy": legacy})
+            users.append(entry)
+            # Every third user is listed twice, as a copy or as the same object.
+            if index % 3 == 1:
+                users.append(entry.copy())
+            elif index % 3 == 2:
+                users.append(entry)
+
+        self.assertEqual(len(users), 1666)
+        entries = len(users.__root__)
+        deleted = users.get_by_rest_id(998)
+
+        for index in range(0, 1000, 2):
+            if index % 4:
+                self.assertTrue(users.delete_by_rest_id(index))
+            else:
+                self.assertTrue(users.delete_by_screen_name(f"user{index}"))
+
+        # Deletes only unindex: the list is compacted on the next read.
+        self.assertEqual(len(users.__root__), entries)
+        self.assertEqual(len(users), 833)
+        self.assertNotIn(998, users)
+        self.assertIsNone(users.get_by_screen_name("user500"))
+
+        self.assertEqual(len(json.loads(users.json())), 833)
+        self.assertEqual(len(users.__root__), 833)
+
+        expected = sorted(
+            [i for i in range(1, 1000, 2)] + [i for i in range(1, 1000, 2) if i % 3]
+        )
+        self.assertEqual(sorted(users.get_rest_ids()), expected)
+
+        # A deleted object can be listed again.
+        users.append(deleted)
+        self.assertEqual(len(users), 834)
+        self.assertIs(users[-1], deleted)
+        self.assertIs(users.get_by_rest_id(998), deleted)
+
     def test_user_likes(self):
         data = TimelineEntry.from_json("data/Likes.json")
 